@@ -0,0 +1 @@
+"""Benchmarks for pybet365 (run as `python -m benchmarks.<name>`)."""
@@ -0,0 +1,78 @@
+"""
+Memory benchmark of `dict` facades against compact typed models.
+
+Decodes an `upcoming` payload of `--records` records, keeps either the
+`UpcomingEvent` facades (plain or string interned) or the
+`UpcomingEventModel` objects, drops the payload and reports the
+retained bytes
+
+    $ python -m benchmarks.bench_memory --records 100000
+
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from pybet365.response import UpcomingEventsResponse
+from pybet365.response.intern import InternTable
+from pybet365.synthetic import SyntheticGenerator
+
+
+def build_payload(records: int, leagues: int = 200, teams: int = 2000) -> str:
+    """Serialized `upcoming` payload with repeating leagues and teams."""
+    generator = SyntheticGenerator(sport_id="1", leagues=leagues, teams=teams)
+
+    return "".join(generator.iter_payload("upcoming", records))
+
+
+def retained(body: str, layer: str) -> int:
+    """Bytes still allocated after building `layer` and dropping the body."""
+    gc.collect()
+    tracemalloc.start()
+    if layer == "interned":
+        table = InternTable()
+        response = UpcomingEventsResponse(
+            json.loads(body, object_hook=table.object_hook)
+        )
+    else:
+        response = UpcomingEventsResponse(json.loads(body))
+    if layer in ("facades", "interned"):
+        kept = response.results
+    else:
+        kept = response.to_models()
+    del response
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    return current
+
+
+def main(argv=None):
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    body = build_payload(args.records)
+    facades = retained(body, "facades")
+    interned = retained(body, "interned")
+    models = retained(body, "models")
+
+    print("records   {:>12}".format(args.records))
+    print("facades   {:>12} bytes ({:.0f} B/record)".format(
+        facades, facades / args.records
+    ))
+    print("interned  {:>12} bytes ({:.0f} B/record)".format(
+        interned, interned / args.records
+    ))
+    print("models    {:>12} bytes ({:.0f} B/record)".format(
+        models, models / args.records
+    ))
+    print("ratio     {:>12.2f}x".format(facades / float(models or 1)))
+
+
+if __name__ == "__main__":
+    main()
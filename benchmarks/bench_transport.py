@@ -0,0 +1,183 @@
+"""
+Transport benchmark of HTTP/1.1 against multiplexed HTTP/2.
+
+Fans `--calls` `in_play_odds` requests (over `--fis` distinct FIs) out to
+a local `MockBet365Server` (in a subprocess, `--latency` seconds per
+answer) with `--concurrency` calls in flight, once per transport:
+
+    requests - `requests.get`, a new connection per call (threads)
+
+    pooled - `RequestsTransport`, pooled HTTP/1.1 keep-alive (threads)
+
+    httpx-h1 / httpx-h2 - `HttpxTransport` (threads)
+
+    async-h1 / async-h2 - `AsyncBet365` (one event loop)
+
+and reports throughput, latency percentiles and the connections the
+server accepted. `httpx` transports are skipped when `httpx` / `h2` are
+not installed
+
+    $ python -m benchmarks.bench_transport --calls 2000 --latency 0.05
+
+"""
+import argparse
+import asyncio
+import math
+import socket
+import subprocess
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from pybet365.client.client import Bet365
+from pybet365.client.transport import HttpxTransport, RequestsTransport
+
+MODES = (
+    "requests",
+    "pooled",
+    "httpx-h1",
+    "httpx-h2",
+    "async-h1",
+    "async-h2",
+)
+
+
+def start_server(latency: float, records: int) -> tuple:
+    """`(process, base_url)` of a mock server on a free port."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    process = subprocess.Popen([
+        sys.executable, "-m", "pybet365.mock_server",
+        "--port", str(port),
+        "--latency", str(latency),
+        "--records", str(records),
+    ], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10.0
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Mock server did not start")
+            time.sleep(0.05)
+
+    return process, "http://127.0.0.1:{}/{{}}/bet365/".format(port)
+
+
+def connections(base_url: str) -> int:
+    """Connections the server accepted so far (including this one)."""
+    response = requests.get(base_url.split("/{}")[0] + "/stats")
+
+    return sum(response.json()["connections"].values())
+
+
+def run_threads(client: Bet365, fis: list, concurrency: int) -> list:
+    """Per call latencies of `in_play_odds` over a thread pool."""
+    def call(fi):
+        start = time.perf_counter()
+        client.in_play_odds(fi=fi)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(call, fis))
+
+
+def run_async(base_url: str, fis: list, concurrency: int, http2: bool):
+    """Per call latencies of `in_play_odds` on one event loop."""
+    from pybet365.client.async_client import AsyncBet365
+
+    async def main():
+        async with AsyncBet365(
+            api_host="mock", api_key="bench", base_url=base_url,
+            http2=http2, concurrency=concurrency,
+        ) as client:
+            async def call(fi):
+                start = time.perf_counter()
+                await client.in_play_odds(fi=fi)
+                return time.perf_counter() - start
+
+            return await asyncio.gather(*(call(fi) for fi in fis))
+
+    return asyncio.run(main())
+
+
+def run(mode: str, base_url: str, fis: list, concurrency: int) -> list:
+    """Latencies of one `mode`."""
+    if mode.startswith("async-"):
+        return run_async(base_url, fis, concurrency, mode == "async-h2")
+
+    transport = None
+    if mode == "pooled":
+        transport = RequestsTransport(pool_maxsize=concurrency)
+    elif mode.startswith("httpx-"):
+        transport = HttpxTransport(
+            http2=mode == "httpx-h2", max_connections=concurrency
+        )
+    client = Bet365(
+        api_host="mock", api_key="bench", base_url=base_url,
+        transport=transport,
+    )
+    try:
+        return run_threads(client, fis, concurrency)
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+def percentile(ordered: list, pct: float) -> float:
+    """Nearest rank percentile of pre-sorted values."""
+    rank = int(math.ceil(pct / 100.0 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def main(argv=None):
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--fis", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--records", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args(argv)
+
+    fis = [str(88000000 + i % args.fis) for i in range(args.calls)]
+    process, base_url = start_server(args.latency, args.records)
+    print("{:<10} {:>9} {:>9} {:>9} {:>9} {:>12}".format(
+        "mode", "wall_s", "calls/s", "p50_ms", "p99_ms", "connections"
+    ))
+    try:
+        for mode in args.modes:
+            before = connections(base_url)
+            start = time.perf_counter()
+            try:
+                latencies = sorted(run(mode, base_url, fis, args.concurrency))
+            except ImportError as exc:
+                print("{:<10} skipped ({})".format(mode, exc))
+                continue
+            wall = time.perf_counter() - start
+            after = connections(base_url)
+            # NOTE: minus the connection of the second `/stats` call
+            opened = after - before - 1
+            print("{:<10} {:>9.2f} {:>9.0f} {:>9.1f} {:>9.1f} {:>12}".format(
+                mode,
+                wall,
+                len(latencies) / wall,
+                percentile(latencies, 50) * 1e3,
+                percentile(latencies, 99) * 1e3,
+                opened,
+            ))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
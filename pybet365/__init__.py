@@ -1,8 +1,44 @@
-"""Top-level package for pybet365."""
-from .client import Bet365, Bet365SportId
+"""
+Top-level package for pybet365.
+
+Public members resolve lazily (PEP 562) so `import pybet365` stays
+cheap for short-lived processes
+
+"""
+import importlib
+import sys
 
 __author__ = """Leon Kozlowski"""
 __email__ = "leonkozlowski@gmail.com"
 __version__ = "0.1.1"
 
+_LAZY_MEMBERS = {
+    "Bet365": "pybet365.client.client",
+    "Bet365SportId": "pybet365.client.config",
+}
+
 __all__ = ["Bet365", "Bet365SportId"]
+
+
+def __getattr__(name: str):
+    """Import lazily declared members on first access."""
+    module = _LAZY_MEMBERS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    """Include lazily declared members."""
+    return sorted(set(globals()) | set(_LAZY_MEMBERS))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # NOTE: module `__getattr__` (PEP 562) requires python 3.7
+    from .client import Bet365, Bet365SportId  # noqa: F401
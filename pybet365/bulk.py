@@ -0,0 +1,237 @@
+"""
+Bulk Processing of Archived Payloads.
+
+Archived raw responses (`result`, `upcoming`, `prematch`, ...) are
+re-parsed through the response facades in parallel:
+
+    1. archive files are split into shards balanced by file size
+
+    2. each shard is processed in its own worker process, every record
+       is wrapped in its facade and flattened to dotted columns
+
+    3. each worker writes one columnar file for its shard
+
+Workers share nothing, so throughput scales with cores until disk
+bandwidth is saturated
+
+Archive files may hold one payload (`*.json`) or one payload per line
+(`*.ndjson`, `*.jsonl`), optionally gzip compressed (`*.gz`)
+
+>>> summaries = process_archive(
+...     glob.glob("archive/result/*.json.gz"), "result", "out/", workers=8
+... )
+
+"""
+import gzip
+import json
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+import pybet365.response as facades
+from pybet365.client.config import RESPONSE_OBJECT_FACTORY
+from pybet365.export import flatten_record, records_of
+
+COLUMNAR_FORMATS = ("json", "parquet")
+
+
+class ColumnBuilder(object):
+    """
+    Accumulates flat rows into columns.
+
+    Columns first seen late are back filled with `None`, rows missing a
+    column get `None`
+
+    """
+
+    def __init__(self):
+        """Constructor for ColumnBuilder."""
+        self.columns = {}
+        self.rows = 0
+
+    def append(self, row: dict) -> None:
+        """Add one flat row."""
+        columns = self.columns
+        for name in row:
+            if name not in columns:
+                columns[name] = [None] * self.rows
+
+        for name, values in columns.items():
+            values.append(row.get(name))
+
+        self.rows += 1
+
+
+def iter_payloads(path: str) -> Iterator[dict]:
+    """
+    Yield every payload stored in an archive file.
+
+    Args:
+        path (str): `*.json`, `*.ndjson` or `*.jsonl` (optionally `.gz`)
+
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    name = path[:-3] if path.endswith(".gz") else path
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        if name.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield json.load(f)
+
+
+def flatten_payload(url_extras: str, payload: dict) -> Iterator[dict]:
+    """
+    Flatten every record of a payload through its response facade.
+
+    Args:
+        url_extras (str): endpoint tail the payload was fetched from
+        payload (dict): decoded response body
+
+    """
+    facade = getattr(
+        facades, RESPONSE_OBJECT_FACTORY.get(url_extras, ""), None
+    )
+    response = facade(payload) if facade is not None else payload
+
+    for record in records_of(response):
+        yield flatten_record(record)
+
+
+def shard_paths(paths: Iterable[str], shards: int) -> List[List[str]]:
+    """
+    Split `paths` into at most `shards` lists of similar total size.
+
+    Files are assigned largest first to the currently smallest shard
+
+    """
+    sized = sorted(
+        ((os.path.getsize(p), p) for p in paths), reverse=True
+    )
+    buckets = [[0, []] for _ in range(max(1, min(shards, len(sized))))]
+    for size, path in sized:
+        bucket = min(buckets, key=lambda b: b[0])
+        bucket[0] += size
+        bucket[1].append(path)
+
+    return [sorted(b[1]) for b in buckets if b[1]]
+
+
+def write_columnar(columns: dict, path: str, fmt: str = "json") -> str:
+    """
+    Write `columns` to `path`.
+
+    Args:
+        columns (dict): column name to list of values
+        path (str): output path without extension
+        fmt (str): "json" (`{"columns": ..., "rows": n}`) or "parquet"
+            (requires `pyarrow`)
+
+    Returns:
+        path (str): written file
+
+    Raises:
+        ValueError: for unsupported `fmt`
+
+    """
+    if fmt == "parquet":
+        import pyarrow
+        import pyarrow.parquet
+
+        path += ".parquet"
+        pyarrow.parquet.write_table(pyarrow.table(columns), path)
+    elif fmt == "json":
+        path += ".columns.json"
+        rows = len(next(iter(columns.values()))) if columns else 0
+        with open(path, "w") as f:
+            json.dump({"rows": rows, "columns": columns}, f)
+    else:
+        raise ValueError("Unsupported columnar format: {}".format(fmt))
+
+    return path
+
+
+def process_shard(
+    index: int, paths: List[str], url_extras: str, out_dir: str, fmt: str
+) -> dict:
+    """
+    Process one shard (runs inside a worker process).
+
+    Returns:
+        summary (dict): shard index, files, records, output and timing
+
+    """
+    start = time.perf_counter()
+    builder = ColumnBuilder()
+    for path in paths:
+        for payload in iter_payloads(path):
+            for row in flatten_payload(url_extras, payload):
+                builder.append(row)
+
+    output = write_columnar(
+        builder.columns,
+        os.path.join(out_dir, "{}-{:05d}".format(url_extras, index)),
+        fmt,
+    )
+
+    return {
+        "shard": index,
+        "files": len(paths),
+        "records": builder.rows,
+        "output": output,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def process_archive(
+    paths: Iterable[str],
+    url_extras: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    fmt: str = "json",
+) -> List[dict]:
+    """
+    Parse archived payloads across a process pool.
+
+    Args:
+        paths (Iterable[str]): archive files
+        url_extras (str): endpoint tail ("result", "upcoming", ...)
+        out_dir (str): directory for the per shard columnar files
+        workers (Optional[int]): worker processes (defaults to cores)
+        shards (Optional[int]): shard count (defaults to 4 per worker so
+            a slow shard does not leave cores idle)
+        fmt (str): columnar output format ("json" or "parquet")
+
+    Returns:
+        summaries (List[dict]): one `process_shard` summary per shard
+
+    Raises:
+        ValueError: for unsupported `fmt`
+
+    """
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError("Unsupported columnar format: {}".format(fmt))
+
+    workers = workers or os.cpu_count() or 1
+    groups = shard_paths(paths, shards or workers * 4)
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    if workers == 1:
+        return [
+            process_shard(i, group, url_extras, out_dir, fmt)
+            for i, group in enumerate(groups)
+        ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(process_shard, i, group, url_extras, out_dir, fmt)
+            for i, group in enumerate(groups)
+        ]
+
+        return [future.result() for future in futures]
@@ -1,18 +1,578 @@
-"""Console script for pybet365."""
+"""
+Console script for pybet365.
+
+`pybet365` exposes a command group for running pulls without glue code
+
+    pybet365 upcoming --sport-id 1 --all-pages
+
+    pybet365 inplay
+
+    pybet365 odds 87967884 87967885 --prematch
+
+    pybet365 result 2130836 2130837
+
+    pybet365 crawl --sport-id 1 --sport-id 18
+
+    pybet365 bench upcoming --requests 50 -p sport_id=1
+
+    pybet365 bulk result archive/*.json.gz --out-dir features/
+
+    pybet365 serve --port 8365 --latency 0.05 --quota 1000
+
+    pybet365 --profile --profile-stacks poll.folded inplay
+
+Group options control credentials, concurrency, rate limiting and
+output (`ndjson` or `csv` streamed to stdout or a file)
+
+"""
+import itertools
+import json
+import math
 import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Iterable, Iterator, List
+
 import click
 
+from pybet365.client.config import Bet365SportId
+from pybet365.client.throttle import RateLimiter
+from pybet365.export import get_writer, records_of
+
+
+class StageTimer(object):
+    """Accumulates wall clock time per named stage."""
+
+    def __init__(self, enabled: bool = False):
+        """Constructor for StageTimer."""
+        self.enabled = enabled
+        self.totals = {}
+        self.counts = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block under `name`."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, elapsed: float) -> None:
+        """Record `elapsed` seconds against `name`."""
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def report(self) -> List[str]:
+        """Render one line per stage."""
+        lines = ["{:<12} {:>8} {:>12} {:>12}".format(
+            "stage", "calls", "total_ms", "mean_ms"
+        )]
+        for name, total in self.totals.items():
+            count = self.counts[name]
+            lines.append("{:<12} {:>8} {:>12.2f} {:>12.3f}".format(
+                name, count, total * 1e3, total * 1e3 / count
+            ))
+
+        return lines
+
+
+class CliContext(object):
+    """State shared by every command of the group."""
+
+    def __init__(
+        self, api_host, api_key, fmt, output, concurrency, rate, profile,
+        base_url=None, profile_stacks=None
+    ):
+        """Constructor for CliContext."""
+        self.api_host = api_host
+        self.api_key = api_key
+        self.base_url = base_url
+        self.fmt = fmt
+        self.output = output
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(rate)
+        self.timer = StageTimer(enabled=profile)
+        self.profile_stacks = profile_stacks
+        self.profiler = None
+        self._client = None
+        self._profiling = ExitStack()
+
+    @property
+    def client(self):
+        """Lazily constructed Bet365 client."""
+        if self._client is None:
+            # NOTE: deferred so `--help` and offline commands skip `requests`
+            from pybet365.client.client import Bet365
+
+            if self.base_url is None and (
+                not self.api_host or not self.api_key
+            ):
+                raise click.UsageError(
+                    "--api-host/--api-key (or BET365_HOST/BET365_KEY) "
+                    "are required"
+                )
+            keys = [k for k in (self.api_key or "").split(",") if k]
+            if len(keys) > 1:
+                from pybet365.client.keypool import KeyPool
+
+                pool = KeyPool([(self.api_host, key) for key in keys])
+                self._client = Bet365(key_pool=pool, base_url=self.base_url)
+            else:
+                self._client = Bet365(
+                    api_host=self.api_host,
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                )
+            if self.timer.enabled:
+                self.profiler = self._profiling.enter_context(
+                    self._client.profile()
+                )
+
+        return self._client
+
+    def close_profile(self) -> List[str]:
+        """Stop profiling and render the stage and layer reports."""
+        self._profiling.close()
+        lines = self.timer.report()
+        if self.profiler is not None:
+            lines += [""] + self.profiler.report()
+            if self.profile_stacks:
+                self.profiler.dump_collapsed(self.profile_stacks)
+
+        return lines
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Invoke `fn` honoring the rate limit and recording timings."""
+        with self.timer.stage("throttle"):
+            self.limiter.acquire()
+        with self.timer.stage("request"):
+            return fn(*args, **kwargs)
+
+    def fan_out(self, fn: Callable, items: Iterable) -> Iterator:
+        """Map `fn` over `items` concurrently, yielding in input order."""
+        if self.concurrency == 1:
+            for item in items:
+                yield self.call(fn, item)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for result in pool.map(lambda i: self.call(fn, i), items):
+                yield result
+
+    def emit(self, responses: Iterable) -> int:
+        """Stream the records of every response to the output."""
+        writer = get_writer(self.fmt, self.output)
+        for response in responses:
+            with self.timer.stage("write"):
+                writer.write_many(records_of(response))
+
+        writer.close()
+        return writer.count
+
+    def emit_records(self, records: Iterable[dict]) -> int:
+        """Write records as they are produced (e.g. `Bet365.stream`)."""
+        writer = get_writer(self.fmt, self.output)
+        with self.timer.stage("stream"):
+            writer.write_many(records)
+
+        writer.close()
+        return writer.count
+
+
+def page_count(response) -> int:
+    """Number of pages advertised by a paginated response."""
+    pager = response.get("pager") or {}
+    per_page = pager.get("per_page") or 0
+    total = pager.get("total") or 0
+    if not per_page:
+        return 1
+
+    return max(1, int(math.ceil(float(total) / per_page)))
+
+
+def resolve_sport_id(value: str) -> str:
+    """Accept either a sport id ("1") or its pretty name ("soccer")."""
+    member = Bet365SportId.from_pretty(value)
+
+    return member.sport_id if member else value
+
+
+def parse_params(values: Iterable[str]) -> dict:
+    """Parse repeated `key=value` options into a `dict`."""
+    params = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep:
+            raise click.BadParameter(
+                "expected key=value, got {!r}".format(value)
+            )
+        params[key] = val
+
+    return params
 
-@click.command()
-def main(args=None):
+
+@click.group()
+@click.option("--api-host", envvar="BET365_HOST", help="RapidAPI host.")
+@click.option(
+    "--api-key", envvar="BET365_KEY",
+    help="RapidAPI key (comma separated keys are pooled).",
+)
+@click.option(
+    "--format", "fmt", type=click.Choice(["ndjson", "csv"]),
+    default="ndjson", show_default=True, help="Output record format.",
+)
+@click.option(
+    "--output", "-o", type=click.File("w"), default="-",
+    help="Output file (defaults to stdout).",
+)
+@click.option(
+    "--concurrency", "-c", type=int, default=4, show_default=True,
+    help="Parallel requests for fan-out commands.",
+)
+@click.option(
+    "--rate", type=float, default=0.0, show_default=True,
+    help="Max requests per second across workers (0 disables).",
+)
+@click.option(
+    "--profile", is_flag=True, help="Print per-stage timings to stderr."
+)
+@click.option(
+    "--profile-stacks", type=click.Path(dir_okay=False),
+    help="With --profile, write sampled stacks (flamegraph folded format).",
+)
+@click.option(
+    "--base-url", envvar="BET365_BASE_URL",
+    help="API root with a {} version placeholder (e.g. a mock server).",
+)
+@click.pass_context
+def main(
+    ctx, api_host, api_key, fmt, output, concurrency, rate, profile,
+    profile_stacks, base_url
+):
     """Console script for pybet365."""
+    ctx.obj = CliContext(
+        api_host=api_host,
+        api_key=api_key,
+        fmt=fmt,
+        output=output,
+        concurrency=concurrency,
+        rate=rate,
+        profile=profile,
+        base_url=base_url,
+        profile_stacks=profile_stacks,
+    )
+
+    if profile:
+        ctx.call_on_close(lambda: click.echo(
+            "\n".join(ctx.obj.close_profile()), err=True
+        ))
+
+
+@main.command()
+@click.option(
+    "--sport-id", required=True, help="Bet365 sport id or pretty name."
+)
+@click.option("--page", help="Page to fetch.")
+@click.option("--day", help="Day to query (YYYYMMDD).")
+@click.option("--league-id", help="League id.")
+@click.option("--lng-id", help="Language id.")
+@click.option("--all-pages", is_flag=True, help="Follow the pager.")
+@click.pass_obj
+def upcoming(obj, sport_id, page, day, league_id, lng_id, all_pages):
+    """Upcoming events for a sport."""
+    sport_id = resolve_sport_id(sport_id)
+
+    def fetch(page_number):
+        return obj.client.upcoming_events(
+            sport_id=sport_id,
+            page=page_number,
+            day=day,
+            league_id=league_id,
+            lng_id=lng_id,
+        )
+
+    first = obj.call(fetch, page)
+    responses = [first]
+    if all_pages and not page:
+        pages = [str(p) for p in range(2, page_count(first) + 1)]
+        responses = itertools.chain([first], obj.fan_out(fetch, pages))
+
+    obj.emit(responses)
+
+
+@main.command()
+@click.option("--sport-id", help="Filter by sport id.")
+@click.option("--league-id", help="Filter by league id.")
+@click.option("--raw", is_flag=True, help="Raw Bet365 body.")
+@click.option(
+    "--stream", is_flag=True,
+    help="Parse and write records while the body downloads.",
+)
+@click.pass_obj
+def inplay(obj, sport_id, league_id, raw, stream):
+    """In-play events, optionally filtered by sport or league."""
+    if stream and (sport_id or league_id):
+        raise click.UsageError(
+            "--stream cannot be combined with --sport-id / --league-id"
+        )
+
+    if stream:
+        obj.limiter.acquire()
+        obj.emit_records(
+            obj.client.stream("inplay", {"raw": "1" if raw else None})
+        )
+        return
+
+    if sport_id or league_id:
+        response = obj.call(
+            obj.client.in_play_filter, sport_id=sport_id, league_id=league_id
+        )
+    else:
+        response = obj.call(
+            obj.client.in_play_events, raw="1" if raw else None
+        )
+
+    obj.emit([response])
+
+
+@main.command()
+@click.argument("fi", nargs=-1, required=True)
+@click.option("--prematch", is_flag=True, help="Pre-match instead of live.")
+@click.option("--raw", is_flag=True, help="Raw Bet365 body.")
+@click.option("--stats", is_flag=True, help="Include extra stats (live).")
+@click.pass_obj
+def odds(obj, fi, prematch, raw, stats):
+    """Odds for one or more FIs."""
+    raw = "1" if raw else None
+    if prematch:
+        def fetch(item):
+            return obj.client.pre_match_odds(fi=item, raw=raw)
+    else:
+        def fetch(item):
+            return obj.client.in_play_odds(
+                fi=item, raw=raw, stats="1" if stats else None
+            )
+
+    obj.emit(obj.fan_out(fetch, fi))
+
+
+@main.command()
+@click.argument("event_id", nargs=-1, required=True)
+@click.pass_obj
+def result(obj, event_id):
+    """Results for one or more event ids."""
+    obj.emit(obj.fan_out(obj.client.result, event_id))
+
+
+@main.command()
+@click.option(
+    "--sport-id", "sport_ids", multiple=True,
+    help="Sport id to crawl (repeatable, defaults to every sport).",
+)
+@click.option(
+    "--day", "days", multiple=True, help="Day to crawl (repeatable)."
+)
+@click.pass_obj
+def crawl(obj, sport_ids, days):
+    """Every page of upcoming events for many sports and days."""
+    sport_ids = [resolve_sport_id(s) for s in sport_ids] or [
+        sport for sport, _ in Bet365SportId.list()
+    ]
+    targets = [(s, d) for s in sport_ids for d in (days or [None])]
+
+    def fetch(target):
+        sport_id, day, page = target
+        return obj.client.upcoming_events(
+            sport_id=sport_id, day=day, page=page
+        )
+
+    firsts = list(obj.fan_out(fetch, [(s, d, None) for s, d in targets]))
+    remaining = [
+        (s, d, str(p))
+        for (s, d), first in zip(targets, firsts)
+        for p in range(2, page_count(first) + 1)
+    ]
+
+    count = obj.emit(itertools.chain(firsts, obj.fan_out(fetch, remaining)))
     click.echo(
-        "Replace this message by putting your code into " "pybet365.cli.main"
+        "crawled {} records from {} pages".format(
+            count, len(firsts) + len(remaining)
+        ),
+        err=True,
+    )
+
+
+@main.command()
+@click.argument(
+    "endpoint", type=click.Choice(["result", "upcoming", "prematch", "inplay"])
+)
+@click.argument(
+    "paths", nargs=-1, required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--out-dir", required=True, type=click.Path(file_okay=False),
+    help="Directory for per shard columnar files.",
+)
+@click.option("--workers", "-w", type=int, help="Worker processes.")
+@click.option("--shards", type=int, help="Number of shards.")
+@click.option(
+    "--columnar", type=click.Choice(["json", "parquet"]), default="json",
+    show_default=True, help="Columnar output format.",
+)
+@click.pass_obj
+def bulk(obj, endpoint, paths, out_dir, workers, shards, columnar):
+    """Re-parse archived payload files across a process pool."""
+    from pybet365.bulk import process_archive
+
+    with obj.timer.stage("bulk"):
+        summaries = process_archive(
+            paths, endpoint, out_dir,
+            workers=workers, shards=shards, fmt=columnar,
+        )
+
+    writer = get_writer("ndjson", obj.output)
+    writer.write_many(summaries)
+    writer.close()
+
+
+BENCH_ENDPOINTS = {
+    "upcoming": "upcoming_events",
+    "inplay": "in_play_events",
+    "inplay_filter": "in_play_filter",
+    "odds": "in_play_odds",
+    "prematch": "pre_match_odds",
+    "result": "result",
+}
+
+
+@main.command()
+@click.argument("endpoint", type=click.Choice(sorted(BENCH_ENDPOINTS)))
+@click.option(
+    "--requests", "-n", "total", type=int, default=20, show_default=True,
+    help="Number of calls to make.",
+)
+@click.option(
+    "--param", "-p", "params", multiple=True,
+    help="Endpoint argument as key=value (repeatable).",
+)
+@click.option(
+    "--payload", type=click.Path(exists=True, dir_okay=False),
+    help="Benchmark decoding a saved payload instead of the live API.",
+)
+@click.pass_obj
+def bench(obj, endpoint, total, params, payload):
+    """Latency and throughput of an endpoint (or of parsing a payload)."""
+    kwargs = parse_params(params)
+
+    if payload:
+        from pybet365.client.config import RESPONSE_OBJECT_FACTORY
+        import pybet365.response as facades
+
+        url_extras = {
+            "odds": "event", "inplay_filter": "inplay_filter"
+        }.get(endpoint, endpoint)
+        facade = getattr(
+            facades, RESPONSE_OBJECT_FACTORY.get(url_extras, ""), dict
+        )
+        with open(payload) as f:
+            body = f.read()
+
+        def call(_):
+            return sum(1 for _ in records_of(facade(json.loads(body))))
+    else:
+        method = getattr(obj.client, BENCH_ENDPOINTS[endpoint])
+
+        def call(_):
+            return method(**kwargs)
+
+    latencies = []
+
+    def timed(i):
+        obj.limiter.acquire()
+        start = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = 1 if payload else obj.concurrency
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(timed, range(total)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    summary = {
+        "endpoint": endpoint,
+        "mode": "decode" if payload else "live",
+        "calls": total,
+        "concurrency": workers,
+        "wall_s": round(wall, 6),
+        "per_s": round(total / wall, 2) if wall else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1e3, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1e3, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1e3, 3),
+    }
+    obj.output.write(json.dumps(summary) + "\n")
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8365, show_default=True)
+@click.option("--latency", type=float, default=0.0, help="Seconds.")
+@click.option("--jitter", type=float, default=0.0, help="Seconds.")
+@click.option("--error-rate", type=float, default=0.0, help="500 ratio.")
+@click.option("--rate-limit", type=float, help="Requests/s per key.")
+@click.option("--quota", type=int, help="Requests per key per minute.")
+@click.option("--records", type=int, default=50, show_default=True)
+@click.option(
+    "--fixtures", type=click.Path(exists=True, file_okay=False),
+    help="Directory of <endpoint>.json bodies.",
+)
+@click.option(
+    "--compression/--no-compression", default=True, show_default=True,
+    help="Compress bodies per Accept-Encoding.",
+)
+def serve(
+    host, port, latency, jitter, error_rate, rate_limit, quota, records,
+    fixtures, compression
+):
+    """Run a local mock Bet365 API (see `--base-url`)."""
+    from pybet365.mock_server import MockBet365Server
+
+    server = MockBet365Server(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        rate_limit=rate_limit,
+        quota=quota,
+        records=records,
+        fixtures=fixtures,
+        compression=compression,
     )
     click.echo(
-        "See click documentation at https://click.palletsprojects.com/"
+        "Serving Bet365 mock on http://{}:{} "
+        "(--base-url 'http://{}:{}/{{}}/bet365/')".format(
+            host, port, host, port
+        ),
+        err=True,
     )
-    return 0
+    server.serve_forever(host, port)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest rank percentile of pre-sorted values."""
+    if not ordered:
+        return 0.0
+
+    rank = int(math.ceil(pct / 100.0 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
 
 
 if __name__ == "__main__":
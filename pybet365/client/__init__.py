@@ -1,4 +1,43 @@
-"""Client Namespace."""
+"""
+Client Namespace.
 
-from .client import Bet365  # noqa: F401
-from .config import Bet365SportId  # noqa: F401
+Members are imported on first access so that importing the package
+does not pull in `requests` until a client is actually built
+
+"""
+import importlib
+import sys
+
+_LAZY_MEMBERS = {
+    "AsyncBet365": "pybet365.client.async_client",
+    "Bet365": "pybet365.client.client",
+    "Bet365SportId": "pybet365.client.config",
+}
+
+__all__ = ["AsyncBet365", "Bet365", "Bet365SportId"]
+
+
+def __getattr__(name: str):
+    """Import lazily declared members on first access."""
+    module = _LAZY_MEMBERS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    """Include lazily declared members."""
+    return sorted(set(globals()) | set(_LAZY_MEMBERS))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # NOTE: module `__getattr__` (PEP 562) requires python 3.7
+    from .async_client import AsyncBet365  # noqa: F401
+    from .client import Bet365  # noqa: F401
+    from .config import Bet365SportId  # noqa: F401
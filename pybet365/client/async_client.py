@@ -0,0 +1,373 @@
+"""
+Asyncio Bet365 API Wrapper.
+
+`AsyncBet365` exposes the same endpoint methods as `Bet365` as
+coroutines over one `httpx.AsyncClient`; with `http2=True` every
+concurrent call shares a single multiplexed HTTP/2 connection, so
+fanning out over hundreds of FIs needs one socket instead of hundreds
+
+Requires `httpx` (and `h2` for HTTP/2): `pip install pybet365[http2]`
+
+>>> async with AsyncBet365(api_host="...", api_key="...") as client:
+...     odds = await client.gather(
+...         client.in_play_odds(fi=fi) for fi in fis
+...     )
+...     async for record in client.stream("inplay", {"raw": "1"}):
+...         print(record.type)
+
+"""
+import asyncio
+import codecs
+import time
+
+from typing import AsyncIterator, Iterable, List, Optional, Union
+from urllib.parse import urljoin
+
+from pybet365.client.cache import CacheEntry, ResponseCache
+from pybet365.client.client import NO_CACHE, Bet365, _merge
+from pybet365.client.hooks import Hooks, RequestContext
+from pybet365.client.keypool import KeyPool, KeyPoolExhausted
+from pybet365.client.transport import (
+    HttpxResponse,
+    _httpx,
+    client_options,
+    present,
+)
+from pybet365.response import Bet365Response
+from pybet365.response.intern import InternTable
+from pybet365.response.schema import SchemaValidator
+from pybet365.response.stream import ResultsStreamParser
+
+
+class AsyncBet365(Bet365):
+    """
+    Asyncio Bet365 API Wrapper.
+
+    Endpoint methods (`result`, `in_play_odds`, ...) return coroutines
+    and `stream` returns an async iterator
+
+    Args:
+        api_host (str): RapidAPI host
+        api_key (str): RapidAPI key
+        hooks (Optional[Hooks]): observability hooks (see `hooks.py`)
+        intern (Union[bool, InternTable, None]): intern repeating strings
+        key_pool (Optional[KeyPool]): credentials to route requests over
+        cache (Union[bool, ResponseCache, None]): revalidating response
+            cache (see `Bet365`)
+        base_url (Optional[str]): API root with a `{}` version placeholder
+        compression (Union[bool, Iterable[str], None]): codings to
+            negotiate (see `transport.py`)
+        http2 (bool): multiplex calls over HTTP/2 (requires `h2`)
+        max_connections (int): connection limit of the pool
+        concurrency (Optional[int]): calls in flight at once (`None` for
+            no limit)
+        timeout (float): seconds for connect / read / write / pool
+        client: `httpx.AsyncClient` to use instead of building one
+        validate (Union[str, SchemaValidator, None]): payload schema
+            validation (see `Bet365`)
+
+    Raises:
+        ImportError: when `httpx` (or `h2` for `http2`) is missing
+
+    """
+
+    def __init__(
+        self,
+        api_host=None,
+        api_key=None,
+        hooks: Optional[Hooks] = None,
+        intern: Union[bool, InternTable, None] = None,
+        key_pool: Optional[KeyPool] = None,
+        cache: Union[bool, ResponseCache, None] = None,
+        base_url: Optional[str] = None,
+        compression: Union[bool, Iterable[str], None] = True,
+        http2: bool = True,
+        max_connections: int = 100,
+        concurrency: Optional[int] = None,
+        timeout: float = 30.0,
+        client=None,
+        validate: Union[str, SchemaValidator, None] = None,
+    ):
+        """Constructor for AsyncBet365."""
+        httpx = _httpx()
+        super(AsyncBet365, self).__init__(
+            api_host,
+            api_key,
+            hooks=hooks,
+            intern=intern,
+            key_pool=key_pool,
+            cache=cache,
+            base_url=base_url,
+            compression=compression,
+            validate=validate,
+        )
+        self.http = client if client is not None else httpx.AsyncClient(
+            **client_options(
+                httpx, http2, max_connections, timeout,
+                plaintext=self.base_url.startswith("http://"),
+            )
+        )
+        self.concurrency = concurrency
+        self._semaphore = None
+
+    async def _get(
+        self, url_extras: str, params: dict, version: str = "v1"
+    ) -> Bet365Response:
+        """
+        Request maker for AsyncBet365 (see `Bet365._get`).
+
+        Raises:
+            `raise_for_status()` for statuses other than `200`
+
+        """
+        url = urljoin(self.base_url.format(version), url_extras)
+
+        ctx = None
+        if self.hooks:
+            ctx = RequestContext(url_extras, url, params)
+            ctx.started = time.perf_counter()
+            self.hooks.emit("request_start", ctx)
+
+        try:
+            cache = self.cache
+            if cache is None:
+                response = await self._limited(url, params, ctx, url_extras)
+            else:
+                key = cache.key(url, self._prune(params))
+                entry = cache.get(key)
+                response = await self._limited(
+                    url, params, ctx, url_extras,
+                    entry.validators if entry else None,
+                )
+                if response.status_code == 304 and entry is None:
+                    response = await self._limited(
+                        url, params, ctx, url_extras, NO_CACHE
+                    )
+                facade, digest = self._revalidate(entry, response, ctx)
+                if facade is not None:
+                    return facade
+
+            payload = self._decode(response, ctx)
+            if self.validator is not None:
+                self.validator.validate(url_extras, payload)
+
+            if ctx is None:
+                delegate_object = self._wrap(url_extras, payload)
+            else:
+                decoded = time.perf_counter()
+                delegate_object = self._wrap(url_extras, payload)
+                ctx.facade_time = time.perf_counter() - decoded
+                ctx.result = delegate_object
+
+            if cache is not None:
+                cache.set(key, CacheEntry.from_response(
+                    response, delegate_object, digest, url_extras
+                ), response.content)
+
+            return delegate_object
+
+        except Exception as exc:
+            if ctx is not None:
+                ctx.error = exc
+                self.hooks.emit("error", ctx)
+            raise
+
+        finally:
+            if ctx is not None:
+                ctx.elapsed = time.perf_counter() - ctx.started
+                self.hooks.emit("request_end", ctx)
+
+    async def _limited(
+        self,
+        url: str,
+        params: dict,
+        ctx: Optional[RequestContext] = None,
+        endpoint: Optional[str] = None,
+        headers: Optional[dict] = None,
+    ) -> HttpxResponse:
+        """`_request` once a `concurrency` slot is free."""
+        if self.concurrency is None:
+            return await self._request(url, params, ctx, endpoint, headers)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await self._request(url, params, ctx, endpoint, headers)
+
+    async def _request(
+        self,
+        url: str,
+        params: dict,
+        ctx: Optional[RequestContext] = None,
+        endpoint: Optional[str] = None,
+        headers: Optional[dict] = None,
+    ) -> HttpxResponse:
+        """
+        Issue the HTTP request and read the body.
+
+        Raises:
+            `raise_for_status()` for statuses other than `200`
+
+        """
+        response = await self._send(url, params, ctx, headers)
+        wire_bytes = await response.aread_wire()
+        self.metrics.record(
+            endpoint or url,
+            wire_bytes,
+            len(response.content),
+            response.headers.get("Content-Encoding"),
+        )
+
+        if ctx is not None:
+            ctx.status = response.status_code
+            ctx.wire_bytes = wire_bytes
+            ctx.server_time = response.elapsed.total_seconds()
+            ctx.download_time = max(
+                time.perf_counter() - ctx.started - ctx.server_time, 0.0
+            )
+
+        response.raise_for_status()
+
+        return response
+
+    async def _send(
+        self,
+        url: str,
+        params: dict,
+        ctx: Optional[RequestContext] = None,
+        headers: Optional[dict] = None,
+    ) -> HttpxResponse:
+        """
+        Send the GET request, routing over the `key_pool` when set.
+
+        A `429` answer ejects the key and the request is retried on the
+        next available key, at most once per key in the pool
+
+        Args:
+            headers (Optional[dict]): extra headers (e.g. validators)
+
+        """
+        pool = self.key_pool
+        if pool is None:
+            return await self._fetch(
+                url, _merge(self.headers, headers), params
+            )
+
+        attempts = len(pool)
+        response = None
+        for attempt in range(1, attempts + 1):
+            try:
+                credential = pool.acquire()
+            except KeyPoolExhausted:
+                if response is None:
+                    raise
+                # every key is cooling down, surface the last `429`
+                return response
+
+            status = answer_headers = None
+            try:
+                response = await self._fetch(
+                    url, _merge(credential.headers, headers), params
+                )
+                status, answer_headers = response.status_code, (
+                    response.headers
+                )
+            finally:
+                pool.release(credential, status, answer_headers)
+
+            if status != 429 or attempt == attempts:
+                return response
+
+            await response.aread_wire()
+            if ctx is not None:
+                ctx.attempt = attempt + 1
+                self.hooks.emit("retry", ctx)
+
+        return response
+
+    async def _fetch(
+        self, url: str, headers: dict, params: dict
+    ) -> HttpxResponse:
+        """GET `url`, returning once the headers arrived."""
+        request = self.http.build_request(
+            "GET",
+            url,
+            headers=present(dict(headers, **self._encoding_headers)),
+            params=self._prune(params),
+        )
+        start = time.perf_counter()
+        response = await self.http.send(request, stream=True)
+
+        return HttpxResponse(response, time.perf_counter() - start)
+
+    @staticmethod
+    async def gather(
+        calls: Iterable, return_exceptions: bool = False
+    ) -> List:
+        """
+        Await endpoint calls concurrently, results in call order.
+
+        >>> await client.gather(client.result(event_id=i) for i in ids)
+
+        """
+        return await asyncio.gather(
+            *calls, return_exceptions=return_exceptions
+        )
+
+    async def stream(
+        self,
+        url_extras: str,
+        params: Optional[dict] = None,
+        version: str = "v1",
+        chunk_size: int = 65536,
+        header: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the `results` records of an endpoint as they download.
+
+        Async counterpart of `Bet365.stream`, records are parsed from the
+        chunks of `aiter_bytes` while the body is still downloading
+
+        >>> async for record in client.stream("inplay", {"raw": "1"}):
+        ...     print(record.type)
+
+        Raises:
+            `raise_for_status()` for statuses other than `200`
+
+        """
+        url = urljoin(self.base_url.format(version), url_extras)
+        handle = self._record_handler(url_extras)
+        parser = ResultsStreamParser(
+            object_hook=self.intern.object_hook if self.intern else None
+        )
+        decoder = codecs.getincrementaldecoder("utf-8")()
+
+        response = await self._send(url, params or {})
+        try:
+            response.raise_for_status()
+
+            async for chunk in response.aiter_content(chunk_size):
+                for record in parser.feed(decoder.decode(chunk)):
+                    yield handle(record)
+
+            for record in parser.feed(decoder.decode(b"", final=True)):
+                yield handle(record)
+            for record in parser.close():
+                yield handle(record)
+        finally:
+            await response.aclose()
+
+        if header is not None:
+            header.update(parser.header)
+
+    async def aclose(self) -> None:
+        """Close every connection."""
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncBet365":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Close on exit."""
+        await self.aclose()
@@ -0,0 +1,173 @@
+"""
+Response Cache for Bet365 Client.
+
+Keeps the parsed facade of recent responses so repeated polls can skip
+the download and/or the decode:
+
+    validators - `ETag` / `Last-Modified` are sent back as
+        `If-None-Match` / `If-Modified-Since`, a `304` reuses the facade
+
+    content hash - without validators (or when they are ignored) the body
+        digest is compared and an unchanged body is not decoded again
+
+NOTE: a cache hit returns the same facade object as the first response,
+treat cached facades as read-only
+
+>>> client = Bet365(api_host="host", api_key="key", cache=ResponseCache())
+
+"""
+import hashlib
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Optional
+
+
+class CacheEntry(object):
+    """Cached facade with the validators of the response it came from."""
+
+    __slots__ = (
+        "etag",
+        "last_modified",
+        "digest",
+        "facade",
+        "size",
+        "stored_at",
+        "url_extras",
+    )
+
+    def __init__(
+        self,
+        facade,
+        digest: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        size: int = 0,
+        url_extras: Optional[str] = None,
+    ):
+        """Constructor for CacheEntry."""
+        self.facade = facade
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+        self.stored_at = time.time()
+        self.url_extras = url_extras
+
+    @classmethod
+    def from_response(
+        cls, response, facade, digest: str, url_extras: Optional[str] = None
+    ) -> "CacheEntry":
+        """Build an entry from a `requests.Response`."""
+        headers = response.headers or {}
+        return cls(
+            facade=facade,
+            digest=digest,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            size=len(response.content),
+            url_extras=url_extras,
+        )
+
+    @property
+    def validators(self) -> dict:
+        """Conditional request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ResponseCache(object):
+    """
+    LRU cache of `CacheEntry` objects keyed by request.
+
+    Args:
+        max_entries (int): entries kept before the least recently used
+            one is evicted
+
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Constructor for ResponseCache."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    @staticmethod
+    def key(url: str, params: Optional[dict]) -> tuple:
+        """Cache key of a request."""
+        return (url, tuple(sorted((params or {}).items())))
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """Content hash of a response body."""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """Entry for `key` (marked as recently used)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def set(
+        self, key: tuple, entry: CacheEntry, content: Optional[bytes] = None
+    ) -> None:
+        """
+        Store `entry`, evicting the least recently used entries.
+
+        `content` (the raw body) is ignored, tiers keeping bodies use it
+
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def hit(self, entry: CacheEntry, response) -> None:
+        """Record a reuse of `entry` and refresh its validators."""
+        headers = response.headers or {}
+        with self._lock:
+            self.hits += 1
+            if response.status_code == 304:
+                self.not_modified += 1
+            else:
+                self.unchanged += 1
+            entry.etag = headers.get("ETag") or entry.etag
+            entry.last_modified = (
+                headers.get("Last-Modified") or entry.last_modified
+            )
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Cache counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+        }
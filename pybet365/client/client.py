@@ -21,26 +21,105 @@ Bet365 Exposes 6 Endpoints:
 Responses are parsed into Facade Access objects (Base Bet365Response)
 
 """
-from typing import Optional, Union
+import time
+
+from contextlib import closing, contextmanager
+from typing import Callable, Iterable, Iterator, Optional, Union
 from urllib.parse import urljoin
 
 import requests
 
 import pybet365.response as facades
 from pybet365.response import Bet365Response
-from pybet365.client.config import RESPONSE_OBJECT_FACTORY
+from pybet365.client.cache import CacheEntry, ResponseCache
+from pybet365.client.config import (
+    RECORD_OBJECT_FACTORY,
+    RESPONSE_OBJECT_FACTORY,
+)
+from pybet365.client.hooks import Hooks, RequestContext
+from pybet365.client.keypool import KeyPool, KeyPoolExhausted
+from pybet365.client.profile import Profiler
+from pybet365.client.transport import (
+    TransportMetrics,
+    accept_encoding,
+    read_body,
+)
+from pybet365.response.intern import SHARED_TABLE, InternTable
+from pybet365.response.schema import SchemaValidator
+from pybet365.response.stream import iter_results
+
+BASE_URL = "https://bet365-sports-odds.p.rapidapi.com/{}/bet365/"
+
+# NOTE: a `304` with no cached entry to answer from (e.g. sent by an
+# intermediary cache) is a miss, the body is requested again without
+# validators and past any intermediary
+NO_CACHE = {"Cache-Control": "no-cache"}
 
 
 class Bet365(object):
     """Bet365 API Wrapper."""
 
-    def __init__(self, api_host, api_key):
-        """Constructor for Bet365."""
-        self.base_url = "https://bet365-sports-odds.p.rapidapi.com/{}/bet365/"
-        self.headers = {
-            "x-rapidapi-host": api_host,
-            "x-rapidapi-key": api_key,
-        }
+    def __init__(
+        self,
+        api_host=None,
+        api_key=None,
+        hooks: Optional[Hooks] = None,
+        intern: Union[bool, InternTable, None] = None,
+        key_pool: Optional[KeyPool] = None,
+        cache: Union[bool, ResponseCache, None] = None,
+        base_url: Optional[str] = None,
+        compression: Union[bool, Iterable[str], None] = True,
+        transport=None,
+        validate: Union[str, SchemaValidator, None] = None,
+    ):
+        """
+        Constructor for Bet365.
+
+        Args:
+            api_host (str): RapidAPI host
+            api_key (str): RapidAPI key
+            hooks (Optional[Hooks]): observability hooks (see `hooks.py`)
+            intern (Union[bool, InternTable, None]): intern repeating
+                strings while decoding, `True` uses the shared table
+            key_pool (Optional[KeyPool]): credentials to route requests
+                over instead of `api_host`/`api_key` (see `keypool.py`)
+            cache (Union[bool, ResponseCache, None]): revalidating
+                response cache, `True` builds a default `ResponseCache`
+                (`TieredCache` bounds it by bytes, see `tiered.py`)
+            base_url (Optional[str]): API root with a `{}` placeholder for
+                the version (e.g. a local `MockBet365Server.url`)
+            compression (Union[bool, Iterable[str], None]): codings to
+                negotiate, `True` for every installed decoder, `False`
+                for uncompressed bodies (see `transport.py`)
+            transport: object with a `requests.get` compatible `get`
+                (`RequestsTransport`, `HttpxTransport`), `None` for
+                `requests.get`
+            validate (Union[str, SchemaValidator, None]): check payloads
+                against the endpoint schemas, "strict", "sample" (one in
+                100) or a `SchemaValidator`, `None` skips validation
+
+        """
+        self.base_url = base_url or BASE_URL
+        self.accept_encoding = accept_encoding(compression)
+        self._encoding_headers = {"Accept-Encoding": self.accept_encoding}
+        self.metrics = TransportMetrics()
+        self.transport = transport
+        self.validator = SchemaValidator.build(validate)
+        if key_pool is not None and api_key is None:
+            self.headers = key_pool.credentials[0].headers
+        else:
+            self.headers = {
+                "x-rapidapi-host": api_host,
+                "x-rapidapi-key": api_key,
+            }
+        self.key_pool = key_pool
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache if cache is not False else None
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.intern = SHARED_TABLE if intern is True else (
+            intern if isinstance(intern, InternTable) else None
+        )
 
     def _get(
         self, url_extras: str, params: dict, version: str = "v1"
@@ -64,26 +143,337 @@ class Bet365(object):
         """
         url = urljoin(self.base_url.format(version), url_extras)
 
-        response = requests.get(
-            url=url, headers=self.headers, params=self._prune(params)
+        # NOTE: `ctx` stays `None` (and every timing branch is skipped)
+        # unless a hook handler is registered
+        ctx = None
+        if self.hooks:
+            ctx = RequestContext(url_extras, url, params)
+            ctx.started = time.perf_counter()
+            self.hooks.emit("request_start", ctx)
+
+        try:
+            cache = self.cache
+            if cache is None:
+                response = self._request(url, params, ctx, endpoint=url_extras)
+            else:
+                key = cache.key(url, self._prune(params))
+                entry = cache.get(key)
+                response = self._request(
+                    url, params, ctx, entry.validators if entry else None,
+                    endpoint=url_extras,
+                )
+                if response.status_code == 304 and entry is None:
+                    response = self._request(
+                        url, params, ctx, NO_CACHE, endpoint=url_extras
+                    )
+                facade, digest = self._revalidate(entry, response, ctx)
+                if facade is not None:
+                    return facade
+
+            payload = self._decode(response, ctx)
+            if self.validator is not None:
+                self.validator.validate(url_extras, payload)
+
+            if ctx is None:
+                delegate_object = self._wrap(url_extras, payload)
+            else:
+                decoded = time.perf_counter()
+                delegate_object = self._wrap(url_extras, payload)
+                ctx.facade_time = time.perf_counter() - decoded
+                ctx.result = delegate_object
+
+            if cache is not None:
+                cache.set(key, CacheEntry.from_response(
+                    response, delegate_object, digest, url_extras
+                ), response.content)
+
+            return delegate_object
+
+        except Exception as exc:
+            if ctx is not None:
+                ctx.error = exc
+                self.hooks.emit("error", ctx)
+            raise
+
+        finally:
+            if ctx is not None:
+                ctx.elapsed = time.perf_counter() - ctx.started
+                self.hooks.emit("request_end", ctx)
+
+    def _revalidate(
+        self,
+        entry: Optional[CacheEntry],
+        response: requests.Response,
+        ctx: Optional[RequestContext] = None,
+    ) -> tuple:
+        """
+        Check a response against the cached `entry` of its request.
+
+        Returns:
+            (facade, digest): the cached facade when `response` is a
+                `304` or a byte-identical body (`None` otherwise) and the
+                digest of a new body
+
+        """
+        digest = None
+        if response.status_code != 304:
+            digest = self.cache.digest(response.content)
+        if entry is not None and (digest is None or digest == entry.digest):
+            # 304 or byte-identical body: skip decode entirely
+            self.cache.hit(entry, response)
+            if ctx is not None:
+                ctx.result = entry.facade
+                self.hooks.emit("cache_hit", ctx)
+            return entry.facade, digest
+
+        return None, digest
+
+    @contextmanager
+    def profile(self, **kwargs) -> Iterator[Profiler]:
+        """
+        Profile every call made inside the block.
+
+        >>> with client.profile() as profiler:
+        ...     client.result(event_id="2130836")
+        >>> print("\\n".join(profiler.report()))
+
+        Args:
+            **kwargs: `Profiler` options (`slowest`, `allocations`,
+                `materialize`, `sample_interval`)
+
+        Yields:
+            Profiler: layer breakdowns, slowest calls, sampled stacks
+
+        """
+        profiler = Profiler(**kwargs)
+        self.hooks.add(profiler)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            self.hooks.remove(profiler)
+
+    def _request(
+        self,
+        url: str,
+        params: dict,
+        ctx: Optional[RequestContext] = None,
+        headers: Optional[dict] = None,
+        endpoint: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        Issue the HTTP request.
+
+        The body is read raw and decompressed by `read_body`, compressed
+        and decoded sizes are recorded in `metrics` under `endpoint`
+
+        With a `ctx`, server time (connect + wait for headers) is split
+        from the body download
+
+        Raises:
+            `raise_for_status()` for statuses other than `200`
+
+        """
+        response = self._send(url, params, ctx, headers=headers, stream=True)
+        wire_bytes = read_body(response)
+        self.metrics.record(
+            endpoint or url,
+            wire_bytes,
+            len(response.content or b""),
+            response.headers.get("Content-Encoding"),
         )
+
+        if ctx is not None:
+            ctx.status = response.status_code
+            ctx.wire_bytes = wire_bytes
+            ctx.server_time = response.elapsed.total_seconds()
+            ctx.download_time = max(
+                time.perf_counter() - ctx.started - ctx.server_time, 0.0
+            )
+
         response.raise_for_status()
 
+        return response
+
+    def _send(
+        self,
+        url: str,
+        params: dict,
+        ctx: Optional[RequestContext] = None,
+        headers: Optional[dict] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send the GET request, routing over the `key_pool` when set.
+
+        A `429` answer ejects the key and the request is retried on the
+        next available key, at most once per key in the pool
+
+        Args:
+            headers (Optional[dict]): extra headers (e.g. validators)
+
+        """
+        headers = _merge(self._encoding_headers, headers)
+        get = requests.get if self.transport is None else self.transport.get
+        pool = self.key_pool
+        if pool is None:
+            return get(
+                url=url,
+                headers=_merge(self.headers, headers),
+                params=self._prune(params),
+                **kwargs
+            )
+
+        attempts = len(pool)
+        response = None
+        for attempt in range(1, attempts + 1):
+            try:
+                credential = pool.acquire()
+            except KeyPoolExhausted:
+                if response is None:
+                    raise
+                # every key is cooling down, surface the last `429`
+                return response
+
+            status = answer_headers = None
+            try:
+                response = get(
+                    url=url,
+                    headers=_merge(credential.headers, headers),
+                    params=self._prune(params),
+                    **kwargs
+                )
+                status, answer_headers = response.status_code, response.headers
+            finally:
+                pool.release(credential, status, answer_headers)
+
+            if status != 429 or attempt == attempts:
+                return response
+
+            response.close()
+            if ctx is not None:
+                ctx.attempt = attempt + 1
+                self.hooks.emit("retry", ctx)
+
+        return response
+
+    def _decode(
+        self, response: requests.Response, ctx: Optional[RequestContext] = None
+    ) -> dict:
+        """Decode the `json` body of `response`."""
+        if ctx is None:
+            return self._loads(response)
+
+        start = time.perf_counter()
+        ctx.payload_bytes = len(response.content)
+        payload = self._loads(response)
+        ctx.decode_time = time.perf_counter() - start
+        self.hooks.emit("decode", ctx)
+
+        return payload
+
+    def _loads(self, response: requests.Response) -> dict:
+        """`response.json()`, interning strings when enabled."""
+        if self.intern is None:
+            return response.json()
+
+        return response.json(object_hook=self.intern.object_hook)
+
+    @staticmethod
+    def _wrap(url_extras: str, payload: dict) -> Bet365Response:
+        """
+        Wrap a decoded `payload` in the facade registered for the endpoint.
+
+        Args:
+            url_extras (str): Tail for the endpoint the payload came from
+            payload (dict): decoded `.json()` response
+
+        Returns:
+            Bet365Response: facade, or `payload` if no facade exists
+
+        """
         try:
             # Using factory pattern we instantiate the Response Object
             delegation = getattr(
-                facades, RESPONSE_OBJECT_FACTORY.get(url_extras)
+                facades, RESPONSE_OBJECT_FACTORY.get(url_extras, "")
             )
 
             # Load the desired `.json()` response to ResponseObject
-            delegate_object = delegation(response.json())
+            delegate_object = delegation(payload)
 
         except AttributeError:
             # fall back on `.json()` if facade does not exist
-            return response.json()
+            return payload
 
         return delegate_object
 
+    def stream(
+        self,
+        url_extras: str,
+        params: Optional[dict] = None,
+        version: str = "v1",
+        chunk_size: int = 65536,
+        header: Optional[dict] = None,
+    ) -> Iterator[dict]:
+        """
+        Stream the `results` records of an endpoint as they download.
+
+        Records are parsed incrementally from the socket and wrapped in
+        their record facade (`UpcomingEvent`, `Result`, ...) one by one,
+        raw nested record arrays are flattened
+
+        >>> for record in client.stream("inplay", {"raw": "1"}):
+        ...     print(record.type)
+
+        Args:
+            url_extras (str): endpoint tail (e.g. "inplay", "upcoming")
+            params (Optional[dict]): GET operation params dict
+            version (str): API version for `url`
+            chunk_size (int): socket read size in bytes
+            header (Optional[dict]): filled with the non `results` keys
+                ("success", "pager") once the body is consumed
+
+        Returns:
+            Iterator[dict]: record facades (or `dict` without a facade)
+
+        Raises:
+            `raise_for_status()` for statuses other than `200`
+
+        """
+        url = urljoin(self.base_url.format(version), url_extras)
+        handle = self._record_handler(url_extras)
+
+        response = self._send(url, params or {}, stream=True)
+        with closing(response):
+            response.raise_for_status()
+
+            records = iter_results(
+                response.iter_content(chunk_size=chunk_size),
+                object_hook=self.intern.object_hook if self.intern else None,
+                header=header,
+            )
+            for record in records:
+                yield handle(record)
+
+    def _record_handler(self, url_extras: str) -> Callable:
+        """Validate a streamed record and wrap it in its record facade."""
+        delegation = getattr(
+            facades, RECORD_OBJECT_FACTORY.get(url_extras, ""), None
+        )
+        check = None
+        if self.validator is not None:
+            check = self.validator.record_validator(url_extras)
+
+        def handle(record):
+            if check is not None:
+                check(record)
+            if delegation is not None and isinstance(record, dict):
+                record = delegation(record)
+            return record
+
+        return handle
+
     def result(self, event_id: str) -> Bet365Response:
         """
         Caller for `Result` endpoint of Bet365 API.
@@ -223,3 +613,14 @@ class Bet365(object):
         pruned_params = dict((k, v) for k, v in params.items() if v)
 
         return pruned_params
+
+
+def _merge(base: dict, extra: Optional[dict]) -> dict:
+    """`base` headers updated with `extra` (without copying if empty)."""
+    if not extra:
+        return base
+
+    merged = dict(base)
+    merged.update(extra)
+
+    return merged
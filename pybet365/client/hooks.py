@@ -0,0 +1,390 @@
+"""
+Observability Hooks for Bet365 Client.
+
+`Bet365._get` emits events around every request when (and only when) at
+least one handler is registered, otherwise a single truthiness check is
+the entire cost
+
+Events (handlers receive a `RequestContext`):
+
+    request_start - before the HTTP call
+
+    request_end - after the facade is built (or the call failed)
+
+    retry - before a request is re-issued
+
+    cache_hit - a cached facade is returned instead of decoding
+
+    decode - after the `json` body is decoded
+
+    error - the request raised
+
+Built-in adapters:
+
+    MetricsHook - Prometheus style counters and histograms with a text
+        exposition `render()`
+
+    OpenTelemetryHook - one span per request with stage attributes
+
+>>> hooks = Hooks(MetricsHook())
+>>> client = Bet365(api_host="host", api_key="key", hooks=hooks)
+
+"""
+import threading
+
+from bisect import bisect_left
+from typing import Callable, Optional
+
+EVENTS = (
+    "request_start",
+    "request_end",
+    "retry",
+    "cache_hit",
+    "decode",
+    "error",
+)
+
+
+class RequestContext(object):
+    """Mutable per-request record passed to every hook handler."""
+
+    __slots__ = (
+        "endpoint",
+        "url",
+        "params",
+        "attempt",
+        "started",
+        "status",
+        "elapsed",
+        "server_time",
+        "download_time",
+        "decode_time",
+        "facade_time",
+        "payload_bytes",
+        "wire_bytes",
+        "error",
+        "result",
+        "state",
+    )
+
+    def __init__(self, endpoint: str, url: str, params: dict):
+        """Constructor for RequestContext."""
+        self.endpoint = endpoint
+        self.url = url
+        self.params = params
+        self.attempt = 1
+        self.started = None
+        self.status = None
+        self.elapsed = None
+        self.server_time = None
+        self.download_time = None
+        self.decode_time = None
+        self.facade_time = None
+        self.payload_bytes = None
+        # NOTE: body bytes before decompression
+        self.wire_bytes = None
+        self.error = None
+        # NOTE: facade (or raw payload) returned, set before `request_end`
+        self.result = None
+        # NOTE: scratch space for adapters (e.g. open spans)
+        self.state = {}
+
+
+class Hooks(object):
+    """
+    Registry of event handlers.
+
+    >>> hooks = Hooks()
+    >>> @hooks.on("request_end")
+    ... def log(ctx):
+    ...     print(ctx.endpoint, ctx.elapsed)
+
+    """
+
+    def __init__(self, *adapters):
+        """Constructor for Hooks."""
+        self._handlers = {}
+        for adapter in adapters:
+            self.add(adapter)
+
+    def on(self, event: str, handler: Optional[Callable] = None):
+        """
+        Register `handler` for `event` (usable as a decorator).
+
+        Raises:
+            ValueError: for unknown `event`
+
+        """
+        if event not in EVENTS:
+            raise ValueError("Unknown hook event: {}".format(event))
+
+        def register(fn):
+            self._handlers.setdefault(event, []).append(fn)
+            return fn
+
+        return register(handler) if handler else register
+
+    def add(self, adapter) -> None:
+        """Register every `on_<event>` method of `adapter`."""
+        for event in EVENTS:
+            handler = getattr(adapter, "on_" + event, None)
+            if handler is not None:
+                self.on(event, handler)
+
+    def remove(self, adapter) -> None:
+        """Unregister every `on_<event>` method of `adapter`."""
+        for event in EVENTS:
+            handler = getattr(adapter, "on_" + event, None)
+            if handler in self._handlers.get(event, ()):
+                self._handlers[event].remove(handler)
+                if not self._handlers[event]:
+                    del self._handlers[event]
+
+    def emit(self, event: str, ctx: RequestContext) -> None:
+        """Call every handler registered for `event`."""
+        for handler in self._handlers.get(event, ()):
+            handler(ctx)
+
+    def __bool__(self) -> bool:
+        """`True` when at least one handler is registered."""
+        return bool(self._handlers)
+
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+SIZE_BUCKETS = (
+    1e3, 1e4, 1e5, 1e6, 1e7, 1e8,
+)
+
+
+class Histogram(object):
+    """Cumulative bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        """Constructor for Histogram."""
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        """Record `value` for `labels`."""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [
+                [0] * (len(self.buckets) + 1), 0.0, 0
+            ]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names: tuple) -> list:
+        """Prometheus text exposition lines."""
+        lines = [
+            "# HELP {} {}".format(self.name, self.help_text),
+            "# TYPE {} histogram".format(self.name),
+        ]
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            base = _labels(label_names, labels)
+            running = 0
+            for bound, bucket in zip(self.buckets + ("+Inf",), counts):
+                running += bucket
+                lines.append("{}_bucket{{{}le=\"{}\"}} {}".format(
+                    self.name, base + "," if base else "", bound, running
+                ))
+            lines.append("{}_sum{{{}}} {}".format(self.name, base, total))
+            lines.append("{}_count{{{}}} {}".format(self.name, base, count))
+
+        return lines
+
+
+class MetricsHook(object):
+    """
+    Prometheus style metrics adapter.
+
+    Counters and histograms are labelled by endpoint (and status), the
+    text exposition format is available from `render()`
+
+    """
+
+    LABELS = ("endpoint",)
+
+    def __init__(self, namespace: str = "pybet365"):
+        """Constructor for MetricsHook."""
+        self.namespace = namespace
+        self.requests = {}
+        self.retries = {}
+        self.cache_hits = {}
+        self.errors = {}
+        self.latency = Histogram(
+            namespace + "_request_seconds",
+            "Wall time of Bet365 requests.",
+            DEFAULT_BUCKETS,
+        )
+        self.decode = Histogram(
+            namespace + "_decode_seconds",
+            "Time spent decoding json bodies.",
+            DEFAULT_BUCKETS,
+        )
+        self.payload = Histogram(
+            namespace + "_payload_bytes",
+            "Size of response bodies.",
+            SIZE_BUCKETS,
+        )
+        self._lock = threading.Lock()
+
+    def on_request_end(self, ctx: RequestContext) -> None:
+        """Count the request and observe its timings."""
+        with self._lock:
+            key = (ctx.endpoint, str(ctx.status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if ctx.elapsed is not None:
+                self.latency.observe((ctx.endpoint,), ctx.elapsed)
+            if ctx.decode_time is not None:
+                self.decode.observe((ctx.endpoint,), ctx.decode_time)
+            if ctx.payload_bytes is not None:
+                self.payload.observe((ctx.endpoint,), ctx.payload_bytes)
+
+    def on_retry(self, ctx: RequestContext) -> None:
+        """Count a retry."""
+        with self._lock:
+            self.retries[ctx.endpoint] = self.retries.get(ctx.endpoint, 0) + 1
+
+    def on_cache_hit(self, ctx: RequestContext) -> None:
+        """Count a cache hit."""
+        with self._lock:
+            self.cache_hits[ctx.endpoint] = (
+                self.cache_hits.get(ctx.endpoint, 0) + 1
+            )
+
+    def on_error(self, ctx: RequestContext) -> None:
+        """Count an error by exception type."""
+        with self._lock:
+            key = (ctx.endpoint, type(ctx.error).__name__)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        with self._lock:
+            lines = []
+            lines += _render_counter(
+                self.namespace + "_requests_total",
+                "Bet365 requests by endpoint and status.",
+                ("endpoint", "status"),
+                self.requests,
+            )
+            lines += _render_counter(
+                self.namespace + "_retries_total",
+                "Retried Bet365 requests.",
+                self.LABELS,
+                dict(((k,), v) for k, v in self.retries.items()),
+            )
+            lines += _render_counter(
+                self.namespace + "_cache_hits_total",
+                "Responses served from cache.",
+                self.LABELS,
+                dict(((k,), v) for k, v in self.cache_hits.items()),
+            )
+            lines += _render_counter(
+                self.namespace + "_errors_total",
+                "Failed Bet365 requests by exception type.",
+                ("endpoint", "error"),
+                self.errors,
+            )
+            for histogram in (self.latency, self.decode, self.payload):
+                lines += histogram.render(self.LABELS)
+
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook(object):
+    """
+    OpenTelemetry style tracing adapter.
+
+    One span is opened per request on `request_start` and closed on
+    `request_end` with stage timings set as attributes
+
+    Args:
+        tracer: an OpenTelemetry `Tracer` (defaults to the global
+            `opentelemetry.trace` tracer, which must be installed)
+
+    """
+
+    def __init__(self, tracer=None):
+        """Constructor for OpenTelemetryHook."""
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ImportError(
+                    "OpenTelemetryHook requires `opentelemetry-api` "
+                    "or an explicit `tracer`"
+                )
+            tracer = trace.get_tracer("pybet365")
+
+        self.tracer = tracer
+
+    def on_request_start(self, ctx: RequestContext) -> None:
+        """Open a span for the request."""
+        ctx.state["span"] = self.tracer.start_span(
+            "bet365." + ctx.endpoint,
+            attributes={"http.url": ctx.url, "bet365.endpoint": ctx.endpoint},
+        )
+
+    def on_retry(self, ctx: RequestContext) -> None:
+        """Annotate the span with the retry."""
+        span = ctx.state.get("span")
+        if span is not None:
+            span.add_event("retry", {"attempt": ctx.attempt})
+
+    def on_cache_hit(self, ctx: RequestContext) -> None:
+        """Annotate the span with the cache hit."""
+        span = ctx.state.get("span")
+        if span is not None:
+            span.add_event("cache_hit")
+
+    def on_request_end(self, ctx: RequestContext) -> None:
+        """Close the span with stage attributes."""
+        span = ctx.state.pop("span", None)
+        if span is None:
+            return
+
+        attributes = {
+            "http.status_code": ctx.status,
+            "bet365.elapsed": ctx.elapsed,
+            "bet365.server_time": ctx.server_time,
+            "bet365.download_time": ctx.download_time,
+            "bet365.decode_time": ctx.decode_time,
+            "bet365.facade_time": ctx.facade_time,
+            "bet365.payload_bytes": ctx.payload_bytes,
+            "bet365.attempt": ctx.attempt,
+        }
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        if ctx.error is not None:
+            span.record_exception(ctx.error)
+
+        span.end()
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    """Render a Prometheus label set."""
+    return ",".join(
+        "{}=\"{}\"".format(name, value) for name, value in zip(names, values)
+    )
+
+
+def _render_counter(name: str, help_text: str, names: tuple, series: dict):
+    """Prometheus text exposition lines for a counter."""
+    lines = [
+        "# HELP {} {}".format(name, help_text),
+        "# TYPE {} counter".format(name),
+    ]
+    for labels, value in sorted(series.items()):
+        lines.append("{}{{{}}} {}".format(name, _labels(names, labels), value))
+
+    return lines
@@ -0,0 +1,256 @@
+"""
+RapidAPI Credential Pool for Bet365 Client.
+
+Spreads requests over several `(host, key)` credentials so throughput
+is not capped by a single key's quota
+
+    weighted round robin - smooth weighted rotation (default)
+
+    least used - fewest in-flight, then fewest requests per weight
+
+Per key quota is read from the RapidAPI `x-ratelimit-requests-*`
+response headers. Keys answering `429` (or reporting no remaining
+quota) are ejected until their reset/`Retry-After` elapses
+
+>>> pool = KeyPool([("host", "key-1"), ("host", "key-2", 3)])
+>>> client = Bet365(key_pool=pool)
+
+"""
+import threading
+import time
+
+from typing import Callable, Iterable, Mapping, Optional
+
+REMAINING_HEADER = "x-ratelimit-requests-remaining"
+LIMIT_HEADER = "x-ratelimit-requests-limit"
+RESET_HEADER = "x-ratelimit-requests-reset"
+RETRY_AFTER_HEADER = "retry-after"
+
+
+class KeyPoolExhausted(RuntimeError):
+    """Raised when every credential of a `KeyPool` is ejected."""
+
+    def __init__(self, retry_after: float):
+        """Constructor for KeyPoolExhausted."""
+        super(KeyPoolExhausted, self).__init__(
+            "All API keys are ejected, retry in {:.1f}s".format(retry_after)
+        )
+        self.retry_after = retry_after
+
+
+class Credential(object):
+    """A RapidAPI `(host, key)` pair with its routing and quota state."""
+
+    __slots__ = (
+        "host",
+        "key",
+        "weight",
+        "current_weight",
+        "in_flight",
+        "requests",
+        "throttled",
+        "remaining",
+        "limit",
+        "ejected_until",
+    )
+
+    def __init__(self, host: str, key: str, weight: int = 1):
+        """Constructor for Credential."""
+        self.host = host
+        self.key = key
+        self.weight = max(1, int(weight))
+        self.current_weight = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.remaining = None
+        self.limit = None
+        self.ejected_until = 0.0
+
+    @property
+    def headers(self) -> dict:
+        """RapidAPI request headers for this credential."""
+        return {"x-rapidapi-host": self.host, "x-rapidapi-key": self.key}
+
+    def __repr__(self) -> str:
+        """Debug representation (the key is masked)."""
+        return "Credential(host={!r}, key='...{}', weight={})".format(
+            self.host, self.key[-4:], self.weight
+        )
+
+
+class KeyPool(object):
+    """
+    Thread safe pool of RapidAPI credentials.
+
+    Args:
+        credentials (Iterable): `Credential` objects or `(host, key)` /
+            `(host, key, weight)` tuples
+        strategy (str): "round_robin" (weighted) or "least_used"
+        cooldown (float): ejection seconds for a `429` without
+            `Retry-After`
+        clock (Callable): monotonic clock (injectable for tests)
+
+    Raises:
+        ValueError: for an empty pool or unknown `strategy`
+
+    """
+
+    STRATEGIES = ("round_robin", "least_used")
+
+    def __init__(
+        self,
+        credentials: Iterable,
+        strategy: str = "round_robin",
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Constructor for KeyPool."""
+        if strategy not in self.STRATEGIES:
+            raise ValueError("Unknown KeyPool strategy: {}".format(strategy))
+
+        self.credentials = [
+            c if isinstance(c, Credential) else Credential(*c)
+            for c in credentials
+        ]
+        if not self.credentials:
+            raise ValueError("KeyPool requires at least one credential")
+
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of credentials in the pool."""
+        return len(self.credentials)
+
+    def acquire(self) -> Credential:
+        """
+        Select the credential for the next request.
+
+        Raises:
+            KeyPoolExhausted: when every credential is ejected
+
+        """
+        with self._lock:
+            now = self._clock()
+            available = [
+                c for c in self.credentials if c.ejected_until <= now
+            ]
+            if not available:
+                raise KeyPoolExhausted(
+                    min(c.ejected_until for c in self.credentials) - now
+                )
+
+            if self.strategy == "least_used":
+                chosen = min(
+                    available,
+                    key=lambda c: (c.in_flight, float(c.requests) / c.weight),
+                )
+            else:
+                chosen = self._next_weighted(available)
+
+            chosen.in_flight += 1
+            chosen.requests += 1
+
+        return chosen
+
+    def release(
+        self,
+        credential: Credential,
+        status: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Return `credential` after a request, updating quota state.
+
+        Args:
+            credential (Credential): value returned by `acquire()`
+            status (Optional[int]): HTTP status of the response
+            headers (Optional[Mapping]): response headers
+
+        """
+        headers = _lower(headers)
+        with self._lock:
+            credential.in_flight = max(0, credential.in_flight - 1)
+            now = self._clock()
+
+            remaining = _number(headers.get(REMAINING_HEADER))
+            if remaining is not None:
+                credential.remaining = int(remaining)
+            limit = _number(headers.get(LIMIT_HEADER))
+            if limit is not None:
+                credential.limit = int(limit)
+
+            if status == 429:
+                credential.throttled += 1
+                wait = _number(headers.get(RETRY_AFTER_HEADER))
+                if wait is None:
+                    wait = _number(headers.get(RESET_HEADER))
+                credential.ejected_until = now + (
+                    wait if wait is not None else self.cooldown
+                )
+            elif credential.remaining == 0:
+                reset = _number(headers.get(RESET_HEADER))
+                credential.ejected_until = now + (
+                    reset if reset is not None else self.cooldown
+                )
+
+    def eject(self, credential: Credential, seconds: float) -> None:
+        """Take `credential` out of rotation for `seconds`."""
+        with self._lock:
+            credential.ejected_until = self._clock() + seconds
+
+    def stats(self) -> list:
+        """Routing and quota state of every credential."""
+        now = self._clock()
+        return [
+            {
+                "host": c.host,
+                "key": "..." + c.key[-4:],
+                "weight": c.weight,
+                "requests": c.requests,
+                "in_flight": c.in_flight,
+                "throttled": c.throttled,
+                "remaining": c.remaining,
+                "limit": c.limit,
+                "ejected_for": max(0.0, c.ejected_until - now),
+            }
+            for c in self.credentials
+        ]
+
+    @staticmethod
+    def _next_weighted(available: list) -> Credential:
+        """Smooth weighted round robin (as used by nginx)."""
+        total = 0
+        chosen = None
+        for credential in available:
+            credential.current_weight += credential.weight
+            total += credential.weight
+            if chosen is None or (
+                credential.current_weight > chosen.current_weight
+            ):
+                chosen = credential
+
+        chosen.current_weight -= total
+        return chosen
+
+
+def _lower(headers: Optional[Mapping[str, str]]) -> dict:
+    """Case-insensitive copy of `headers`."""
+    if not headers:
+        return {}
+
+    return dict((str(k).lower(), v) for k, v in headers.items())
+
+
+def _number(value) -> Optional[float]:
+    """Parse a numeric header value."""
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,383 @@
+"""
+Request Profiling for Bet365 Client.
+
+`Bet365.profile()` attributes the time of every call to its layers so a
+slow poll cycle can be pinned on the network, `response.json()` or the
+facades:
+
+    network - connect, server wait and body download
+
+    decode - `json` decoding (and string interning)
+
+    facade - wrapping the payload in its response facade
+
+    results - one materialization of the lazily built `.results`
+        facades (measured after the call, excluded from `wall`)
+
+Per endpoint wall and CPU (thread) time, net / peak allocations via
+`tracemalloc` (peak above the memory traced when the call began), the
+slowest calls and a sampled stack profile are kept while the context
+is open
+
+NOTE: `tracemalloc` traces the whole process, calls overlapping in
+other threads add to each other's allocations
+
+>>> with client.profile() as profiler:
+...     client.upcoming_events(sport_id="1")
+>>> print("\\n".join(profiler.report()))
+>>> profiler.dump_collapsed("upcoming.folded")  # flamegraph.pl input
+
+"""
+import heapq
+import sys
+import threading
+import time
+import tracemalloc
+
+from typing import List, Optional, TextIO, Union
+
+from pybet365.client.hooks import RequestContext
+from pybet365.export import records_of
+
+# NOTE: `time.thread_time` (3.7+) excludes time other threads spend in CPU
+_cpu_time = getattr(time, "thread_time", time.process_time)
+
+# NOTE: `tracemalloc.reset_peak` is 3.9+, before that the peak of a call
+# is the highest traced memory since tracing started (an upper bound)
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+STAGES = ("network", "decode", "facade", "results")
+
+
+class CallProfile(object):
+    """Layer breakdown of one call."""
+
+    __slots__ = (
+        "endpoint",
+        "params",
+        "status",
+        "wall",
+        "cpu",
+        "network",
+        "decode",
+        "facade",
+        "results",
+        "alloc_bytes",
+        "peak_bytes",
+        "cached",
+        "error",
+    )
+
+    def __init__(self, endpoint: str, params: Optional[dict]):
+        """Constructor for CallProfile."""
+        self.endpoint = endpoint
+        self.params = params
+        self.status = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.network = 0.0
+        self.decode = 0.0
+        self.facade = 0.0
+        self.results = 0.0
+        self.alloc_bytes = 0
+        self.peak_bytes = 0
+        self.cached = False
+        self.error = None
+
+    def __lt__(self, other: "CallProfile") -> bool:
+        """Order by wall time (for the slowest calls heap)."""
+        return self.wall < other.wall
+
+    def to_dict(self) -> dict:
+        """Breakdown as a `dict` (seconds and bytes)."""
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class EndpointProfile(object):
+    """Totals of every call to one endpoint."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "cached",
+        "wall",
+        "cpu",
+        "network",
+        "decode",
+        "facade",
+        "results",
+        "alloc_bytes",
+        "peak_bytes",
+    )
+
+    def __init__(self):
+        """Constructor for EndpointProfile."""
+        self.calls = 0
+        self.errors = 0
+        self.cached = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.network = 0.0
+        self.decode = 0.0
+        self.facade = 0.0
+        self.results = 0.0
+        self.alloc_bytes = 0
+        self.peak_bytes = 0
+
+    def add(self, call: CallProfile) -> None:
+        """Accumulate `call`."""
+        self.calls += 1
+        self.errors += call.error is not None
+        self.cached += call.cached
+        for name in ("wall", "cpu", "alloc_bytes") + STAGES:
+            setattr(self, name, getattr(self, name) + getattr(call, name))
+        self.peak_bytes = max(self.peak_bytes, call.peak_bytes)
+
+
+class Profiler(object):
+    """
+    Hook adapter collecting `CallProfile` objects (see `Bet365.profile`).
+
+    Args:
+        slowest (int): slowest calls kept
+        allocations (bool): trace allocations with `tracemalloc`
+        materialize (bool): time one access of the `.results` facades
+        sample_interval (Optional[float]): seconds between stack samples
+            of threads inside a call (`None` disables sampling)
+
+    """
+
+    def __init__(
+        self,
+        slowest: int = 10,
+        allocations: bool = True,
+        materialize: bool = True,
+        sample_interval: Optional[float] = 0.001,
+    ):
+        """Constructor for Profiler."""
+        self.slowest_size = slowest
+        self.allocations = allocations
+        self.materialize = materialize
+        self.sample_interval = sample_interval
+        self.endpoints = {}
+        self.stacks = {}
+        self.started = None
+        self.elapsed = None
+        self._slowest = []
+        self._active = {}
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._snapshot = None
+        self._allocation_sites = []
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        """Begin collecting (tracing and sampling)."""
+        self.started = time.perf_counter()
+        if self.allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self._snapshot = tracemalloc.take_snapshot()
+        if self.sample_interval:
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample, name="pybet365-profiler", daemon=True
+            )
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop collecting."""
+        self.elapsed = time.perf_counter() - self.started
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ))
+            self._allocation_sites = snapshot.compare_to(
+                self._snapshot, "lineno"
+            )
+            self._snapshot = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @property
+    def slowest(self) -> List[CallProfile]:
+        """Slowest calls, slowest first."""
+        return sorted(self._slowest, reverse=True)
+
+    def on_request_start(self, ctx: RequestContext) -> None:
+        """Open a `CallProfile` for the call."""
+        ctx.state["profile"] = CallProfile(ctx.endpoint, ctx.params)
+        ctx.state["cpu"] = _cpu_time()
+        if self.allocations and tracemalloc.is_tracing():
+            if _reset_peak is not None:
+                _reset_peak()
+            ctx.state["memory"] = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            self._active[threading.get_ident()] = ctx.endpoint
+
+    def on_cache_hit(self, ctx: RequestContext) -> None:
+        """Flag the call as served from the cache."""
+        ctx.state["profile"].cached = True
+
+    def on_request_end(self, ctx: RequestContext) -> None:
+        """Close the `CallProfile` of the call."""
+        call = ctx.state.pop("profile", None)
+        if call is None:
+            return
+
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+        call.cpu = _cpu_time() - ctx.state.pop("cpu")
+        call.wall = ctx.elapsed or 0.0
+        call.status = ctx.status
+        call.error = ctx.error
+        call.network = (ctx.server_time or 0.0) + (ctx.download_time or 0.0)
+        call.decode = ctx.decode_time or 0.0
+        call.facade = ctx.facade_time or 0.0
+        if "memory" in ctx.state and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            memory = ctx.state.pop("memory")
+            call.alloc_bytes = current - memory
+            call.peak_bytes = max(0, peak - memory)
+        if self.materialize and ctx.result is not None:
+            start = time.perf_counter()
+            for _ in records_of(ctx.result):
+                pass
+            call.results = time.perf_counter() - start
+
+        with self._lock:
+            endpoint = self.endpoints.get(call.endpoint)
+            if endpoint is None:
+                endpoint = self.endpoints[call.endpoint] = EndpointProfile()
+            endpoint.add(call)
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, call)
+            elif self._slowest and call.wall > self._slowest[0].wall:
+                heapq.heapreplace(self._slowest, call)
+
+    def summary(self) -> List[dict]:
+        """Per endpoint totals (seconds and bytes)."""
+        return [
+            dict(
+                [("endpoint", name)]
+                + [(field, getattr(totals, field)) for field in (
+                    EndpointProfile.__slots__
+                )]
+            )
+            for name, totals in sorted(self.endpoints.items())
+        ]
+
+    def top_allocations(self, limit: int = 10) -> List[dict]:
+        """Source lines that allocated the most while profiling."""
+        return [
+            {
+                "site": str(stat.traceback[0]),
+                "count": stat.count_diff,
+                "bytes": stat.size_diff,
+            }
+            for stat in self._allocation_sites[:limit]
+        ]
+
+    def report(self) -> List[str]:
+        """Render the summary, slowest calls and allocation sites."""
+        header = "{:<14} {:>6} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} " \
+                 "{:>10}"
+        row = "{:<14} {:>6} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f} " \
+              "{:>10.2f} {:>10.2f} {:>10.1f}"
+        lines = [header.format(
+            "endpoint", "calls", "wall_ms", "cpu_ms", "network_ms",
+            "decode_ms", "facade_ms", "results_ms", "alloc_kb",
+        )]
+        for name, totals in sorted(self.endpoints.items()):
+            lines.append(row.format(
+                name,
+                totals.calls,
+                totals.wall * 1e3,
+                totals.cpu * 1e3,
+                totals.network * 1e3,
+                totals.decode * 1e3,
+                totals.facade * 1e3,
+                totals.results * 1e3,
+                totals.alloc_bytes / 1024.0,
+            ))
+
+        if self._slowest:
+            lines.append("")
+            lines.append("slowest calls")
+            for call in self.slowest:
+                lines.append("{:<14} {:>10.2f} ms  {}".format(
+                    call.endpoint, call.wall * 1e3, call.params
+                ))
+
+        sites = self.top_allocations(5)
+        if sites:
+            lines.append("")
+            lines.append("top allocation sites")
+            for site in sites:
+                lines.append("{:>10} blocks {:>12} B  {}".format(
+                    site["count"], site["bytes"], site["site"]
+                ))
+
+        return lines
+
+    def collapsed(self) -> List[str]:
+        """Sampled stacks in collapsed ("folded") format."""
+        with self._lock:
+            return [
+                "{} {}".format(stack, count)
+                for stack, count in sorted(self.stacks.items())
+            ]
+
+    def dump_collapsed(self, target: Union[str, TextIO]) -> None:
+        """
+        Write the sampled stacks for `flamegraph.pl` / speedscope.
+
+        Args:
+            target (Union[str, TextIO]): path or open text stream
+
+        """
+        lines = self.collapsed()
+        if isinstance(target, str):
+            with open(target, "w") as f:
+                f.write("\n".join(lines) + "\n")
+        else:
+            target.write("\n".join(lines) + "\n")
+
+    def _sample(self) -> None:
+        """Sampler thread: fold the stacks of threads inside a call."""
+        while not self._stop.wait(self.sample_interval):
+            with self._lock:
+                active = list(self._active.items())
+            if not active:
+                continue
+
+            frames = sys._current_frames()
+            for ident, endpoint in active:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = _fold(frame, endpoint)
+                with self._lock:
+                    self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+
+def _fold(frame, root: str) -> str:
+    """`root;outer;...;inner` frame names of `frame`."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append("{}:{}".format(
+            code.co_filename.rsplit("/", 1)[-1], code.co_name
+        ))
+        frame = frame.f_back
+    names.append(root)
+
+    return ";".join(reversed(names))
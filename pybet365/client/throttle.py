@@ -0,0 +1,57 @@
+"""
+Request Throttling for Bet365 Client.
+
+RateLimiter spaces calls evenly so concurrent workers sharing one
+limiter never exceed `rate` requests per second in aggregate
+
+"""
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Thread safe fixed interval rate limiter.
+
+    >>> limiter = RateLimiter(rate=5)
+    >>> limiter.acquire()  # blocks until the next slot is free
+
+    """
+
+    def __init__(self, rate: float = 0):
+        """Constructor for RateLimiter."""
+        self.rate = rate
+        self._interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until a request slot is available.
+
+        Returns:
+            waited (float): seconds slept before the slot was granted
+
+        """
+        if not self._interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+
+        waited = slot - now
+        if waited > 0:
+            time.sleep(waited)
+
+        return max(waited, 0.0)
+
+    def __enter__(self):
+        """Acquire a slot as a context manager."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        """Nothing to release for interval based limiting."""
+        return False
@@ -0,0 +1,480 @@
+"""
+Tiered Response Cache.
+
+A `ResponseCache` bounded by bytes instead of entries, since one raw
+in-play body can weigh as much as a thousand `result` bodies:
+
+    hot tier - decoded facades in an LRU accounted in (estimated) bytes,
+        over `max_bytes` the least recently used entries are demoted
+
+    cold tier - every stored body is written through to disk, zlib
+        compressed, in append-only segment files read back through
+        `mmap`; over `max_disk_bytes` the oldest segment is dropped
+
+A hot miss that hits disk is decoded again and promoted to the hot
+tier, a demotion only drops the facade (the body is already on disk)
+
+>>> with TieredCache(max_bytes=64 << 20, path="/var/cache/pybet365") as cache:
+...     client = Bet365(api_host="host", api_key="key", cache=cache)
+...     client.in_play_events(raw="1")
+...     cache.stats()["hot_bytes"]
+
+"""
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from pybet365.client.cache import CacheEntry, ResponseCache
+
+# NOTE: decoded `dict` / `list` / `str` objects weigh ~6x their JSON
+# bytes (measured over the synthetic payloads of every endpoint)
+DECODED_FACTOR = 6
+
+ENTRY_OVERHEAD = 512
+
+SEGMENT_PREFIX = "segment-"
+
+
+def estimate_size(entry: CacheEntry) -> int:
+    """Estimated bytes held by the facade of `entry`."""
+    return entry.size * DECODED_FACTOR + ENTRY_OVERHEAD
+
+
+def deep_size(value) -> int:
+    """Exact `sys.getsizeof` of `value` and every object it holds."""
+    seen = set()
+    size = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+
+    return size
+
+
+def measure_size(entry: CacheEntry) -> int:
+    """Exact bytes held by the facade of `entry` (slower sizer)."""
+    return deep_size(entry.facade) + ENTRY_OVERHEAD
+
+
+def decode_facade(url_extras: Optional[str], content: bytes):
+    """Facade of a raw body, as built by `Bet365._get`."""
+    from pybet365.client.client import Bet365
+
+    return Bet365._wrap(url_extras, json.loads(content))
+
+
+class DiskRecord(object):
+    """Location and validators of one body in the cold tier."""
+
+    __slots__ = (
+        "segment",
+        "offset",
+        "length",
+        "size",
+        "digest",
+        "etag",
+        "last_modified",
+        "url_extras",
+        "stored_at",
+    )
+
+    def __init__(
+        self, segment: int, offset: int, length: int, entry: CacheEntry
+    ):
+        """Constructor for DiskRecord."""
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.size = entry.size
+        self.digest = entry.digest
+        self.etag = entry.etag
+        self.last_modified = entry.last_modified
+        self.url_extras = entry.url_extras
+        self.stored_at = entry.stored_at
+
+    def to_entry(self, facade) -> CacheEntry:
+        """Hot `CacheEntry` for the decoded `facade`."""
+        entry = CacheEntry(
+            facade,
+            digest=self.digest,
+            etag=self.etag,
+            last_modified=self.last_modified,
+            size=self.size,
+            url_extras=self.url_extras,
+        )
+        entry.stored_at = self.stored_at
+
+        return entry
+
+
+class _Segment(object):
+    """Append-only segment file with a read-only map of its contents."""
+
+    __slots__ = ("number", "path", "file", "size", "keys", "map")
+
+    def __init__(self, number: int, directory: str):
+        """Constructor for _Segment."""
+        self.number = number
+        self.path = os.path.join(
+            directory, "{}{:06d}.bin".format(SEGMENT_PREFIX, number)
+        )
+        self.file = open(self.path, "w+b")
+        self.size = 0
+        self.keys = set()
+        self.map = None
+
+    def append(self, blob: bytes) -> int:
+        """Write `blob`, returning its offset."""
+        offset = self.size
+        self.file.seek(offset)
+        self.file.write(blob)
+        self.file.flush()
+        self.size += len(blob)
+
+        return offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        """`length` bytes at `offset`, through the map."""
+        end = offset + length
+        if self.map is None or len(self.map) < end:
+            # NOTE: the active segment grew since it was mapped
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(
+                self.file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        return self.map[offset:end]
+
+    def close(self) -> None:
+        """Unmap, close and delete the file."""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class DiskTier(object):
+    """
+    Compressed bodies in append-only segment files.
+
+    Args:
+        path (Optional[str]): directory of the segment files (a temporary
+            directory removed on `close` when `None`)
+        max_bytes (int): segment bytes kept before the oldest segment is
+            dropped
+        segment_bytes (int): size a segment grows to before rolling over
+        level (int): zlib compression level
+
+    NOTE: the index lives in memory, segment files left in `path` by a
+    previous process are removed
+
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = 1 << 30,
+        segment_bytes: int = 64 << 20,
+        level: int = 1,
+    ):
+        """Constructor for DiskTier."""
+        self._owned = path is None
+        if path is None:
+            path = tempfile.mkdtemp(prefix="pybet365-cache-")
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith(SEGMENT_PREFIX):
+                os.remove(os.path.join(path, name))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self.bytes = 0
+        self.evictions = 0
+        self._records = {}
+        self._segments = OrderedDict()
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Number of stored bodies."""
+        return len(self._records)
+
+    def __contains__(self, key) -> bool:
+        """`True` when a body is stored for `key`."""
+        return key in self._records
+
+    def get(self, key) -> Optional[DiskRecord]:
+        """Record of `key`."""
+        return self._records.get(key)
+
+    def put(self, key, content: bytes, entry: CacheEntry) -> DiskRecord:
+        """Compress and append the body of `entry`."""
+        blob = zlib.compress(content, self.level)
+        segment = self._active(len(blob))
+        offset = segment.append(blob)
+        self.discard(key)
+        record = self._records[key] = DiskRecord(
+            segment.number, offset, len(blob), entry
+        )
+        segment.keys.add(key)
+        self.bytes += len(blob)
+        self._evict()
+
+        return record
+
+    def read(self, key) -> Optional[tuple]:
+        """`(record, body)` of `key`, `None` when not stored."""
+        record = self._records.get(key)
+        if record is None:
+            return None
+
+        blob = self._segments[record.segment].read(
+            record.offset, record.length
+        )
+
+        return record, zlib.decompress(blob)
+
+    def discard(self, key) -> None:
+        """Forget `key` (its bytes stay until the segment is dropped)."""
+        record = self._records.pop(key, None)
+        if record is not None:
+            self._segments[record.segment].keys.discard(key)
+
+    def clear(self) -> None:
+        """Drop every segment."""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        self._records.clear()
+        self.bytes = 0
+
+    def close(self) -> None:
+        """Drop every segment (and the temporary directory)."""
+        self.clear()
+        if self._owned:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def stats(self) -> dict:
+        """Cold tier counters."""
+        return {
+            "disk_entries": len(self._records),
+            "disk_bytes": self.bytes,
+            "disk_segments": len(self._segments),
+            "disk_evictions": self.evictions,
+        }
+
+    def _active(self, length: int) -> _Segment:
+        """Segment to append `length` bytes to."""
+        segment = next(reversed(self._segments.values()), None)
+        if segment is None or (
+            segment.size and segment.size + length > self.segment_bytes
+        ):
+            segment = _Segment(self._next, self.path)
+            self._segments[segment.number] = segment
+            self._next += 1
+
+        return segment
+
+    def _evict(self) -> None:
+        """Drop the oldest segments while over `max_bytes`."""
+        while self.bytes > self.max_bytes and len(self._segments) > 1:
+            _, segment = self._segments.popitem(last=False)
+            for key in segment.keys:
+                del self._records[key]
+            self.evictions += len(segment.keys)
+            self.bytes -= segment.size
+            segment.close()
+
+
+class TieredCache(ResponseCache):
+    """
+    `ResponseCache` with a byte bounded hot tier and a disk cold tier.
+
+    Args:
+        max_bytes (int): (estimated) facade bytes kept in memory
+        path (Optional[str]): directory of the cold tier (temporary when
+            `None`)
+        max_disk_bytes (int): compressed bytes kept on disk
+        segment_bytes (int): size of one cold tier segment file
+        sizer (Optional[Callable]): `sizer(entry) -> bytes` of a hot
+            entry, `estimate_size` by default (`measure_size` is exact
+            but walks the facade)
+        decode (Optional[Callable]): `decode(url_extras, body)` facade
+            of a promoted body, `decode_facade` by default
+        level (int): zlib compression level of the cold tier
+
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 << 20,
+        path: Optional[str] = None,
+        max_disk_bytes: int = 1 << 30,
+        segment_bytes: int = 64 << 20,
+        sizer: Optional[Callable] = None,
+        decode: Optional[Callable] = None,
+        level: int = 1,
+    ):
+        """Constructor for TieredCache."""
+        super(TieredCache, self).__init__(max_entries=sys.maxsize)
+        self.max_bytes = max_bytes
+        self.sizer = sizer or estimate_size
+        self.decode = decode or decode_facade
+        self.disk = DiskTier(path, max_disk_bytes, segment_bytes, level)
+        self.bytes = 0
+        self.promotions = 0
+        self.demotions = 0
+        self.rejected = 0
+        self._costs = {}
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """Entry for `key`, promoted from disk on a hot miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+            stored = self.disk.read(key)
+            if stored is None:
+                self.misses += 1
+                return None
+
+        # NOTE: decoded outside the lock, other keys stay available
+        record, content = stored
+        try:
+            facade = self.decode(record.url_extras, content)
+        except ValueError:
+            with self._lock:
+                if self.disk.get(key) is record:
+                    self.disk.discard(key)
+                self.misses += 1
+            return None
+
+        entry = record.to_entry(facade)
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None:
+                # NOTE: a concurrent `set` / promotion stored it meanwhile
+                self._entries.move_to_end(key)
+                return current
+            if self.disk.get(key) is not record:
+                # NOTE: replaced on disk meanwhile, never promote stale data
+                return entry
+
+            self.promotions += 1
+            self._admit(key, entry)
+
+        return entry
+
+    def set(
+        self, key: tuple, entry: CacheEntry, content: Optional[bytes] = None
+    ) -> None:
+        """
+        Store `entry` in the hot tier, writing `content` through to disk.
+
+        Without `content` the body is serialized from the facade on
+        demotion
+
+        """
+        with self._lock:
+            if content is not None:
+                self.disk.put(key, content, entry)
+            else:
+                self.disk.discard(key)
+            self._admit(key, entry)
+
+    def clear(self) -> None:
+        """Drop every entry of both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._costs.clear()
+            self.bytes = 0
+            self.disk.clear()
+
+    def close(self) -> None:
+        """Drop both tiers and the cold tier files."""
+        with self._lock:
+            self._entries.clear()
+            self._costs.clear()
+            self.bytes = 0
+            self.disk.close()
+
+    def __enter__(self) -> "TieredCache":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+    def stats(self) -> dict:
+        """Counters of both tiers."""
+        stats = super(TieredCache, self).stats()
+        stats.update(
+            hot_bytes=self.bytes,
+            max_bytes=self.max_bytes,
+            promotions=self.promotions,
+            demotions=self.demotions,
+            rejected=self.rejected,
+        )
+        stats.update(self.disk.stats())
+
+        return stats
+
+    def _admit(self, key: tuple, entry: CacheEntry) -> None:
+        """Place `entry` in the hot tier, demoting over `max_bytes`."""
+        cost = self.sizer(entry)
+        if key in self._entries:
+            del self._entries[key]
+            self.bytes -= self._costs.pop(key)
+        if cost > self.max_bytes:
+            # NOTE: larger than the whole hot tier, served from disk only
+            self.rejected += 1
+            self._demote(key, entry)
+            return
+
+        self._entries[key] = entry
+        self._costs[key] = cost
+        self.bytes += cost
+        while self.bytes > self.max_bytes:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.bytes -= self._costs.pop(old_key)
+            self._demote(old_key, old_entry)
+
+    def _demote(self, key: tuple, entry: CacheEntry) -> None:
+        """Keep the cold copy of an entry leaving the hot tier."""
+        self.demotions += 1
+        record = self.disk.get(key)
+        if record is not None:
+            # NOTE: validators refreshed by `hit` while the entry was hot
+            record.etag = entry.etag
+            record.last_modified = entry.last_modified
+            return
+
+        if isinstance(entry.facade, (dict, list)):
+            content = json.dumps(
+                entry.facade, separators=(",", ":")
+            ).encode("utf-8")
+            self.disk.put(key, content, entry)
@@ -0,0 +1,634 @@
+"""
+Wire Transports for Bet365 Client.
+
+Transports issue the GET requests of a client, every transport returns
+`requests.Response` compatible objects:
+
+    default - `requests.get`, one connection per call
+
+    RequestsTransport - pooled HTTP/1.1 keep-alive connections over one
+        `requests.Session`
+
+    HttpxTransport - `httpx`, with `http2=True` every concurrent call to
+        a host shares one multiplexed HTTP/2 connection (requires
+        `pip install pybet365[http2]`), `AsyncBet365` uses the same
+        responses
+
+>>> client = Bet365(api_host="...", api_key="...",
+...                 transport=HttpxTransport(http2=True))
+
+Compression negotiation and accounting apply to every transport:
+
+    negotiation - `Accept-Encoding` lists only the codings a native
+        decoder is installed for, in preference order (zstd, br, gzip,
+        deflate), so the server never sends a body we cannot read
+
+    decoding - bodies are read raw off the socket and decompressed in
+        one call by `zlib` / `brotli` / `zstandard` (C extensions)
+
+    accounting - `TransportMetrics` keeps per endpoint compressed (wire)
+        and decompressed byte counts (`Bet365.metrics`)
+
+Optional decoders: `pip install pybet365[compression]` adds `brotli` and
+`zstandard`
+
+>>> client = Bet365(api_host="...", api_key="...", compression=("gzip",))
+>>> client.pre_match_odds(fi="88232938")
+>>> client.metrics["prematch"].ratio
+>>> 0.11
+
+"""
+import asyncio
+import datetime
+import json
+import threading
+import time
+import zlib
+
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import requests
+
+# NOTE: preferred first, `deflate` last since servers disagree on framing
+PREFERENCE = ("zstd", "br", "gzip", "deflate")
+
+
+def _gzip(data: bytes) -> bytes:
+    """Decompress a (possibly multi member) gzip body."""
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    body = decoder.decompress(data)
+    while decoder.unused_data:
+        data = decoder.unused_data
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body += decoder.decompress(data)
+
+    return body
+
+
+def _deflate(data: bytes) -> bytes:
+    """Decompress a zlib wrapped or raw deflate body."""
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+
+def _brotli() -> Optional[Callable]:
+    """`brotli` (or `brotlicffi`) decoder when installed."""
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+
+    return brotli.decompress
+
+
+def _zstd() -> Optional[Callable]:
+    """`zstandard` decoder when installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def decompress(data: bytes) -> bytes:
+        # NOTE: `decompressobj` also handles frames without a content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    return decompress
+
+
+def _load_decoders() -> Dict[str, Callable]:
+    """Decoders of every coding available in this environment."""
+    decoders = {"gzip": _gzip, "x-gzip": _gzip, "deflate": _deflate}
+    for name, load in (("br", _brotli), ("zstd", _zstd)):
+        decoder = load()
+        if decoder is not None:
+            decoders[name] = decoder
+
+    return decoders
+
+
+DECODERS = _load_decoders()
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Codings with an installed decoder, in preference order."""
+    return tuple(name for name in PREFERENCE if name in DECODERS)
+
+
+def accept_encoding(compression: Union[bool, Iterable[str], None]) -> str:
+    """
+    `Accept-Encoding` value for a `compression` setting.
+
+    >>> accept_encoding(True)
+    >>> "gzip, deflate"  # plus "zstd, br" when their decoders exist
+
+    Args:
+        compression (Union[bool, Iterable[str], None]): `True` for every
+            available coding, `False` / `None` for "identity", or the
+            codings to offer (unavailable ones are left out)
+
+    Returns:
+        value (str): header value
+
+    """
+    if compression is True:
+        codings = available_encodings()
+    elif not compression:
+        codings = ()
+    else:
+        codings = tuple(
+            name for name in compression if name in DECODERS
+        )
+
+    return ", ".join(codings) if codings else "identity"
+
+
+def decode_body(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Undo every coding listed in `content_encoding`.
+
+    Raises:
+        ValueError: for a coding without an installed decoder
+
+    """
+    if not content_encoding:
+        return data
+
+    codings = [
+        name.strip().lower() for name in content_encoding.split(",")
+    ]
+    for name in reversed(codings):
+        if name in ("", "identity"):
+            continue
+        decoder = DECODERS.get(name)
+        if decoder is None:
+            raise ValueError("No decoder for Content-Encoding: {}".format(
+                name
+            ))
+        data = decoder(data)
+
+    return data
+
+
+def read_body(response) -> int:
+    """
+    Download and decode the body of a `stream=True` response.
+
+    The decoded body becomes `response.content`
+
+    Returns:
+        wire_bytes (int): bytes received before decompression
+
+    """
+    read_wire = getattr(response, "read_wire", None)
+    if read_wire is not None:
+        return read_wire()
+
+    raw = getattr(response, "raw", None)
+    # NOTE: `requests` keeps `_content` as `False` until the body is read,
+    # anything else (already consumed, test doubles) is measured as is
+    if raw is None or getattr(response, "_content", None) is not False:
+        return len(response.content or b"")
+
+    try:
+        data = raw.read(decode_content=False)
+    finally:
+        response.close()
+    response._content = decode_body(
+        data, response.headers.get("Content-Encoding")
+    )
+    response._content_consumed = True
+
+    return len(data)
+
+
+class EndpointMetrics(object):
+    """Byte and request totals of one endpoint."""
+
+    __slots__ = ("requests", "wire_bytes", "body_bytes", "encodings")
+
+    def __init__(self):
+        """Constructor for EndpointMetrics."""
+        self.requests = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.encodings = {}
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Wire bytes per decoded byte (`None` before any body)."""
+        if not self.body_bytes:
+            return None
+        return self.wire_bytes / float(self.body_bytes)
+
+    def to_dict(self) -> dict:
+        """Totals as a `dict`."""
+        return {
+            "requests": self.requests,
+            "wire_bytes": self.wire_bytes,
+            "body_bytes": self.body_bytes,
+            "ratio": self.ratio,
+            "encodings": dict(self.encodings),
+        }
+
+
+class TransportMetrics(object):
+    """Per endpoint compressed vs decompressed byte counts."""
+
+    def __init__(self):
+        """Constructor for TransportMetrics."""
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, endpoint: str) -> EndpointMetrics:
+        """Totals of `endpoint` (`KeyError` when never called)."""
+        return self.endpoints[endpoint]
+
+    def record(
+        self,
+        endpoint: str,
+        wire_bytes: int,
+        body_bytes: int,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """Account one response of `endpoint`."""
+        encoding = encoding or "identity"
+        with self._lock:
+            totals = self.endpoints.get(endpoint)
+            if totals is None:
+                totals = self.endpoints[endpoint] = EndpointMetrics()
+            totals.requests += 1
+            totals.wire_bytes += wire_bytes
+            totals.body_bytes += body_bytes
+            totals.encodings[encoding] = totals.encodings.get(
+                encoding, 0
+            ) + 1
+
+    def summary(self) -> List[dict]:
+        """Per endpoint totals, sorted by endpoint."""
+        with self._lock:
+            return [
+                dict(totals.to_dict(), endpoint=name)
+                for name, totals in sorted(self.endpoints.items())
+            ]
+
+    def reset(self) -> None:
+        """Forget every total."""
+        with self._lock:
+            self.endpoints.clear()
+
+
+class RequestsTransport(object):
+    """
+    Pooled HTTP/1.1 transport over one `requests.Session`.
+
+    Args:
+        pool_maxsize (int): keep-alive connections kept per host
+        session (Optional[requests.Session]): session to use
+
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 32,
+        session: Optional[requests.Session] = None,
+    ):
+        """Constructor for RequestsTransport."""
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=pool_maxsize
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """`requests.get` compatible GET over the pooled session."""
+        return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
+
+    def __enter__(self) -> "RequestsTransport":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+
+def _httpx():
+    """Import `httpx` with a helpful error when it is missing."""
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "The httpx transport requires `httpx` "
+            "(pip install pybet365[http2])"
+        )
+
+    return httpx
+
+
+class HttpxResponse(object):
+    """
+    `requests.Response` compatible view of an `httpx.Response`.
+
+    `elapsed` is the time until the headers arrived and
+    `raise_for_status` raises `requests.HTTPError`, so client code and
+    hooks behave the same on every transport
+
+    A streamed response of `HttpxTransport` keeps its body unread,
+    `call` runs the reads on the loop thread of the transport
+
+    """
+
+    def __init__(self, response, elapsed: float, call=None):
+        """Constructor for HttpxResponse."""
+        self._response = response
+        self._call = call
+        self._wire_bytes = None
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+
+    @property
+    def http_version(self) -> str:
+        """Negotiated protocol ("HTTP/1.1" or "HTTP/2")."""
+        return self._response.http_version
+
+    @property
+    def content(self) -> bytes:
+        """Decoded body."""
+        if self._call is not None and self._wire_bytes is None:
+            self.read_wire()
+        try:
+            return self._response.content
+        except _httpx().ResponseNotRead:
+            return self._response.read()
+
+    def json(self, **kwargs):
+        """Decode the `json` body."""
+        return json.loads(self.content, **kwargs)
+
+    def read_wire(self) -> int:
+        """Read (and decode) the body, returning the bytes received."""
+        if self._call is not None and self._wire_bytes is None:
+            return self._call(self.aread_wire())
+        if self._wire_bytes is None:
+            try:
+                self._response.read()
+            finally:
+                self._response.close()
+            self._wire_bytes = self._response.num_bytes_downloaded
+
+        return self._wire_bytes
+
+    async def aread_wire(self) -> int:
+        """`read_wire` for responses of an `httpx.AsyncClient`."""
+        if self._wire_bytes is None:
+            try:
+                await self._response.aread()
+            finally:
+                await self._response.aclose()
+            self._wire_bytes = self._response.num_bytes_downloaded
+
+        return self._wire_bytes
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Decoded body chunks, read from the socket when streamed."""
+        if self._call is None or self._wire_bytes is not None:
+            content = self.content
+            for start in range(0, len(content), chunk_size):
+                yield content[start:start + chunk_size]
+            return
+
+        chunks = self._response.aiter_bytes(chunk_size)
+        try:
+            while True:
+                chunk = self._call(_next_chunk(chunks))
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    async def aiter_content(
+        self, chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """`iter_content` for responses of an `httpx.AsyncClient`."""
+        if self._wire_bytes is not None:
+            for chunk in self.iter_content(chunk_size):
+                yield chunk
+            return
+
+        try:
+            async for chunk in self._response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await self.aclose()
+
+    def raise_for_status(self) -> None:
+        """Raise `requests.HTTPError` for `4xx` / `5xx` statuses."""
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                "{} Error for url: {}".format(self.status_code, self.url),
+                response=self,
+            )
+
+    def close(self) -> None:
+        """Release the connection of a streamed, unread body."""
+        if self._call is not None and self._wire_bytes is None:
+            self._call(self._response.aclose())
+            self._wire_bytes = self._response.num_bytes_downloaded
+
+    async def aclose(self) -> None:
+        """`close` for responses of an `httpx.AsyncClient`."""
+        if self._wire_bytes is None:
+            await self._response.aclose()
+            self._wire_bytes = self._response.num_bytes_downloaded
+
+
+class HttpxTransport(object):
+    """
+    `httpx` transport, multiplexed over HTTP/2 when `http2` is set.
+
+    Calls from any thread run on one `httpx.AsyncClient` owned by a
+    private event loop thread, so every calling thread shares the pool
+    (and the single HTTP/2 connection). Bodies are read before `get`
+    returns unless `stream` is set, then `iter_content` pulls them
+    chunk by chunk from the loop thread. `https://` URLs negotiate
+    HTTP/2 (falling back to HTTP/1.1), plain `http://` URLs use HTTP/2
+    with prior knowledge (h2c) on a client of their own
+
+    Args:
+        http2 (bool): speak HTTP/2 (requires the `h2` package)
+        max_connections (int): connection limit of the pool
+        timeout (float): seconds for connect / read / write / pool
+
+    Raises:
+        ImportError: when `httpx` (or `h2` for `http2`) is missing
+
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        timeout: float = 30.0,
+    ):
+        """Constructor for HttpxTransport."""
+        httpx = _httpx()
+        options = client_options(httpx, http2, max_connections, timeout)
+        self.http2 = http2
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="pybet365-httpx",
+            daemon=True,
+        )
+        self._thread.start()
+        self.client = self._call(_async_client(httpx, options))
+        self.plaintext_client = self.client
+        if http2:
+            self.plaintext_client = self._call(_async_client(
+                httpx,
+                client_options(
+                    httpx, http2, max_connections, timeout, plaintext=True
+                ),
+            ))
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        stream: bool = False,
+        **kwargs
+    ) -> HttpxResponse:
+        """`requests.get` compatible GET."""
+        return self._call(
+            self._fetch(url, present(headers), params, stream)
+        )
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: Optional[dict],
+        params: Optional[dict],
+        stream: bool = False,
+    ) -> HttpxResponse:
+        """GET on the loop thread."""
+        client = self.plaintext_client if url.startswith("http://") else (
+            self.client
+        )
+        request = client.build_request(
+            "GET", url, headers=headers, params=params
+        )
+        start = time.perf_counter()
+        response = HttpxResponse(
+            await client.send(request, stream=True),
+            time.perf_counter() - start,
+            call=self._call if stream else None,
+        )
+        if not stream:
+            await response.aread_wire()
+
+        return response
+
+    def _call(self, coroutine):
+        """Run `coroutine` on the loop thread and wait for it."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        """Close every connection and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        self._call(self.client.aclose())
+        if self.plaintext_client is not self.client:
+            self._call(self.plaintext_client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "HttpxTransport":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+
+async def _next_chunk(chunks) -> Optional[bytes]:
+    """Next chunk of an async byte iterator, `None` once exhausted."""
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _async_client(httpx, options: dict):
+    """`httpx.AsyncClient` built on the running loop."""
+    return httpx.AsyncClient(**options)
+
+
+def present(headers: Optional[dict]) -> Optional[dict]:
+    """`headers` without `None` values (`requests` drops them too)."""
+    if not headers:
+        return headers
+
+    return dict((k, v) for k, v in headers.items() if v is not None)
+
+
+def client_options(
+    httpx,
+    http2: bool,
+    max_connections: int,
+    timeout: float,
+    plaintext: bool = False,
+) -> dict:
+    """
+    `httpx.Client` / `httpx.AsyncClient` keyword arguments.
+
+    With `http2`, TLS hosts negotiate HTTP/2 through ALPN and fall back
+    to HTTP/1.1, `plaintext` (`http://`) hosts speak h2c with prior
+    knowledge, having no handshake to negotiate it
+
+    """
+    options = {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        "timeout": timeout,
+    }
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "HTTP/2 requires the `h2` package "
+                "(pip install pybet365[http2])"
+            )
+        options.update(http2=True, http1=not plaintext)
+
+    return options
@@ -0,0 +1,203 @@
+"""
+Record Export Helpers.
+
+Writers stream response records one at a time so large pulls never
+need to be held in memory before being written
+
+    NDJSON - one `json` document per line
+
+    CSV - nested objects flattened to dotted column names, the header
+        being the union of every record's columns
+
+"""
+import csv
+import json
+import tempfile
+
+from typing import Iterable, Iterator, Optional, TextIO
+
+
+def records_of(response) -> Iterator[dict]:
+    """
+    Iterate the records of any endpoint response.
+
+    Facade responses expose `.results`, raw fallbacks are plain `dict`
+    objects and raw Bet365 bodies nest records in lists of lists
+
+    """
+    if response is None:
+        return
+
+    results = getattr(response, "results", None)
+    if results is None and isinstance(response, dict):
+        results = response.get("results")
+
+    for record in results or []:
+        if isinstance(record, list):
+            for nested in record:
+                yield nested
+        else:
+            yield record
+
+
+def flatten_record(record: dict, prefix: str = "", sep: str = ".") -> dict:
+    """
+    Flatten nested `dict` objects into a single level `dict`.
+
+    >>> flatten_record({"id": "1", "league": {"id": "2", "name": "L"}})
+    >>> {"id": "1", "league.id": "2", "league.name": "L"}
+
+    Args:
+        record (dict): record to flatten
+        prefix (str): prefix for generated keys
+        sep (str): separator between nested key names
+
+    Returns:
+        flat (dict): single level `dict`
+
+    """
+    flat = {}
+    for key, value in record.items():
+        name = "{}{}{}".format(prefix, sep, key) if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=name, sep=sep))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, separators=(",", ":"))
+        else:
+            flat[name] = value
+
+    return flat
+
+
+class NdjsonWriter(object):
+    """Streaming writer for newline delimited `json`."""
+
+    def __init__(self, stream: TextIO):
+        """Constructor for NdjsonWriter."""
+        self.stream = stream
+        self.count = 0
+
+    def write(self, record: dict) -> None:
+        """Write a single `record`."""
+        self.stream.write(json.dumps(record, separators=(",", ":")))
+        self.stream.write("\n")
+        self.count += 1
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        """Write every record of `records`."""
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """Flush the underlying stream."""
+        self.stream.flush()
+
+
+class CsvWriter(object):
+    """
+    Writer for flattened `csv`.
+
+    Records of one payload do not share every column (`ss`, `timer`,
+    `extra.*`, ... are optional), so without `fieldnames` the flattened
+    rows are spooled (to a temporary file past `spool_bytes`) and
+    written on `close` under the union of their columns, in first seen
+    order. With `fieldnames` rows are written as they come
+
+    Raises:
+        ValueError: when a record has a column outside `fieldnames`
+
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fieldnames: Optional[list] = None,
+        spool_bytes: int = 8 << 20,
+    ):
+        """Constructor for CsvWriter."""
+        self.stream = stream
+        self.fieldnames = fieldnames
+        self.count = 0
+        self._writer = None
+        self._columns = dict.fromkeys(fieldnames or ())
+        self._spool = None
+        if fieldnames is None:
+            self._spool = tempfile.SpooledTemporaryFile(
+                max_size=spool_bytes, mode="w+", encoding="utf-8"
+            )
+
+    def write(self, record: dict) -> None:
+        """Write (or spool) a single `record`."""
+        flat = flatten_record(record)
+        if self._spool is not None:
+            for name in flat:
+                if name not in self._columns:
+                    self._columns[name] = None
+            self._spool.write(json.dumps(flat, separators=(",", ":")))
+            self._spool.write("\n")
+            self.count += 1
+            return
+
+        unknown = [name for name in flat if name not in self._columns]
+        if unknown:
+            raise ValueError(
+                "Record columns missing from fieldnames: {}".format(
+                    ", ".join(unknown)
+                )
+            )
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self.stream, fieldnames=self.fieldnames
+            )
+            self._writer.writeheader()
+
+        self._writer.writerow(flat)
+        self.count += 1
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        """Write every record of `records`."""
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """Write the spooled rows and flush the underlying stream."""
+        spool = self._spool
+        if spool is not None and self.count:
+            writer = csv.DictWriter(
+                self.stream, fieldnames=list(self._columns)
+            )
+            writer.writeheader()
+            spool.seek(0)
+            for line in spool:
+                writer.writerow(json.loads(line))
+        if spool is not None:
+            spool.close()
+            self._spool = None
+        self.stream.flush()
+
+
+WRITER_FACTORY = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+}
+
+
+def get_writer(fmt: str, stream: TextIO):
+    """
+    Factory for record writers.
+
+    Args:
+        fmt (str): output format (`ndjson` or `csv`)
+        stream (TextIO): open text stream to write to
+
+    Returns:
+        writer (NdjsonWriter|CsvWriter): streaming writer
+
+    Raises:
+        ValueError: for unsupported `fmt`
+
+    """
+    try:
+        return WRITER_FACTORY[fmt](stream)
+    except KeyError:
+        raise ValueError("Unsupported output format: {}".format(fmt))
@@ -0,0 +1,391 @@
+"""
+Raw Feed State Engine.
+
+Raw in-play bodies (`in_play_events`, `in_play_odds` with `raw`) are
+ordered mnemonic records, each addressed by its topic id `IT`, where a
+record belongs to the closest preceding record of a higher level:
+
+    CL (classification) > CT (competition) > EV (event) > MG (market
+    group) > MA (market) > CO (column) > PA (participant)
+
+`FeedState` keeps one persistent tree of those records, every node
+reachable in O(1) through a `dict` keyed by `IT` (`<type>:<ID>` for
+records without one), and applies each poll as operations on it:
+
+    insert - a topic seen for the first time
+
+    update - only the fields whose value changed
+
+    delete - with `snapshot=True`, topics missing under the subtrees a
+        poll covered (a topic and its descendants)
+
+So a poll costs time proportional to the records received, and
+listeners are told exactly what changed
+
+>>> state = FeedState()
+>>> @state.on("update")
+... def moved(change):
+...     print(change.key, change.previous, "->", change.fields)
+>>> state.apply(client.in_play_odds(fi="88232938", raw="1"), snapshot=True)
+
+Deltas decoded from a push feed go straight to `update` / `delete`
+
+"""
+import threading
+
+from typing import Callable, Iterator, List, Optional
+
+from pybet365.response.markets import _iter_flat
+
+OPERATIONS = ("insert", "update", "delete")
+
+# NOTE: unknown types (stats, teams, ...) are leaves of the current node
+LEVELS = {
+    "CL": 0,
+    "CT": 1,
+    "EV": 2,
+    "MG": 3,
+    "MA": 4,
+    "CO": 5,
+    "PA": 6,
+}
+
+_MISSING = object()
+
+
+def node_key(record: dict) -> Optional[str]:
+    """Topic key of a raw record, `None` when it has no identifier."""
+    topic = record.get("IT")
+    if topic:
+        return topic
+
+    identifier = record.get("ID")
+    if identifier is None:
+        return None
+
+    return "{}:{}".format(record.get("type"), identifier)
+
+
+class FeedNode(object):
+    """One topic of the feed tree, `fields` being its raw record."""
+
+    __slots__ = ("key", "type", "fields", "parent", "children", "seen")
+
+    def __init__(
+        self, key: str, fields: dict, parent: Optional["FeedNode"] = None
+    ):
+        """Constructor for FeedNode."""
+        self.key = key
+        self.type = fields.get("type")
+        self.fields = fields
+        self.parent = parent
+        self.children = {}
+        self.seen = 0
+
+    def get(self, name: str, default=None):
+        """Field `name` of the record."""
+        return self.fields.get(name, default)
+
+    def walk(self) -> Iterator["FeedNode"]:
+        """This node and its descendants, parents first."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(node.children.values())))
+
+    def ancestor(self, type: str) -> Optional["FeedNode"]:
+        """Closest ancestor (or self) of record `type`."""
+        node = self
+        while node is not None and node.type != type:
+            node = node.parent
+
+        return node
+
+    def __repr__(self) -> str:
+        """Debug representation."""
+        return "FeedNode({!r}, {}, children={})".format(
+            self.key, self.type, len(self.children)
+        )
+
+
+class Change(object):
+    """
+    One operation applied to the tree.
+
+    `fields` holds the whole record for "insert" / "delete" and only the
+    changed fields for "update", with their old values in `previous`
+
+    """
+
+    __slots__ = ("op", "node", "fields", "previous")
+
+    def __init__(
+        self,
+        op: str,
+        node: FeedNode,
+        fields: dict,
+        previous: Optional[dict] = None,
+    ):
+        """Constructor for Change."""
+        self.op = op
+        self.node = node
+        self.fields = fields
+        self.previous = previous
+
+    @property
+    def key(self) -> str:
+        """Topic key of the changed node."""
+        return self.node.key
+
+    def __repr__(self) -> str:
+        """Debug representation."""
+        return "Change({}, {!r}, {!r})".format(self.op, self.key, self.fields)
+
+
+class FeedState(object):
+    """
+    Persistent tree of raw feed records keyed by topic.
+
+    Mutations hold a re-entrant lock, listeners run under it (after the
+    whole poll is applied) and may read the tree
+
+    """
+
+    def __init__(self):
+        """Constructor for FeedState."""
+        self.roots = {}
+        self.generation = 0
+        self._nodes = {}
+        self._listeners = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Number of topics."""
+        return len(self._nodes)
+
+    def __contains__(self, key: str) -> bool:
+        """`True` when topic `key` is in the tree."""
+        return key in self._nodes
+
+    def get(self, key: str) -> Optional[FeedNode]:
+        """Node of topic `key`."""
+        return self._nodes.get(key)
+
+    def nodes(self, type: Optional[str] = None) -> List[FeedNode]:
+        """Every node, or those of record `type` ("EV", "PA", ...)."""
+        if type is None:
+            return list(self._nodes.values())
+
+        return [node for node in self._nodes.values() if node.type == type]
+
+    def on(self, operation: str, handler: Optional[Callable] = None):
+        """
+        Register `handler(change)` for "insert", "update" or "delete".
+
+        Usable as a decorator when `handler` is omitted
+
+        Raises:
+            ValueError: for an unknown `operation`
+
+        """
+        if operation not in OPERATIONS:
+            raise ValueError("Unknown operation: {}".format(operation))
+
+        def register(func: Callable) -> Callable:
+            self._listeners.setdefault(operation, []).append(func)
+            return func
+
+        return register if handler is None else register(handler)
+
+    def off(self, operation: str, handler: Callable) -> None:
+        """Unregister `handler`."""
+        handlers = self._listeners.get(operation, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def apply(self, response, snapshot: bool = False) -> List[Change]:
+        """
+        Apply the records of a raw poll.
+
+        Args:
+            response: raw response, payload `dict` or records (nested
+                record lists are flattened)
+            snapshot (bool): the poll is complete for the subtrees it
+                covers, topics missing there are deleted
+
+        Returns:
+            changes (List[Change]): operations applied, in order
+
+        """
+        results = response.get("results") if isinstance(response, dict) else (
+            response
+        )
+        changes = []
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            scopes = {}
+            stack = []
+            for record in _iter_flat(results or ()):
+                level = LEVELS.get(record.get("type"))
+                if level is not None:
+                    while stack and stack[-1][0] >= level:
+                        stack.pop()
+                parent = stack[-1][1] if stack else None
+
+                node = self._upsert(record, parent, changes)
+                if node is None:
+                    continue
+                node.seen = generation
+                if parent is None:
+                    scopes[node.key] = node
+                if level is not None:
+                    stack.append((level, node))
+
+            if snapshot:
+                for scope in scopes.values():
+                    self._sweep(scope, generation, changes)
+            self._emit(changes)
+
+        return changes
+
+    def update(self, key: str, fields: dict) -> Optional[Change]:
+        """
+        Apply a field delta to topic `key`.
+
+        Returns:
+            change (Optional[Change]): `None` when no value changed
+
+        Raises:
+            KeyError: for an unknown topic
+
+        """
+        with self._lock:
+            node = self._nodes[key]
+            changes = []
+            self._merge(node, fields, changes)
+            self._emit(changes)
+
+        return changes[0] if changes else None
+
+    def delete(self, key: str) -> List[Change]:
+        """
+        Remove topic `key` and its descendants.
+
+        Returns:
+            changes (List[Change]): one "delete" per removed topic
+                (empty for an unknown topic)
+
+        """
+        changes = []
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                self._remove(node, changes)
+                self._emit(changes)
+
+        return changes
+
+    def to_records(self, key: Optional[str] = None) -> List[dict]:
+        """Records of the tree (or the subtree of `key`) in feed order."""
+        with self._lock:
+            if key is None:
+                tops = list(self.roots.values())
+            else:
+                tops = [self._nodes[key]]
+
+            return [
+                dict(node.fields) for top in tops for node in top.walk()
+            ]
+
+    def clear(self) -> None:
+        """Drop every topic without notifications."""
+        with self._lock:
+            self.roots.clear()
+            self._nodes.clear()
+
+    def stats(self) -> dict:
+        """Topic counts per record type."""
+        counts = {}
+        for node in list(self._nodes.values()):
+            counts[node.type] = counts.get(node.type, 0) + 1
+
+        return {"topics": len(self._nodes), "types": counts,
+                "generation": self.generation}
+
+    def _upsert(
+        self, record: dict, parent: Optional[FeedNode], changes: List
+    ) -> Optional[FeedNode]:
+        """Insert or update the node of `record`."""
+        key = node_key(record)
+        if key is None:
+            return None
+
+        node = self._nodes.get(key)
+        if node is None:
+            node = FeedNode(key, dict(record), parent)
+            self._nodes[key] = node
+            siblings = self.roots if parent is None else parent.children
+            siblings[key] = node
+            changes.append(Change("insert", node, node.fields))
+            return node
+
+        # NOTE: a record without a parent in this poll (e.g. the "EV" of
+        # an `in_play_odds` body) keeps its place in the tree
+        if parent is not None and node.parent is not parent:
+            self._detach(node)
+            node.parent = parent
+            parent.children[key] = node
+        self._merge(node, record, changes)
+
+        return node
+
+    @staticmethod
+    def _merge(node: FeedNode, record: dict, changes: List) -> None:
+        """Copy the changed fields of `record` onto `node`."""
+        fields = node.fields
+        changed = previous = None
+        for name, value in record.items():
+            old = fields.get(name, _MISSING)
+            if old is _MISSING or old != value:
+                if changed is None:
+                    changed, previous = {}, {}
+                changed[name] = value
+                previous[name] = None if old is _MISSING else old
+                fields[name] = value
+        if changed is not None:
+            changes.append(Change("update", node, changed, previous))
+
+    def _sweep(self, scope: FeedNode, generation: int, changes: List):
+        """Delete the descendants of `scope` not seen in `generation`."""
+        stack = [scope]
+        while stack:
+            node = stack.pop()
+            for child in list(node.children.values()):
+                if child.seen == generation:
+                    stack.append(child)
+                else:
+                    self._remove(child, changes)
+
+    def _remove(self, node: FeedNode, changes: List) -> None:
+        """Unlink `node` and its descendants, children reported first."""
+        self._detach(node)
+        for removed in reversed(list(node.walk())):
+            del self._nodes[removed.key]
+            changes.append(Change("delete", removed, removed.fields))
+
+    def _detach(self, node: FeedNode) -> None:
+        """Remove `node` from its parent (or the roots)."""
+        siblings = self.roots if node.parent is None else node.parent.children
+        siblings.pop(node.key, None)
+
+    def _emit(self, changes: List[Change]) -> None:
+        """Call the listeners of every change."""
+        listeners = self._listeners
+        if not listeners:
+            return
+
+        for change in changes:
+            for handler in listeners.get(change.op, ()):
+                handler(change)
@@ -0,0 +1,502 @@
+"""
+Live Update Subscription Hub.
+
+Fans live `in_play_odds` updates out to many local consumers while
+polling every FI upstream exactly once:
+
+    subscribe - consumers subscribe to FIs, sports or leagues (sport and
+        league subscriptions follow the `in_play_filter` listing, so
+        events are picked up when they go live)
+
+    reference counting - an FI is polled while at least one
+        subscription (direct or through a sport / league) references it
+
+    multicast - each changed payload is parsed once and pushed to the
+        bounded queue of every matching subscription
+
+Slow consumers never block the pollers, a full queue applies the
+subscription's policy:
+
+    coalesce - keep only the latest update per FI (default)
+
+    drop_oldest - discard the oldest queued update
+
+    drop_newest - discard the incoming update
+
+>>> with SubscriptionHub(client, interval=1.0) as hub:
+...     with hub.subscribe(fis=["88232938"], sports=["1"]) as subscription:
+...         for update in subscription:
+...             print(update.fi, len(update.selections))
+
+"""
+import heapq
+import threading
+import time
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from pybet365.export import records_of
+from pybet365.response.markets import iter_in_play_selections
+
+POLICIES = ("coalesce", "drop_oldest", "drop_newest")
+
+
+class Update(object):
+    """
+    One change of an FI, shared by every subscriber.
+
+    `kind` is "odds" for a changed payload and "removed" once the event
+    leaves every followed `in_play_filter` listing
+
+    """
+
+    __slots__ = ("fi", "kind", "payload", "selections", "received_at")
+
+    def __init__(
+        self,
+        fi: str,
+        kind: str,
+        payload=None,
+        selections: tuple = (),
+        received_at: Optional[float] = None,
+    ):
+        """Constructor for Update."""
+        self.fi = fi
+        self.kind = kind
+        self.payload = payload
+        self.selections = selections
+        self.received_at = (
+            time.time() if received_at is None else received_at
+        )
+
+    def __repr__(self) -> str:
+        """Debug representation."""
+        return "Update(fi={!r}, kind={!r}, selections={})".format(
+            self.fi, self.kind, len(self.selections)
+        )
+
+
+class Subscription(object):
+    """
+    Bounded queue of `Update` objects for one consumer.
+
+    Created by `SubscriptionHub.subscribe`, iterate it (or call `get`)
+    to consume and `close` it to release its FIs
+
+    """
+
+    def __init__(
+        self,
+        hub: "SubscriptionHub",
+        fis: Iterable[str] = (),
+        sports: Iterable[str] = (),
+        leagues: Iterable[str] = (),
+        maxsize: int = 1000,
+        policy: str = "coalesce",
+    ):
+        """Constructor for Subscription."""
+        if policy not in POLICIES:
+            raise ValueError("Unknown subscription policy: {}".format(policy))
+
+        self.hub = hub
+        self.fis = frozenset(str(fi) for fi in fis)
+        self.sports = frozenset(str(s) for s in sports)
+        self.leagues = frozenset(str(league) for league in leagues)
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._queue = OrderedDict() if policy == "coalesce" else deque()
+        self._ready = threading.Condition(threading.Lock())
+
+    def __len__(self) -> int:
+        """Queued updates."""
+        return len(self._queue)
+
+    def put(self, update: Update) -> None:
+        """Queue `update`, applying the policy when full (never blocks)."""
+        with self._ready:
+            if self.closed:
+                return
+
+            queue = self._queue
+            if self.policy == "coalesce":
+                if update.fi in queue:
+                    queue[update.fi] = update
+                    self.coalesced += 1
+                    return
+                if len(queue) >= self.maxsize:
+                    queue.popitem(last=False)
+                    self.dropped += 1
+                queue[update.fi] = update
+            else:
+                if len(queue) >= self.maxsize:
+                    self.dropped += 1
+                    if self.policy == "drop_newest":
+                        return
+                    queue.popleft()
+                queue.append(update)
+
+            self.delivered += 1
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Update]:
+        """
+        Next update, waiting up to `timeout` seconds.
+
+        Returns:
+            update (Optional[Update]): `None` on timeout or once closed
+
+        """
+        with self._ready:
+            if not self._queue and not self.closed:
+                self._ready.wait(timeout)
+            if not self._queue:
+                return None
+            if self.policy == "coalesce":
+                return self._queue.popitem(last=False)[1]
+
+            return self._queue.popleft()
+
+    def __iter__(self) -> Iterator[Update]:
+        """Yield updates until the subscription is closed."""
+        while True:
+            update = self.get()
+            if update is None:
+                if self.closed:
+                    return
+                continue
+            yield update
+
+    def close(self) -> None:
+        """Unsubscribe (wakes up blocked consumers)."""
+        with self._ready:
+            if self.closed:
+                return
+            self.closed = True
+            self._ready.notify_all()
+
+        self.hub.unsubscribe(self)
+
+    def stats(self) -> dict:
+        """Queue counters."""
+        return {
+            "queued": len(self._queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+    def __enter__(self) -> "Subscription":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+
+class SubscriptionHub(object):
+    """
+    One upstream poller per FI multicasting to many subscriptions.
+
+    Args:
+        client (Bet365): client used for `in_play_odds` and
+            `in_play_filter`
+        interval (float): seconds between polls of one FI
+        discover_interval (float): seconds between `in_play_filter`
+            polls of subscribed sports / leagues
+        workers (int): concurrent upstream requests
+        clock (Callable): monotonic clock (injectable for tests)
+
+    """
+
+    def __init__(
+        self,
+        client,
+        interval: float = 1.0,
+        discover_interval: float = 15.0,
+        workers: int = 4,
+        clock=time.monotonic,
+    ):
+        """Constructor for SubscriptionHub."""
+        self.client = client
+        self.interval = interval
+        self.discover_interval = discover_interval
+        self.workers = workers
+        self.polls = 0
+        self.errors = 0
+        self._clock = clock
+        self._lock = threading.Condition(threading.Lock())
+        self._subscriptions = set()
+        # NOTE: FI -> subscriptions (direct or through a listing)
+        self._routes = {}
+        # NOTE: (sport_id, league_id) listing -> [subscriptions, FIs]
+        self._listings = {}
+        self._last = {}
+        self._heap = []
+        self._scheduled = set()
+        self._in_flight = set()
+        self._pool = None
+        self._thread = None
+        self._running = False
+
+    def start(self) -> "SubscriptionHub":
+        """Start the scheduler thread."""
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._thread = threading.Thread(
+            target=self._run, name="pybet365-hub", daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def close(self) -> None:
+        """Stop polling and close every subscription."""
+        with self._lock:
+            self._running = False
+            subscriptions = list(self._subscriptions)
+            self._lock.notify_all()
+
+        for subscription in subscriptions:
+            subscription.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "SubscriptionHub":
+        """Context manager entry (starts the hub)."""
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+    def subscribe(
+        self,
+        fis: Iterable[str] = (),
+        sports: Iterable[str] = (),
+        leagues: Iterable[str] = (),
+        maxsize: int = 1000,
+        policy: str = "coalesce",
+    ) -> Subscription:
+        """
+        Subscribe to FIs, sports and/or leagues.
+
+        Args:
+            fis (Iterable[str]): FIs to follow
+            sports (Iterable[str]): sport ids whose live events to follow
+            leagues (Iterable[str]): league ids whose live events to follow
+            maxsize (int): queue bound of the subscription
+            policy (str): "coalesce", "drop_oldest" or "drop_newest"
+
+        Returns:
+            Subscription: bounded update queue
+
+        Raises:
+            ValueError: for an unknown `policy`
+
+        """
+        subscription = Subscription(
+            self, fis, sports, leagues, maxsize=maxsize, policy=policy
+        )
+        now = self._clock()
+        with self._lock:
+            self._subscriptions.add(subscription)
+            for fi in subscription.fis:
+                self._route(fi, subscription, now)
+            listings = [(s, None) for s in subscription.sports] + [
+                (None, league) for league in subscription.leagues
+            ]
+            for listing in listings:
+                entry = self._listings.get(listing)
+                if entry is None:
+                    entry = self._listings[listing] = [set(), set()]
+                    self._schedule("listing", listing, now)
+                entry[0].add(subscription)
+                for fi in entry[1]:
+                    self._route(fi, subscription, now)
+            self._lock.notify_all()
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Release every FI and listing referenced by `subscription`."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            for fi in list(self._routes):
+                self._unroute(fi, subscription)
+            for listing in list(self._listings):
+                entry = self._listings[listing]
+                entry[0].discard(subscription)
+                if not entry[0]:
+                    del self._listings[listing]
+
+    def polled_fis(self) -> frozenset:
+        """FIs currently polled upstream."""
+        with self._lock:
+            return frozenset(self._routes)
+
+    def refcount(self, fi: str) -> int:
+        """Subscriptions referencing `fi`."""
+        with self._lock:
+            return len(self._routes.get(fi, ()))
+
+    def stats(self) -> dict:
+        """Hub counters."""
+        with self._lock:
+            return {
+                "subscriptions": len(self._subscriptions),
+                "fis": len(self._routes),
+                "listings": len(self._listings),
+                "polls": self.polls,
+                "errors": self.errors,
+            }
+
+    def _route(self, fi: str, subscription: Subscription, now: float):
+        """Reference `fi` for `subscription` (lock held)."""
+        routes = self._routes.get(fi)
+        if routes is None:
+            routes = self._routes[fi] = set()
+            self._schedule("fi", fi, now)
+        routes.add(subscription)
+
+    def _unroute(self, fi: str, subscription: Subscription) -> None:
+        """Drop the reference of `subscription` to `fi` (lock held)."""
+        routes = self._routes.get(fi)
+        if routes is None:
+            return
+        routes.discard(subscription)
+        if not routes:
+            del self._routes[fi]
+            self._last.pop(fi, None)
+
+    def _schedule(self, kind: str, key, due: float) -> None:
+        """Queue a poll unless one is queued or running (lock held)."""
+        task = (kind, key)
+        if task in self._scheduled or task in self._in_flight:
+            return
+        self._scheduled.add(task)
+        heapq.heappush(self._heap, (due, kind, key))
+
+    def _wanted(self, kind: str, key) -> bool:
+        """Whether an FI / listing is still referenced (lock held)."""
+        if kind == "fi":
+            return key in self._routes
+
+        return key in self._listings
+
+    def _run(self) -> None:
+        """Scheduler: dispatch due polls to the worker pool."""
+        with self._lock:
+            while self._running:
+                now = self._clock()
+                while self._heap and self._heap[0][0] <= now:
+                    _, kind, key = heapq.heappop(self._heap)
+                    self._scheduled.discard((kind, key))
+                    if not self._wanted(kind, key):
+                        continue
+                    self._in_flight.add((kind, key))
+                    self._pool.submit(self._poll, kind, key)
+
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._lock.wait(timeout)
+
+    def _poll(self, kind: str, key) -> None:
+        """Worker: poll one FI or listing, then reschedule it."""
+        try:
+            if kind == "fi":
+                self._poll_fi(key)
+            else:
+                self._poll_listing(key)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+        finally:
+            interval = (
+                self.interval if kind == "fi" else self.discover_interval
+            )
+            with self._lock:
+                self.polls += 1
+                self._in_flight.discard((kind, key))
+                if self._running and self._wanted(kind, key):
+                    self._schedule(kind, key, self._clock() + interval)
+                    self._lock.notify_all()
+
+    def _poll_fi(self, fi: str) -> None:
+        """Fetch `fi` and multicast it when it changed."""
+        payload = self.client.in_play_odds(fi=fi)
+        with self._lock:
+            previous = self._last.get(fi)
+            # NOTE: with a client cache an unchanged body is the same object
+            if previous is payload or previous == payload:
+                return
+            self._last[fi] = payload
+            targets = list(self._routes.get(fi, ()))
+
+        if targets:
+            update = Update(
+                fi, "odds", payload,
+                tuple(iter_in_play_selections(payload, fi=fi)),
+            )
+            for subscription in targets:
+                subscription.put(update)
+
+    def _poll_listing(self, listing: tuple) -> None:
+        """Refresh the live FIs of a sport / league listing."""
+        sport_id, league_id = listing
+        response = self.client.in_play_filter(
+            sport_id=sport_id, league_id=league_id
+        )
+        live = set()
+        for record in records_of(response):
+            fi = record.get("id")
+            if fi is not None:
+                live.add(str(fi))
+
+        removed = []
+        now = self._clock()
+        with self._lock:
+            entry = self._listings.get(listing)
+            if entry is None:
+                return
+            subscriptions, known = entry
+            for fi in live - known:
+                for subscription in subscriptions:
+                    self._route(fi, subscription, now)
+            for fi in known - live:
+                for subscription in subscriptions:
+                    if fi not in subscription.fis and not self._listed(
+                        fi, subscription, listing
+                    ):
+                        self._unroute(fi, subscription)
+                        removed.append((fi, subscription))
+            entry[1] = live
+            self._lock.notify_all()
+
+        for fi, subscription in removed:
+            subscription.put(Update(fi, "removed"))
+
+    def _listed(
+        self, fi: str, subscription: Subscription, exclude: tuple
+    ) -> bool:
+        """Whether another listing of `subscription` still has `fi`."""
+        for listing, (subscriptions, known) in self._listings.items():
+            if listing != exclude and subscription in subscriptions and (
+                fi in known
+            ):
+                return True
+
+        return False
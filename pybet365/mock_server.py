@@ -0,0 +1,709 @@
+"""
+Local Mock Bet365 API Server.
+
+A stand-in for the RapidAPI Bet365 service (plain `asyncio`, no extra
+dependencies) serving all six endpoints so pooled / concurrent client
+code can be load tested and benchmarked offline:
+
+    /v1/bet365/result         /v1/bet365/inplay_filter
+    /v1/bet365/event          /v2/bet365/prematch
+    /v1/bet365/inplay         /v1/bet365/upcoming
+
+Behaviour is configurable:
+
+    latency / jitter - seconds slept before every response
+
+    error_rate - fraction of requests answered with `500`
+
+    rate_limit - requests per second per `x-rapidapi-key` before `429`
+        (with `Retry-After`)
+
+    quota - requests per key per `quota_reset` seconds, reported through
+        the RapidAPI `x-ratelimit-requests-*` headers
+
+    records / per_page - payload size, records come from the seeded
+        `SyntheticGenerator` (or repeat fixture records)
+
+Connections speak HTTP/1.1 (keep-alive) or, when the `h2` package is
+installed, HTTP/2 with prior knowledge (h2c) so multiplexed transports
+can be benchmarked
+
+`GET /stats` answers the request, status and connection counters
+
+Bodies carry an `ETag` and honour `If-None-Match` with `304`, they are
+compressed with the best coding offered in `Accept-Encoding` (zstd and
+br when `zstandard` / `brotli` are installed, gzip, deflate)
+
+    $ python -m pybet365.mock_server --port 8365 --latency 0.05
+
+>>> with MockBet365Server(records=1000).run_in_thread() as server:
+...     client = Bet365(api_host="mock", api_key="k", base_url=server.url)
+...     client.upcoming_events(sport_id="1")
+
+"""
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import zlib
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from pybet365.client.transport import PREFERENCE
+from pybet365.synthetic import (
+    PAGED_ENDPOINTS,
+    RAW_ENDPOINTS,
+    SyntheticGenerator,
+    dump_payload,
+)
+
+# NOTE: `(version, endpoint)` pairs, matching `Bet365` endpoint methods
+ENDPOINTS = {
+    ("v1", "result"),
+    ("v1", "inplay_filter"),
+    ("v1", "event"),
+    ("v2", "prematch"),
+    ("v1", "inplay"),
+    ("v1", "upcoming"),
+}
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+# NOTE: payloads above this many records are streamed (chunked), not cached
+CACHED_RECORDS = 1000
+
+# NOTE: bytes of serialized payload written per chunk
+CHUNK_SIZE = 65536
+
+# NOTE: HTTP/2 connection preface sent first by prior knowledge clients
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class MockBet365Server(object):
+    """
+    Asyncio HTTP/1.1 server emulating the Bet365 API.
+
+    Args:
+        latency (float): base seconds slept before answering
+        jitter (float): extra uniform random seconds of latency
+        error_rate (float): fraction of requests answered with `500`
+        rate_limit (Optional[float]): requests per second per key
+        quota (Optional[int]): requests per key per `quota_reset`
+        quota_reset (float): seconds between quota resets
+        records (int): records per response (page size caps paged ones)
+        per_page (int): page size of paged endpoints
+        fixtures (Optional[str]): directory of `<endpoint>.json` bodies
+            whose records replace the synthetic ones
+        seed (int): seed for payloads, latency and error sampling
+        compression (bool): compress bodies when the client accepts it
+
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        quota: Optional[int] = None,
+        quota_reset: float = 60.0,
+        records: int = 50,
+        per_page: int = 50,
+        fixtures: Optional[str] = None,
+        seed: int = 0,
+        compression: bool = True,
+    ):
+        """Constructor for MockBet365Server."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.quota = quota
+        self.quota_reset = quota_reset
+        self.records = records
+        self.per_page = per_page
+        self.fixtures = fixtures
+        self.compression = compression
+        self.host = None
+        self.port = None
+        self.requests = 0
+        self.statuses = Counter()
+        self.connections = Counter()
+        self._random = random.Random(seed)
+        self._buckets = {}
+        self._quotas = {}
+        self._bodies = {}
+        self._generator = SyntheticGenerator(seed=seed)
+        self._templates = _load_fixtures(fixtures) if fixtures else {}
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        """`Bet365(base_url=...)` value for this server."""
+        return "http://{}:{}/{{}}/bet365/".format(self.host, self.port)
+
+    def stats(self) -> dict:
+        """Request counters."""
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "connections": dict(self.connections),
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening (port `0` picks a free port)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+
+        return self.port
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _shutdown(self) -> None:
+        """Stop listening and cancel the open connections."""
+        await self.close()
+        all_tasks = getattr(asyncio, "all_tasks", None) or (
+            asyncio.Task.all_tasks
+        )
+        current = asyncio.Task.current_task() if not hasattr(
+            asyncio, "current_task"
+        ) else asyncio.current_task()
+        tasks = [task for task in all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8365):
+        """Run the server on a new event loop until interrupted."""
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.start(host, port))
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            loop.run_until_complete(self.close())
+            loop.close()
+
+    @contextmanager
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0):
+        """Serve from a background thread for the enclosed block."""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start(host, port))
+            started.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        started.wait()
+        try:
+            yield self
+        finally:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    async def _handle(self, reader, writer) -> None:
+        """Serve every request of one (keep-alive) connection."""
+        try:
+            first = True
+            while True:
+                request_line = await reader.readline()
+                if first and request_line == H2_PREFACE[:16]:
+                    rest = await reader.readexactly(len(H2_PREFACE) - 16)
+                    await self._handle_h2(reader, writer, request_line + rest)
+                    break
+                if first:
+                    self.connections["HTTP/1.1"] += 1
+                    first = False
+                if not request_line.strip():
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                target = parts[1] if len(parts) > 1 else "/"
+                status, extra, body = await self._respond(target, headers)
+                self.requests += 1
+                self.statuses[status] += 1
+
+                if isinstance(body, bytes):
+                    writer.write(_render(status, extra, body))
+                else:
+                    extra["Transfer-Encoding"] = "chunked"
+                    writer.write(_render(status, extra, None))
+                    for chunk in body:
+                        writer.write(
+                            b"%x\r\n%s\r\n" % (len(chunk), chunk)
+                        )
+                        await writer.drain()
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.CancelledError,
+        ):
+            # NOTE: cancelled by `_shutdown` while the client kept it open
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_h2(self, reader, writer, preface: bytes) -> None:
+        """Serve one HTTP/2 (h2c prior knowledge) connection, every
+        stream answered by its own task."""
+        try:
+            h2 = _h2()
+        except ImportError:
+            return
+        connection = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(
+                client_side=False, header_encoding="utf-8"
+            )
+        )
+        connection.initiate_connection()
+        self.connections["HTTP/2"] += 1
+        window = asyncio.Event()
+        streams = {}
+
+        def flush():
+            data = connection.data_to_send()
+            if data:
+                writer.write(data)
+
+        events = connection.receive_data(preface)
+        try:
+            while True:
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.ensure_future(self._respond_h2(
+                            connection, writer, window, flush,
+                            event.stream_id, dict(event.headers),
+                        ))
+                        task.add_done_callback(
+                            lambda _, stream_id=event.stream_id: (
+                                streams.pop(stream_id, None)
+                            )
+                        )
+                        streams[event.stream_id] = task
+                    elif isinstance(event, (
+                        h2.events.WindowUpdated,
+                        h2.events.RemoteSettingsChanged,
+                    )):
+                        window.set()
+                    elif isinstance(event, h2.events.StreamReset):
+                        task = streams.pop(event.stream_id, None)
+                        if task is not None:
+                            task.cancel()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                flush()
+                await writer.drain()
+
+                data = await reader.read(CHUNK_SIZE)
+                if not data:
+                    return
+                events = connection.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            flush()
+        finally:
+            for task in list(streams.values()):
+                task.cancel()
+
+    async def _respond_h2(
+        self, connection, writer, window, flush, stream_id: int,
+        headers: dict,
+    ) -> None:
+        """Answer one HTTP/2 stream, honouring flow control."""
+        status, extra, body = await self._respond(
+            headers.get(":path", "/"),
+            dict((k, v) for k, v in headers.items() if k[0] != ":"),
+        )
+        self.requests += 1
+        self.statuses[status] += 1
+
+        response_headers = [(":status", str(status))]
+        if status != 304:
+            response_headers.append(("content-type", "application/json"))
+        if isinstance(body, bytes):
+            response_headers.append(("content-length", str(len(body))))
+        response_headers.extend(
+            (name.lower(), value) for name, value in extra.items()
+        )
+        connection.send_headers(stream_id, response_headers)
+        flush()
+
+        chunks = [body] if isinstance(body, bytes) else body
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                size = min(
+                    connection.local_flow_control_window(stream_id),
+                    connection.max_outbound_frame_size,
+                    len(view),
+                )
+                if size <= 0:
+                    window.clear()
+                    await window.wait()
+                    continue
+                connection.send_data(stream_id, view[:size].tobytes())
+                view = view[size:]
+                flush()
+                await writer.drain()
+        connection.end_stream(stream_id)
+        flush()
+        await writer.drain()
+
+    async def _respond(self, target: str, headers: dict) -> tuple:
+        """`(status, headers, body)` for one request."""
+        if target == "/stats":
+            return 200, {}, json.dumps(self.stats()).encode("utf-8")
+
+        delay = self.latency + self._random.uniform(0.0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        split = urlsplit(target)
+        parts = split.path.strip("/").split("/")
+        if len(parts) != 3 or parts[1] != "bet365" or (
+            (parts[0], parts[2]) not in ENDPOINTS
+        ):
+            return 404, {}, _error("Not Found")
+
+        extra = {}
+        key = headers.get("x-rapidapi-key", "")
+        limited = self._throttle(key, extra)
+        if limited:
+            return 429, extra, _error("Too many requests")
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, extra, _error("Internal Server Error")
+
+        # NOTE: payloads are deterministic, so the ETag is derived from the
+        # query and configuration without rendering the body
+        params = tuple(sorted(parse_qsl(split.query)))
+        query = (parts[2], params, self.records, self.per_page)
+        etag = '"{}"'.format(hashlib.blake2b(
+            repr((self._generator.seed,) + query).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest())
+        coding = None
+        if self.compression:
+            coding = _negotiate(headers.get("accept-encoding", ""))
+        if coding is not None:
+            etag = '{}-{}"'.format(etag[:-1], coding)
+        extra["ETag"] = etag
+        if headers.get("if-none-match") == etag:
+            return 304, extra, b""
+
+        if coding is not None:
+            extra["Content-Encoding"] = coding
+            extra["Vary"] = "Accept-Encoding"
+
+        return 200, extra, self._body(parts[2], dict(params), coding)
+
+    def _throttle(self, key: str, extra: dict) -> bool:
+        """Apply the per key rate limit and quota."""
+        now = time.monotonic()
+        if self.quota is not None:
+            window_start, used = self._quotas.get(key, (now, 0))
+            if now - window_start >= self.quota_reset:
+                window_start, used = now, 0
+            reset = max(0.0, self.quota_reset - (now - window_start))
+            extra["x-ratelimit-requests-limit"] = str(self.quota)
+            extra["x-ratelimit-requests-reset"] = str(int(reset))
+            if used >= self.quota:
+                extra["x-ratelimit-requests-remaining"] = "0"
+                extra["Retry-After"] = str(int(reset) + 1)
+                return True
+            self._quotas[key] = (window_start, used + 1)
+            extra["x-ratelimit-requests-remaining"] = str(
+                self.quota - used - 1
+            )
+
+        if self.rate_limit:
+            # NOTE: a bucket below one token would never allow a request
+            capacity = max(1.0, self.rate_limit)
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * self.rate_limit)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                extra["Retry-After"] = "{:.3f}".format(
+                    (1.0 - tokens) / self.rate_limit
+                )
+                return True
+            self._buckets[key] = (tokens - 1.0, now)
+
+        return False
+
+    def _body(self, endpoint: str, params: dict, coding: Optional[str]):
+        """Serialized (and `coding` compressed) payload of `endpoint`, as
+        `bytes` (small payloads, cached per query) or as an iterator of
+        chunks."""
+        cache_key = (endpoint, tuple(sorted(params.items())), coding)
+        body = self._bodies.get(cache_key)
+        if body is not None:
+            return body
+
+        records, count, pager = self._records(endpoint, params)
+        chunks = _rechunk(dump_payload(
+            records, pager=pager, raw=endpoint in RAW_ENDPOINTS
+        ))
+        if coding is not None:
+            chunks = _compress(chunks, coding)
+        if count > CACHED_RECORDS:
+            return chunks
+
+        body = b"".join(chunks)
+        if len(self._bodies) < 256:
+            self._bodies[cache_key] = body
+
+        return body
+
+    def _records(self, endpoint: str, params: dict) -> tuple:
+        """`(records, count, pager)` answering `params`."""
+        start, count, pager = 0, self.records, None
+        if endpoint in PAGED_ENDPOINTS:
+            page = max(1, _to_int(params.get("page"), 1))
+            start = (page - 1) * self.per_page
+            count = max(0, min(self.per_page, self.records - start))
+            pager = {
+                "page": page, "per_page": self.per_page, "total": self.records
+            }
+
+        ids = None
+        if endpoint == "result" and params.get("event_id"):
+            ids = params["event_id"].split(",")
+            count = len(ids)
+
+        if endpoint in self._templates:
+            records = (
+                self._record(endpoint, i) for i in range(start, start + count)
+            )
+        else:
+            records = self._generator.records(endpoint, count, start)
+        if ids is not None:
+            records = (
+                dict(record, id=event_id)
+                for record, event_id in zip(records, ids)
+            )
+
+        return records, count, pager
+
+    def _record(self, endpoint: str, index: int):
+        """Fixture record of `endpoint` with ids offset by `index`."""
+        record = copy.deepcopy(self._templates[endpoint])
+        for item in record if isinstance(record, list) else [record]:
+            for name in ("id", "FI", "our_event_id"):
+                if isinstance(item.get(name), str) and item[name].isdigit():
+                    item[name] = str(int(item[name]) + index)
+
+        return record
+
+
+def _h2():
+    """Import `h2` (only needed by HTTP/2 clients)."""
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+
+    return h2
+
+
+def _load_fixtures(directory: str) -> dict:
+    """First record of every `<endpoint>.json` fixture in `directory`."""
+    templates = {}
+    for _, endpoint in ENDPOINTS:
+        path = os.path.join(directory, endpoint + ".json")
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            results = json.load(f).get("results") or []
+        if results:
+            templates[endpoint] = results[0]
+
+    return templates
+
+
+def _rechunk(chunks: Iterator[str]) -> Iterator[bytes]:
+    """Join small `json` pieces into `CHUNK_SIZE` byte chunks."""
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+class _BrotliEncoder(object):
+    """`compressobj` style adapter for `brotli.Compressor`."""
+
+    def __init__(self, brotli):
+        """Constructor for _BrotliEncoder."""
+        self._compressor = brotli.Compressor()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress one chunk."""
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        """Finish the stream."""
+        return self._compressor.finish()
+
+
+def _load_encoders() -> dict:
+    """Streaming encoder factories of every coding available here."""
+    encoders = {
+        "gzip": lambda: zlib.compressobj(
+            6, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        ),
+        "deflate": lambda: zlib.compressobj(6),
+    }
+    try:
+        import brotli
+
+        encoders["br"] = lambda: _BrotliEncoder(brotli)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        encoders["zstd"] = lambda: zstandard.ZstdCompressor().compressobj()
+    except ImportError:
+        pass
+
+    return encoders
+
+
+ENCODERS = _load_encoders()
+
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    """Preferred coding offered by the client (`None` for identity)."""
+    offered = set()
+    for item in accept_encoding.split(","):
+        name, _, quality = item.strip().lower().partition(";")
+        if quality.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00"):
+            continue
+        offered.add(name.strip())
+
+    for name in PREFERENCE:
+        if name in offered and name in ENCODERS:
+            return name
+
+    return None
+
+
+def _compress(chunks: Iterator[bytes], coding: str) -> Iterator[bytes]:
+    """Compress a chunk stream with `coding`."""
+    encoder = ENCODERS[coding]()
+    for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    data = encoder.flush()
+    if data:
+        yield data
+
+
+def _error(message: str) -> bytes:
+    """Error body in the API's shape."""
+    return json.dumps({"success": 0, "error": message}).encode("utf-8")
+
+
+def _render(status: int, headers: dict, body: Optional[bytes]) -> bytes:
+    """HTTP/1.1 response bytes (only the head when `body` is `None`)."""
+    lines = ["HTTP/1.1 {} {}".format(status, REASONS.get(status, "Unknown"))]
+    if status != 304:
+        lines.append("Content-Type: application/json")
+    if body is not None:
+        lines.append("Content-Length: {}".format(len(body)))
+    for name, value in headers.items():
+        lines.append("{}: {}".format(name, value))
+
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    return head + body if body is not None else head
+
+
+def _to_int(value, default: int) -> int:
+    """`int` of `value`, `default` when missing or unparsable."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def main(argv=None):
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8365)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument("--quota", type=int)
+    parser.add_argument("--records", type=int, default=50)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--fixtures")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-compression", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = MockBet365Server(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        quota=args.quota,
+        records=args.records,
+        per_page=args.per_page,
+        fixtures=args.fixtures,
+        seed=args.seed,
+        compression=not args.no_compression,
+    )
+    print("Serving Bet365 mock on http://{}:{}".format(args.host, args.port))
+    server.serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,52 @@ from .base import Bet365Response, FiResultBase, MetaBase, PagerBase
 
 from .in_play_events import InPlayEventsResponse, InPlayResult
 
+from .markets import MarketTable, normalize_prematch
+
+from .models import (
+    FiModel,
+    MetaModel,
+    ResultEventModel,
+    ResultModel,
+    UpcomingEventModel,
+)
+
 from .pre_match_odds import PreMatchOddsResponse
 
+from .query import Query
+
 from .result import Result, ResultEvent, ResultResponse
 
+from .schema import SchemaValidationError, SchemaValidator
+
+from .timeline import Timeline, TimelineEntry, TimelineParser
+
 from .upcoming_events import UpcomingEvent, UpcomingEventsResponse
 
 __all__ = [
     "Bet365Response",
+    "FiModel",
     "FiResultBase",
     "InPlayEventsResponse",
     "InPlayResult",
+    "MarketTable",
     "MetaBase",
+    "MetaModel",
     "PagerBase",
     "PreMatchOddsResponse",
+    "Query",
     "Result",
     "ResultEvent",
+    "ResultEventModel",
+    "ResultModel",
     "ResultResponse",
+    "SchemaValidationError",
+    "SchemaValidator",
+    "Timeline",
+    "TimelineEntry",
+    "TimelineParser",
     "UpcomingEvent",
+    "UpcomingEventModel",
     "UpcomingEventsResponse",
+    "normalize_prematch",
 ]
@@ -25,12 +25,18 @@ Further delegation for facade access to responses are subclassed
 The objects are accessible via dot notation or via `.get(..)`
 
 """
-from typing import Union
+from typing import List, Optional, Union
+
+from pybet365.client.config import Bet365SportId
+from pybet365.response.query import Query, run_query
 
 
 class Bet365Response(dict):
     """Base ResponseObject creator for Bet365 API Response."""
 
+    # NOTE: facade built for the records matched by `query`
+    RECORD_FACADE = None
+
     def __init__(self, data: dict):
         """Constructor for Bet365Response."""
         super(Bet365Response, self).__init__(data)
@@ -46,6 +52,28 @@ class Bet365Response(dict):
         # NOTE: This is overloaded hence the `_*`
         return self.get("results")
 
+    def query(self, query: Optional[Query] = None, **filters) -> List:
+        """
+        Records matching `filters` in one pass over the raw `results`.
+
+        Only matching records are wrapped in the record facade
+
+        >>> response.query(league_id="94", time_status="1")
+        >>> response.query(time__between=(start, end), ss="2-1")
+
+        Args:
+            query (Optional[Query]): precompiled query (reused as is)
+            **filters: `field__operator=value` filters (see `query`)
+
+        Returns:
+            records (List): matching records in payload order
+
+        """
+        if query is None:
+            query = Query(**filters)
+
+        return run_query(self._results, query, self.RECORD_FACADE)
+
 
 class FiResultBase(dict):
     """
@@ -197,6 +225,11 @@ class ResultBase(dict):
         """Access for `sport_id`."""
         return self.get("sport_id")
 
+    @property
+    def sport(self) -> Optional[Bet365SportId]:
+        """Access for `sport_id` as a `Bet365SportId` member."""
+        return Bet365SportId.from_sport_id(self.get("sport_id"))
+
     @property
     def time(self) -> str:
         """Access for `time`."""
@@ -66,6 +66,8 @@ class InPlayEventsResponse(Bet365Response):
 
     """
 
+    RECORD_FACADE = InPlayResult
+
     def __init__(self, data):
         """Constructor for InPlayEventsResponse."""
         super(InPlayEventsResponse, self).__init__(data)
@@ -79,6 +81,10 @@ class InPlayEventsResponse(Bet365Response):
 
         parsed_results = []
         for record in self._results:
-            parsed_results.append(InPlayResult(record))
+            # NOTE: raw bodies nest the mnemonic records in a list
+            if isinstance(record, list):
+                parsed_results.extend(InPlayResult(r) for r in record)
+            else:
+                parsed_results.append(InPlayResult(record))
 
         return parsed_results
@@ -0,0 +1,134 @@
+"""
+String Interning for Decoded Payloads.
+
+League names, team names, `cc` codes, `sport_id` values and mnemonic
+keys repeat across thousands of records, but every `json` decode makes
+fresh string objects. `InternTable` swaps them for one shared instance:
+
+    during decode - `json.loads(body, object_hook=table.object_hook)`
+
+    after decode - `table.intern_payload(payload)`
+
+The table is bounded: once `max_size` strings are held it is cleared and
+refilled, strings already handed out stay shared by their holders
+
+>>> client = Bet365(api_host="host", api_key="key", intern=True)
+
+"""
+import threading
+
+from typing import Iterable, Optional
+
+# NOTE: values of these keys repeat across records, ids and timestamps
+# of events do not and would only churn the table
+INTERN_FIELDS = frozenset((
+    # event payloads
+    "name",
+    "cc",
+    "sport_id",
+    "time_status",
+    "image_id",
+    "type",
+    # raw Bet365 mnemonic records
+    "CC",
+    "CL",
+    "CT",
+    "NA",
+    "OD",
+    "SU",
+))
+
+
+class InternTable(object):
+    """
+    Bounded shared table of canonical strings.
+
+    Args:
+        max_size (int): strings held before the table is recycled
+        max_length (int): longer strings are never interned
+        fields (Iterable[str]): keys whose `str` values are interned,
+            `id` is also interned inside `name`-bearing (meta) objects
+
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100000,
+        max_length: int = 128,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """Constructor for InternTable."""
+        self.max_size = max_size
+        self.max_length = max_length
+        self.fields = frozenset(fields) if fields else INTERN_FIELDS
+        self.hits = 0
+        self.misses = 0
+        self.recycles = 0
+        self._table = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of strings currently held."""
+        return len(self._table)
+
+    def intern(self, value: str) -> str:
+        """Canonical instance of `value`."""
+        canonical = self._table.get(value)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+
+        if len(value) > self.max_length:
+            return value
+
+        with self._lock:
+            if len(self._table) >= self.max_size:
+                self._table = {}
+                self.recycles += 1
+            canonical = self._table.setdefault(value, value)
+
+        self.misses += 1
+        return canonical
+
+    def object_hook(self, obj: dict) -> dict:
+        """`json` object hook interning keys and repeating values."""
+        intern = self.intern
+        fields = self.fields
+        is_meta = "name" in obj
+
+        interned = {}
+        for key, value in obj.items():
+            key = intern(key)
+            if value.__class__ is str and (
+                key in fields or (is_meta and key == "id")
+            ):
+                value = intern(value)
+            interned[key] = value
+
+        return interned
+
+    def intern_payload(self, payload):
+        """Recursively intern an already decoded payload."""
+        if isinstance(payload, dict):
+            return self.object_hook(dict(
+                (k, self.intern_payload(v)) for k, v in payload.items()
+            ))
+
+        if isinstance(payload, list):
+            return [self.intern_payload(v) for v in payload]
+
+        return payload
+
+    def stats(self) -> dict:
+        """Hit/miss counters of the table."""
+        return {
+            "size": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recycles": self.recycles,
+        }
+
+
+# NOTE: process wide table used by `Bet365(intern=True)` so that every
+# client shares canonical strings
+SHARED_TABLE = InternTable()
@@ -0,0 +1,277 @@
+"""
+Pre-Match Market Normalization.
+
+`prematch` records nest odds as FI -> market group -> markets ->
+selections:
+
+    {
+        "FI": "88232938",
+        "main": {
+            "updated_at": "1586461906",
+            "sp": {
+                "full_time_result": {
+                    "id": "40",
+                    "name": "Full Time Result",
+                    "odds": [{"id": "1", "odds": "2.100", "name": "1"}]
+                }
+            }
+        },
+        "asian_lines": {...},
+        "goals": {...}
+    }
+
+`normalize_prematch` flattens every selection into one array-backed
+`MarketTable` row (fi, group, market, selection, handicap, odds) and
+indexes rows by FI and by market key and name, so "Match Winner" across
+500 fixtures is a `dict` lookup
+
+>>> table = client.pre_match_odds(fi="88232938").markets()
+>>> table.select(market="Full Time Result")
+>>> [{"fi": "88232938", "group": "main", ...}, ...]
+
+"""
+from array import array
+from typing import Iterator, List, Optional
+
+from pybet365.response.table import NAN, ColumnTable
+
+# NOTE: record keys that are identifiers, not market groups
+NON_GROUP_KEYS = frozenset(("FI", "event_id", "id", "our_event_id"))
+
+
+def to_decimal_odds(value) -> float:
+    """
+    Decimal odds of a decimal ("2.10") or fractional ("11/10") price.
+
+    Returns:
+        odds (float): `nan` for missing or unparsable prices
+
+    """
+    if value is None or value == "":
+        return NAN
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        numerator, _, denominator = str(value).partition("/")
+        return float(numerator) / float(denominator) + 1.0
+    except (TypeError, ValueError, ZeroDivisionError):
+        return NAN
+
+
+def _to_float(value) -> float:
+    """`float` of `value`, `nan` when missing or unparsable."""
+    if value is None or value == "":
+        return NAN
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class MarketTable(ColumnTable):
+    """
+    Column oriented table of pre-match selections.
+
+    String columns are `list` objects, numeric columns are `array("d")`
+    (`nan` marks a missing handicap or price)
+
+    """
+
+    COLUMNS = (
+        "fi",
+        "group",
+        "market_key",
+        "market_id",
+        "market",
+        "selection_id",
+        "selection",
+        "handicap",
+        "odds",
+    )
+
+    NUMERIC = frozenset(("handicap", "odds"))
+
+    def __init__(self):
+        """Constructor for MarketTable."""
+        super(MarketTable, self).__init__()
+        self._by_market = {}
+        self._by_fi = {}
+
+    def append(
+        self, fi, group, market_key, market_id, market, selection_id,
+        selection, handicap, odds,
+    ) -> int:
+        """Append one selection row and index it."""
+        row = len(self.odds)
+        self.fi.append(fi)
+        self.group.append(group)
+        self.market_key.append(market_key)
+        self.market_id.append(market_id)
+        self.market.append(market)
+        self.selection_id.append(selection_id)
+        self.selection.append(selection)
+        self.handicap.append(handicap)
+        self.odds.append(odds)
+
+        for key in {market_key, market}:
+            if key is not None:
+                self._by_market.setdefault(key, array("l")).append(row)
+        self._by_fi.setdefault(fi, array("l")).append(row)
+
+        return row
+
+    def markets(self) -> List[str]:
+        """Every indexed market key and name."""
+        return list(self._by_market)
+
+    def market_rows(self, market: str) -> array:
+        """Row numbers of `market` (key such as "full_time_result" or
+        name such as "Full Time Result")."""
+        return self._by_market.get(market, array("l"))
+
+    def fi_rows(self, fi: str) -> array:
+        """Row numbers of fixture `fi`."""
+        return self._by_fi.get(fi, array("l"))
+
+    def select(
+        self, market: Optional[str] = None, fi: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Rows matching `market` and/or `fi` (index lookups, no scan).
+
+        Returns:
+            rows (List[dict]): matching rows in table order
+
+        """
+        return self.rows(self._match(
+            None if market is None else self.market_rows(market),
+            None if fi is None else self.fi_rows(fi),
+        ))
+
+
+def _iter_markets(sp) -> Iterator:
+    """Yield `(market_key, market_id, market_name, selections)`."""
+    if not isinstance(sp, dict):
+        return
+
+    for market_key, market in sp.items():
+        if isinstance(market, dict):
+            yield (
+                market_key,
+                market.get("id"),
+                market.get("name", market_key),
+                market.get("odds") or [],
+            )
+        elif isinstance(market, list):
+            yield market_key, None, market_key, market
+
+
+def _iter_groups(record: dict) -> Iterator:
+    """Yield `(group_name, group)` for every market group of a record."""
+    for name, group in record.items():
+        if name in NON_GROUP_KEYS:
+            continue
+        if isinstance(group, dict) and "sp" in group:
+            yield name, group
+        elif isinstance(group, list):
+            for index, sub_group in enumerate(group):
+                if isinstance(sub_group, dict) and "sp" in sub_group:
+                    yield "{}.{}".format(name, index), sub_group
+
+
+def normalize_prematch(response, table: Optional[MarketTable] = None):
+    """
+    Flatten `prematch` records into a `MarketTable`.
+
+    Args:
+        response: `PreMatchOddsResponse`, raw payload `dict` or an
+            iterable of records
+        table (Optional[MarketTable]): table to append to
+
+    Returns:
+        table (MarketTable): one row per selection
+
+    """
+    table = table if table is not None else MarketTable()
+    if isinstance(response, dict):
+        records = response.get("results") or []
+    else:
+        records = response or []
+
+    append = table.append
+    for record in records:
+        fi = record.get("FI")
+        for group_name, group in _iter_groups(record):
+            for key, market_id, name, selections in _iter_markets(
+                group.get("sp")
+            ):
+                for selection in selections:
+                    if not isinstance(selection, dict):
+                        continue
+                    append(
+                        fi,
+                        group_name,
+                        key,
+                        market_id,
+                        name,
+                        selection.get("id"),
+                        selection.get("name") or selection.get("header"),
+                        _to_float(selection.get("handicap")),
+                        to_decimal_odds(selection.get("odds")),
+                    )
+
+    return table
+
+
+def iter_in_play_selections(response, fi: Optional[str] = None) -> Iterator:
+    """
+    Yield selections of an `in_play_odds` payload.
+
+    In-play odds bodies are flat, ordered mnemonic records where each
+    "PA" (participant) belongs to the preceding "MA" (market) of the
+    preceding "EV" (event)
+
+    Args:
+        response: `in_play_odds` response or payload `dict`
+        fi (Optional[str]): FI to use when the body has no "EV" record
+
+    Yields:
+        (fi, market_id, market, selection_id, selection, handicap, odds)
+
+    """
+    results = response.get("results") if isinstance(response, dict) else (
+        response
+    )
+    market_id = market = None
+    for record in _iter_flat(results or []):
+        kind = record.get("type")
+        if kind == "EV":
+            fi = record.get("FI") or record.get("ID") or fi
+        elif kind == "MA":
+            market_id = record.get("ID")
+            market = record.get("NA") or market_id
+        elif kind == "PA" and "OD" in record:
+            yield (
+                fi,
+                market_id,
+                market,
+                record.get("ID"),
+                record.get("NA") or record.get("N2"),
+                _to_float(record.get("HA")),
+                to_decimal_odds(record.get("OD")),
+            )
+
+
+def _iter_flat(records) -> Iterator[dict]:
+    """Flatten one level of nested record lists."""
+    for record in records:
+        if isinstance(record, list):
+            for nested in record:
+                yield nested
+        elif isinstance(record, dict):
+            yield record
@@ -0,0 +1,232 @@
+"""
+Compact Typed Models.
+
+Opt-in alternative to the `dict` facades for long-lived in-memory use.
+Known fields are decoded once into `__slots__` attributes:
+
+    timestamps ("time", "updated_at", ...) become `int`
+
+    nested "league" / "home" / "away" become shared `MetaModel` objects
+
+Unknown payload fields are dropped, so a model only costs its slots
+
+>>> response = client.upcoming_events(sport_id="1")
+>>> events = response.to_models()
+>>> events[0].time
+>>> 1586480400
+
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from pybet365.client.config import Bet365SportId
+
+
+def to_int(value) -> Optional[int]:
+    """Decode an epoch/number field, `None` for missing values."""
+    if value is None or value == "":
+        return None
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Model(object):
+    """Base for slotted models."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_records(cls, records: Optional[Iterable[dict]]) -> List:
+        """Build models for every record of a `results` array."""
+        return [cls(record) for record in records or ()]
+
+    def to_dict(self) -> dict:
+        """Plain `dict` of every slot, nested models included."""
+        result = {}
+        for cls in reversed(type(self).__mro__):
+            for slot in getattr(cls, "__slots__", ()):
+                value = getattr(self, slot)
+                if isinstance(value, Model):
+                    value = value.to_dict()
+                elif isinstance(value, tuple):
+                    value = [
+                        v.to_dict() if isinstance(v, Model) else v
+                        for v in value
+                    ]
+                result[slot] = value
+
+        return result
+
+    def __eq__(self, other) -> bool:
+        """Slot-wise equality."""
+        if type(self) is not type(other):
+            return NotImplemented
+
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Debug representation."""
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(k, v) for k, v in self.to_dict().items()
+            ),
+        )
+
+
+class MetaModel(Model):
+    """
+    Slotted `id`/`name` object for league, home and away.
+
+    Instances are shared: `MetaModel.get(...)` returns the same object
+    for the same `(id, name, image_id, cc)` while the registry has room
+
+    """
+
+    __slots__ = ("id", "name", "image_id", "cc")
+
+    MAX_SHARED = 65536
+    _shared = {}
+
+    def __init__(self, id=None, name=None, image_id=None, cc=None):
+        """Constructor for MetaModel."""
+        self.id = id
+        self.name = name
+        self.image_id = image_id
+        self.cc = cc
+
+    @classmethod
+    def get(cls, data: Optional[dict]) -> Optional["MetaModel"]:
+        """Shared `MetaModel` for a payload `dict`."""
+        if not data:
+            return None
+
+        key = (
+            data.get("id"), data.get("name"),
+            data.get("image_id"), data.get("cc"),
+        )
+        meta = cls._shared.get(key)
+        if meta is None:
+            meta = cls(*key)
+            if len(cls._shared) < cls.MAX_SHARED:
+                cls._shared[key] = meta
+
+        return meta
+
+
+class EventModel(Model):
+    """Slotted fields common to every event style record."""
+
+    __slots__ = (
+        "id",
+        "sport_id",
+        "time",
+        "time_status",
+        "league",
+        "home",
+        "away",
+        "ss",
+    )
+
+    def __init__(self, data: dict):
+        """Constructor for EventModel."""
+        get = data.get
+        self.id = get("id")
+        self.sport_id = get("sport_id")
+        self.time = to_int(get("time"))
+        self.time_status = get("time_status")
+        self.league = MetaModel.get(get("league"))
+        self.home = MetaModel.get(get("home"))
+        self.away = MetaModel.get(get("away"))
+        self.ss = get("ss")
+
+    @property
+    def sport(self) -> Optional[Bet365SportId]:
+        """Access for `sport_id` as a `Bet365SportId` member."""
+        return Bet365SportId.from_sport_id(self.sport_id)
+
+
+class UpcomingEventModel(EventModel):
+    """Slotted model for `upcoming` records."""
+
+    __slots__ = ("our_event_id", "updated_at")
+
+    def __init__(self, data: dict):
+        """Constructor for UpcomingEventModel."""
+        super(UpcomingEventModel, self).__init__(data)
+        self.our_event_id = data.get("our_event_id")
+        self.updated_at = to_int(data.get("updated_at"))
+
+
+class ResultEventModel(Model):
+    """Slotted model for entries of `Result.events`."""
+
+    __slots__ = ("id", "text")
+
+    def __init__(self, id=None, text=None):
+        """Constructor for ResultEventModel."""
+        self.id = id
+        self.text = text
+
+
+class ResultModel(EventModel):
+    """
+    Slotted model for `result` records.
+
+    `timer`, `scores`, `stats` and `extra` keep their payload shape
+
+    """
+
+    __slots__ = (
+        "o_away",
+        "timer",
+        "scores",
+        "stats",
+        "extra",
+        "events",
+        "has_lineup",
+        "inplay_created_at",
+        "inplay_updated_at",
+        "confirmed_at",
+    )
+
+    def __init__(self, data: dict):
+        """Constructor for ResultModel."""
+        super(ResultModel, self).__init__(data)
+        get = data.get
+        self.o_away = MetaModel.get(get("o_away"))
+        self.timer = get("timer")
+        self.scores = get("scores")
+        self.stats = get("stats")
+        self.extra = get("extra")
+        self.events = self._events(get("events"))
+        self.has_lineup = to_int(get("has_lineup"))
+        self.inplay_created_at = to_int(get("inplay_created_at"))
+        self.inplay_updated_at = to_int(get("inplay_updated_at"))
+        self.confirmed_at = to_int(get("confirmed_at"))
+
+    @staticmethod
+    def _events(events) -> Optional[Tuple[ResultEventModel, ...]]:
+        """Decode `events` into a `tuple` of `ResultEventModel`."""
+        if not events:
+            return None
+
+        return tuple(
+            ResultEventModel(e.get("id"), e.get("text")) for e in events
+        )
+
+
+class FiModel(Model):
+    """Slotted model for "FI" based odds records."""
+
+    __slots__ = ("fi", "event_id", "main")
+
+    def __init__(self, data: dict):
+        """Constructor for FiModel."""
+        self.fi = data.get("FI")
+        self.event_id = data.get("event_id")
+        self.main = data.get("main")
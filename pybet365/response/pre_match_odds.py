@@ -17,6 +17,8 @@ The objects are accessible via dot notation or via `.get(..)`
 from typing import List, Union
 
 from pybet365.response.base import Bet365Response, FiResultBase
+from pybet365.response.markets import MarketTable, normalize_prematch
+from pybet365.response.models import FiModel
 
 
 class PreMatchOddsResponse(Bet365Response):
@@ -50,6 +52,8 @@ class PreMatchOddsResponse(Bet365Response):
 
     """
 
+    RECORD_FACADE = FiResultBase
+
     def __init__(self, data):
         """Constructor for PreMatchOddsResponse."""
         super(PreMatchOddsResponse, self).__init__(data)
@@ -65,3 +69,11 @@ class PreMatchOddsResponse(Bet365Response):
             parsed_results.append(FiResultBase(record))
 
         return parsed_results
+
+    def to_models(self) -> List[FiModel]:
+        """Compact `FiModel` objects for `results`."""
+        return FiModel.from_records(self._results)
+
+    def markets(self) -> MarketTable:
+        """Flat, indexed `MarketTable` of every selection."""
+        return normalize_prematch(self._results)
@@ -0,0 +1,385 @@
+"""
+Record Query DSL.
+
+Filters over raw records are compiled once into a single Python function
+(no facades, no property lookups), or into a vectorized mask when the
+data is already columnar (`MarketTable`, `bulk` column dicts)
+
+Filters are keyword arguments, `field__operator=value`:
+
+    field - a record key, `__` walks nested objects ("league__id"),
+        the aliases `league_id`, `league_name`, `home_id`, `home_name`,
+        `away_id`, `away_name`, `team` (home or away name) and `team_id`
+        (home or away id) cover the common cases
+
+    operator - `exact` (default), `ne`, `in`, `lt`, `lte`, `gt`, `gte`,
+        `between` (inclusive), `contains`, `icontains`, `startswith`,
+        `isnull` and `regex`
+
+Numeric operators (and numbers given to `exact`, `ne` and `in`) compare
+the record value as a `float`, `datetime` values become epoch seconds
+
+>>> response.query(league_id="94", time__between=(start, end))
+>>> response.query(time_status__in=("1", "2"), team__icontains="united")
+
+>>> recent = Query(time__gte=start)  # compile once, reuse
+>>> matching = [r for r in recent.filter(records)]
+
+"""
+import re
+
+from datetime import datetime
+from typing import Iterable, Iterator, List, Mapping, Union
+
+OPERATORS = frozenset((
+    "exact",
+    "ne",
+    "in",
+    "lt",
+    "lte",
+    "gt",
+    "gte",
+    "between",
+    "contains",
+    "icontains",
+    "startswith",
+    "isnull",
+    "regex",
+))
+
+NUMERIC_OPERATORS = frozenset(("lt", "lte", "gt", "gte", "between"))
+
+ALIASES = {
+    "league_id": (("league", "id"),),
+    "league_name": (("league", "name"),),
+    "home_id": (("home", "id"),),
+    "home_name": (("home", "name"),),
+    "away_id": (("away", "id"),),
+    "away_name": (("away", "name"),),
+    "team": (("home", "name"), ("away", "name")),
+    "team_id": (("home", "id"), ("away", "id")),
+}
+
+# NOTE: `{c}` is the constant of the condition, `n` the numeric value,
+# string operators never match non `str` values
+TEMPLATES = {
+    "exact": "v == {c}",
+    "ne": "v != {c}",
+    "in": "v in {c}",
+    "lt": "n is not None and n < {c}",
+    "lte": "n is not None and n <= {c}",
+    "gt": "n is not None and n > {c}",
+    "gte": "n is not None and n >= {c}",
+    "between": "n is not None and {c}[0] <= n <= {c}[1]",
+    "contains": "isinstance(v, str) and {c} in v",
+    "icontains": "isinstance(v, str) and {c} in v.lower()",
+    "startswith": "isinstance(v, str) and v.startswith({c})",
+    "isnull": "(v is None) is {c}",
+    "regex": "isinstance(v, str) and {c}.search(v) is not None",
+}
+
+NUMERIC_TEMPLATES = {
+    "exact": "n == {c}",
+    "ne": "n != {c}",
+    "in": "n in {c}",
+}
+
+
+def _num(value) -> Union[float, None]:
+    """Record value as a `float` (`None` when not numeric)."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _scalar(value):
+    """Filter value with `datetime` objects as epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+def _is_number(value) -> bool:
+    """`int` / `float` but not `bool`."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Condition(object):
+    """One compiled `field__operator=value` filter."""
+
+    __slots__ = ("name", "paths", "op", "value", "numeric", "test")
+
+    def __init__(self, name: str, value):
+        """Constructor for Condition."""
+        parts = name.split("__")
+        op = "exact"
+        if len(parts) > 1 and parts[-1] in OPERATORS:
+            op = parts.pop()
+        if len(parts) == 1 and parts[0] in ALIASES:
+            self.paths = ALIASES[parts[0]]
+        else:
+            self.paths = (tuple(parts),)
+
+        self.name = name
+        self.op = op
+        self.value, self.numeric = self._normalize(op, value)
+        self.test = self._compile_test()
+
+    @property
+    def expression(self) -> str:
+        """Python expression over `v` / `n` with the constant `c`."""
+        if self.numeric and self.op in NUMERIC_TEMPLATES:
+            return NUMERIC_TEMPLATES[self.op]
+        return TEMPLATES[self.op]
+
+    def _normalize(self, op: str, value):
+        """`(constant, numeric)` for `value`."""
+        if op == "between":
+            low, high = value
+            return (_to_number(self.name, low), _to_number(self.name, high)), \
+                True
+        if op in NUMERIC_OPERATORS:
+            return _to_number(self.name, value), True
+        if op == "in":
+            values = [_scalar(v) for v in value]
+            if values and all(_is_number(v) for v in values):
+                return frozenset(float(v) for v in values), True
+            return frozenset(str(v) for v in values), False
+        if op in ("exact", "ne"):
+            value = _scalar(value)
+            return value, _is_number(value)
+        if op == "icontains":
+            return str(value).lower(), False
+        if op == "isnull":
+            return bool(value), False
+        if op == "regex":
+            return re.compile(value) if isinstance(value, str) else value, \
+                False
+
+        return value, False
+
+    def _compile_test(self):
+        """Scalar `test(value) -> bool` built from `expression`."""
+        source = "def test(v):\n"
+        if self.numeric:
+            source += "    n = _num(v)\n"
+        source += "    return {}\n".format(self.expression.format(c="c"))
+        namespace = {"_num": _num, "c": self.value}
+        exec(compile(source, "<pybet365.query>", "exec"), namespace)
+
+        return namespace["test"]
+
+
+def _to_number(name: str, value) -> float:
+    """Numeric filter value, `ValueError` when it is not one."""
+    value = _scalar(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            "Filter {} expects a number or datetime, got {!r}".format(
+                name, value
+            )
+        )
+
+
+class Query(object):
+    """
+    Compiled record filter.
+
+    Calling the query tests one raw record, `filter` streams records in
+    a single pass and `mask` evaluates columnar data
+
+    Raises:
+        ValueError: when a numeric filter is given a non numeric value
+
+    """
+
+    def __init__(self, **filters):
+        """Constructor for Query."""
+        self.filters = filters
+        self.conditions = [
+            Condition(name, value) for name, value in sorted(filters.items())
+        ]
+        self._predicate = self._compile()
+
+    def __call__(self, record: dict) -> bool:
+        """`True` when `record` passes every filter."""
+        return self._predicate(record)
+
+    def __repr__(self) -> str:
+        """Readable filters."""
+        return "Query({})".format(", ".join(
+            "{}={!r}".format(name, value)
+            for name, value in sorted(self.filters.items())
+        ))
+
+    def filter(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Yield the raw records passing every filter."""
+        predicate = self._predicate
+        for record in records:
+            if predicate(record):
+                yield record
+
+    def mask(self, columns: Mapping[str, Iterable], size: int = None):
+        """
+        Evaluate the filters over columnar data.
+
+        Nested fields are looked up by their dotted name ("league.id"),
+        the layout produced by `flatten_record` and `bulk`
+
+        Args:
+            columns (Mapping[str, Iterable]): column name to values
+            size (int): row count, only needed when there are no filters
+
+        Returns:
+            mask: `numpy` boolean array when `numpy` is installed,
+                otherwise a `list` of `bool`
+
+        Raises:
+            KeyError: when a filtered column is missing
+
+        """
+        numpy = _optional_numpy()
+        if size is None:
+            size = len(next(iter(columns.values()))) if columns else 0
+
+        result = None
+        for condition in self.conditions:
+            matched = None
+            for path in condition.paths:
+                column = columns[".".join(path)]
+                if numpy is not None:
+                    hits = _vector(numpy, condition, column)
+                    matched = hits if matched is None else matched | hits
+                else:
+                    hits = [condition.test(v) for v in column]
+                    matched = hits if matched is None else [
+                        a or b for a, b in zip(matched, hits)
+                    ]
+            if result is None:
+                result = matched
+            elif numpy is not None:
+                result &= matched
+            else:
+                result = [a and b for a, b in zip(result, matched)]
+
+        if result is None:
+            return numpy.ones(size, dtype=bool) if numpy is not None \
+                else [True] * size
+
+        return result
+
+    def _compile(self):
+        """
+        Generate one predicate function over raw records.
+
+        NOTE: field names come from the caller (CLI arguments, ...), they
+        are bound as constants of the namespace and never formatted into
+        the generated source
+
+        """
+        lines = ["def predicate(r):"]
+        namespace = {"_num": _num}
+        for index, condition in enumerate(self.conditions):
+            constant = "c{}".format(index)
+            namespace[constant] = condition.value
+            expression = condition.expression.format(c=constant)
+            for alternative, path in enumerate(condition.paths):
+                indent = "    " if alternative == 0 else "        "
+                if alternative:
+                    lines.append("    if not ok:")
+                keys = []
+                for depth, key in enumerate(path):
+                    name = "k{}_{}_{}".format(index, alternative, depth)
+                    namespace[name] = key
+                    keys.append(name)
+                lines.append("{}v = r.get({})".format(indent, keys[0]))
+                for key in keys[1:]:
+                    lines.append(
+                        "{0}v = v.get({1}) if isinstance(v, dict) "
+                        "else None".format(indent, key)
+                    )
+                if condition.numeric:
+                    lines.append("{}n = _num(v)".format(indent))
+                lines.append("{}ok = {}".format(indent, expression))
+            lines.append("    if not ok:")
+            lines.append("        return False")
+        lines.append("    return True")
+
+        exec(compile("\n".join(lines), "<pybet365.query>", "exec"), namespace)
+
+        return namespace["predicate"]
+
+
+def _optional_numpy():
+    """`numpy` when installed, otherwise `None`."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def _vector(numpy, condition: Condition, column):
+    """Boolean `numpy` mask of one condition over one column."""
+    op, value = condition.op, condition.value
+    if condition.numeric:
+        values = numpy.asarray(column)
+        if values.dtype.kind not in "fiub":
+            values = numpy.array(
+                [_nan_if_none(_num(v)) for v in column], dtype=float
+            )
+        if op == "exact":
+            return values == value
+        if op == "ne":
+            return values != value
+        if op == "in":
+            return numpy.isin(values, list(value))
+        if op == "lt":
+            return values < value
+        if op == "lte":
+            return values <= value
+        if op == "gt":
+            return values > value
+        if op == "gte":
+            return values >= value
+        return (values >= value[0]) & (values <= value[1])
+
+    if op in ("exact", "ne"):
+        values = numpy.asarray(column, dtype=object)
+        return values == value if op == "exact" else values != value
+
+    test = condition.test
+    return numpy.fromiter(
+        (test(v) for v in column), dtype=bool, count=len(column)
+    )
+
+
+def _nan_if_none(value) -> float:
+    """`nan` for missing numeric values."""
+    return float("nan") if value is None else value
+
+
+def run_query(records: Iterable, query: Query, facade=None) -> List:
+    """
+    Records passing `query`, wrapped in `facade` after the match.
+
+    Nested lists (raw mnemonic bodies) are flattened
+
+    """
+    matched = []
+    append = matched.append
+    for record in records or []:
+        if isinstance(record, list):
+            for nested in record:
+                if query(nested):
+                    append(facade(nested) if facade else nested)
+        elif query(record):
+            append(facade(record) if facade else record)
+
+    return matched
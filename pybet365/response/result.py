@@ -17,6 +17,13 @@ The objects are accessible via dot notation or via `.get(..)`
 from typing import List, Union
 
 from pybet365.response.base import Bet365Response, MetaBase, ResultBase
+from pybet365.response.models import ResultModel
+from pybet365.response.timeline import (
+    Timeline,
+    TimelineEntry,
+    build_timeline,
+    parse_timeline,
+)
 
 
 class ResultEvent(dict):
@@ -106,6 +113,15 @@ class Result(ResultBase):
 
         return parsed_results
 
+    @property
+    def timeline(self) -> List[TimelineEntry]:
+        """Typed entries of `events`, parsed once per `Result`."""
+        timeline = getattr(self, "_timeline", None)
+        if timeline is None:
+            timeline = self._timeline = parse_timeline(self)
+
+        return timeline
+
     @property
     def has_lineup(self) -> str:
         """Access for `has_lineup`."""
@@ -158,6 +174,8 @@ class ResultResponse(Bet365Response):
 
     """
 
+    RECORD_FACADE = Result
+
     def __init__(self, data):
         """Constructor for ResultResponse."""
         super(ResultResponse, self).__init__(data)
@@ -168,8 +186,33 @@ class ResultResponse(Bet365Response):
         if not self._results:
             return None
 
-        parsed_results = []
-        for record in self._results:
-            parsed_results.append(Result(record))
+        return list(self._facades())
 
-        return parsed_results
+    def to_models(self) -> List[ResultModel]:
+        """Compact `ResultModel` objects for `results`."""
+        return ResultModel.from_records(self._results)
+
+    @property
+    def timeline(self) -> Timeline:
+        """
+        Column oriented `Timeline` of every result, built once.
+
+        Rows come from the same `Result` facades `results` returns, so
+        a `Result.timeline` already read is not parsed again
+
+        """
+        timeline = getattr(self, "_timeline", None)
+        if timeline is None:
+            timeline = self._timeline = build_timeline(self._facades())
+
+        return timeline
+
+    def _facades(self) -> List[Result]:
+        """`Result` facades of the raw records, built once."""
+        facades = getattr(self, "_result_facades", None)
+        if facades is None:
+            facades = self._result_facades = [
+                Result(record) for record in self._results or []
+            ]
+
+        return facades
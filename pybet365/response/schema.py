@@ -0,0 +1,491 @@
+"""
+Response Schema Validation.
+
+Every endpoint has a declarative schema, compiled once (on first use)
+into plain Python validator functions: one function per nested object
+with every scalar check inlined, so validating a page of records costs
+a few type checks per field instead of interpreting the schema per
+record
+
+Schema specs:
+
+    scalar - "str", "id" (str or int), "num" (int or float), "epoch"
+        (int or digit string), "object", "list" or "any", a trailing
+        "?" also allows `None`
+
+    dict - object with the listed keys (others are ignored), a trailing
+        "?" on a key makes it optional (missing or `None`), a "*" key
+        checks every unlisted value
+
+    list - `[spec]`, every item matches `spec`
+
+    tuple - `(spec, ...)`, one of the alternatives matches
+
+Modes:
+
+    strict - every payload is validated, failures raise
+        `SchemaValidationError` (tests, staging)
+
+    sample - one payload in `every` is validated, failures are counted
+        and handed to `on_error` instead of raising (production)
+
+    off - nothing is validated
+
+>>> client = Bet365(api_host="...", api_key="...", validate="strict")
+>>> client.upcoming_events(sport_id="1")  # raises on malformed payloads
+
+>>> validator = SchemaValidator("sample", every=100, on_error=report)
+>>> client = Bet365(api_host="...", api_key="...", validate=validator)
+
+"""
+import itertools
+import reprlib
+
+from typing import Callable, List, Optional
+
+MODES = ("off", "sample", "strict")
+
+# NOTE: `{v}` is the checked variable
+SCALARS = {
+    "str": "type({v}) is str",
+    "id": "(type({v}) is str or type({v}) is int)",
+    "num": "(type({v}) is int or type({v}) is float)",
+    "epoch": "(type({v}) is int or type({v}) is str and {v}.isdigit())",
+    "object": "isinstance({v}, dict)",
+    "list": "isinstance({v}, list)",
+    "any": None,
+}
+
+META = {"id": "id", "name": "str", "image_id?": "id", "cc?": "str"}
+
+PAGER = {"page": "num", "per_page": "num", "total": "num"}
+
+EVENT = {
+    "id": "id",
+    "sport_id": "id",
+    "time": "epoch",
+    "time_status": "id",
+    "league": META,
+    "home?": META,
+    "away?": META,
+    "ss?": "str",
+}
+
+UPCOMING = dict(EVENT, **{
+    "our_event_id?": "id",
+    "updated_at?": "epoch",
+})
+
+RESULT = dict(EVENT, **{
+    "timer?": {"tm?": "num", "ts?": "num", "tt?": "id", "ta?": "num"},
+    "scores?": {"*": {"home": "id", "away": "id"}},
+    "stats?": {"*": "list"},
+    "extra?": "object",
+    "events?": [{"id": "id", "text": "str"}],
+    "has_lineup?": "num",
+    "inplay_created_at?": "epoch",
+    "inplay_updated_at?": "epoch",
+    "confirmed_at?": "epoch",
+})
+
+SELECTION = {"id": "id", "odds": "str"}
+
+# NOTE: `sp` markets are objects with `odds`, or bare selection lists
+MARKET = ({"id?": "id", "name?": "str", "odds": [SELECTION]}, [SELECTION])
+
+PREMATCH = {
+    "FI": "id",
+    "event_id?": "id",
+    "*?": {"updated_at?": "epoch", "key?": "str", "sp?": {"*": MARKET}},
+}
+
+MNEMONIC = {"type": "str"}
+
+# NOTE: `results` records, as yielded by `Bet365.stream` (raw endpoints
+# flattened to their mnemonic records)
+RECORDS = {
+    "result": RESULT,
+    "inplay_filter": UPCOMING,
+    "event": MNEMONIC,
+    "prematch": PREMATCH,
+    "inplay": MNEMONIC,
+    "upcoming": UPCOMING,
+}
+
+RAW_ENDPOINTS = frozenset(("event", "inplay"))
+
+
+def envelope(endpoint: str) -> dict:
+    """Payload schema of `endpoint`."""
+    record = RECORDS[endpoint]
+    if endpoint in RAW_ENDPOINTS:
+        # NOTE: raw bodies nest the mnemonic records of each event
+        record = ([record], record)
+
+    return {"success": "num", "results": [record], "pager?": PAGER}
+
+
+class _Missing(object):
+    """Marker for absent required keys."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        """Shown as the offending value."""
+        return "nothing"
+
+
+_MISSING = _Missing()
+
+
+class SchemaValidationError(ValueError):
+    """Raised when a payload does not match its endpoint schema."""
+
+    def __init__(self, endpoint: str, path: str, expected: str, value):
+        """Constructor for SchemaValidationError."""
+        super(SchemaValidationError, self).__init__(
+            "{}: {} expected {}, got {}".format(
+                endpoint, path or "<root>", expected, reprlib.repr(value)
+            )
+        )
+        self.endpoint = endpoint
+        self.path = path
+        self.expected = expected
+        self.value = value
+
+
+class _Invalid(Exception):
+    """Internal failure, the path is collected while unwinding."""
+
+    def __init__(self, expected: str, value, *path):
+        """Constructor for _Invalid."""
+        super(_Invalid, self).__init__(expected)
+        self.expected = expected
+        self.value = value
+        self.path = list(path)
+
+
+def describe(spec) -> str:
+    """Readable type of `spec`."""
+    if isinstance(spec, str):
+        return spec
+    if isinstance(spec, dict):
+        return "object"
+    if isinstance(spec, list):
+        return "list"
+
+    return " | ".join(describe(alternative) for alternative in spec)
+
+
+def format_path(segments: List) -> str:
+    """`results[3].league.id` for segments collected innermost first."""
+    path = ""
+    for segment in reversed(segments):
+        if isinstance(segment, int):
+            path += "[{}]".format(segment)
+        else:
+            path += ".{}".format(segment)
+
+    return path.lstrip(".")
+
+
+class _Compiler(object):
+    """Generates the validator functions of one schema."""
+
+    def __init__(self):
+        """Constructor for _Compiler."""
+        self.namespace = {"_Invalid": _Invalid, "_MISSING": _MISSING}
+        self.sources = []
+        self._names = {}
+
+    def function(self, spec) -> str:
+        """Name of the generated `check(value)` for `spec`."""
+        key = spec if isinstance(spec, str) else id(spec)
+        name = self._names.get(key)
+        if name is not None:
+            return name
+
+        name = self._names[key] = "_v{}".format(len(self._names))
+        lines = ["def {}(value):".format(name)]
+        if isinstance(spec, dict):
+            self._object(lines, spec)
+        elif isinstance(spec, list):
+            lines.append("    if not isinstance(value, list):")
+            lines.append('        raise _Invalid("list", value)')
+            lines.append("    for i, v in enumerate(value):")
+            self._check(lines, spec[0], "        ", "i")
+        elif isinstance(spec, tuple):
+            # NOTE: the alternative failing deepest is the one the value
+            # was meant to match, its error points at the actual problem
+            alternatives = ", ".join(self.function(s) for s in spec)
+            lines.append("    deepest = None")
+            lines.append("    for check in ({},):".format(alternatives))
+            lines.append("        try:")
+            lines.append("            return check(value)")
+            lines.append("        except _Invalid as exc:")
+            lines.append("            if deepest is None or (")
+            lines.append("                len(exc.path) > len(deepest.path)")
+            lines.append("            ):")
+            lines.append("                deepest = exc")
+            lines.append("    if deepest.path:")
+            lines.append("        raise deepest")
+            lines.append("    raise _Invalid({!r}, value)".format(
+                describe(spec)
+            ))
+        else:
+            lines.append("    v = value")
+            self._check(lines, spec, "    ", None)
+        self.sources.append("\n".join(lines))
+
+        return name
+
+    def _object(self, lines: List[str], spec: dict) -> None:
+        """Body checking the keys of an object."""
+        lines.append("    if not isinstance(value, dict):")
+        lines.append('        raise _Invalid("object", value)')
+        lines.append("    get = value.get")
+        known = set()
+        rest = None
+        for key, sub in spec.items():
+            optional = key.endswith("?")
+            name = key[:-1] if optional else key
+            if name == "*":
+                rest = optional, sub
+                continue
+            known.add(name)
+            if optional:
+                lines.append("    v = get({!r})".format(name))
+                lines.append("    if v is not None:")
+                self._check(lines, sub, "        ", repr(name))
+            else:
+                lines.append("    v = get({!r}, _MISSING)".format(name))
+                lines.append("    if v is _MISSING:")
+                lines.append("        raise _Invalid({!r}, v, {!r})".format(
+                    describe(sub), name
+                ))
+                self._check(lines, sub, "    ", repr(name))
+
+        if rest is not None:
+            optional, sub = rest
+            constant = "_k{}".format(len(self.namespace))
+            self.namespace[constant] = frozenset(known)
+            lines.append("    for k, v in value.items():")
+            lines.append("        if k in {}{}:".format(
+                constant, " or v is None" if optional else ""
+            ))
+            lines.append("            continue")
+            self._check(lines, sub, "        ", "k")
+
+    def _check(
+        self, lines: List[str], spec, indent: str, segment: Optional[str]
+    ) -> None:
+        """Statements checking `v` against `spec`, `segment` being the
+        expression of its path segment."""
+        path = "" if segment is None else ", " + segment
+        if isinstance(spec, str):
+            nullable = spec.endswith("?")
+            test = SCALARS[spec.rstrip("?")]
+            if test is None:
+                return
+            test = test.format(v="v")
+            if nullable:
+                test = "v is None or " + test
+            lines.append("{}if not ({}):".format(indent, test))
+            lines.append("{}    raise _Invalid({!r}, v{})".format(
+                indent, spec, path
+            ))
+            return
+
+        name = self.function(spec)
+        if segment is None:
+            lines.append("{}{}(v)".format(indent, name))
+            return
+        lines.append("{}try:".format(indent))
+        lines.append("{}    {}(v)".format(indent, name))
+        lines.append("{}except _Invalid as exc:".format(indent))
+        lines.append("{}    exc.path.append({})".format(indent, segment))
+        lines.append("{}    raise".format(indent))
+
+
+def compile_schema(spec, endpoint: str = "payload") -> Callable:
+    """
+    Compile `spec` into a `validate(value) -> value` function.
+
+    Args:
+        spec: schema spec (see module docstring)
+        endpoint (str): name used in error messages
+
+    Returns:
+        Callable: validator raising `SchemaValidationError`
+
+    """
+    compiler = _Compiler()
+    root = compiler.function(spec)
+    source = "\n\n".join(compiler.sources)
+    exec(compile(source, "<pybet365.schema>", "exec"), compiler.namespace)
+    check = compiler.namespace[root]
+
+    def validate(value):
+        try:
+            check(value)
+        except _Invalid as exc:
+            raise SchemaValidationError(
+                endpoint, format_path(exc.path), exc.expected, exc.value
+            )
+        return value
+
+    return validate
+
+
+class SchemaValidator(object):
+    """
+    Validates decoded payloads against their endpoint schema.
+
+    Args:
+        mode (str): "strict", "sample" or "off"
+        every (int): validate one payload in `every` in "sample" mode
+        on_error (Optional[Callable]): called with the
+            `SchemaValidationError` of a sampled payload
+        schemas (Optional[dict]): endpoint to payload spec overrides
+
+    Raises:
+        ValueError: for an unknown `mode` or `every` below 1
+
+    """
+
+    __slots__ = (
+        "mode",
+        "every",
+        "on_error",
+        "schemas",
+        "validated",
+        "failures",
+        "last_error",
+        "_ticks",
+        "_validators",
+    )
+
+    def __init__(
+        self,
+        mode: str = "strict",
+        every: int = 100,
+        on_error: Optional[Callable] = None,
+        schemas: Optional[dict] = None,
+    ):
+        """Constructor for SchemaValidator."""
+        if mode not in MODES:
+            raise ValueError("Unknown validation mode: {}".format(mode))
+        if every < 1:
+            raise ValueError("`every` must be at least 1")
+        self.mode = mode
+        self.every = every if mode == "sample" else 1
+        self.on_error = on_error
+        self.schemas = schemas or {}
+        self.validated = 0
+        self.failures = 0
+        self.last_error = None
+        self._ticks = itertools.count()
+        self._validators = {}
+
+    def _sampled(self) -> bool:
+        """`True` when the next payload is to be validated."""
+        if self.mode == "off":
+            return False
+
+        # NOTE: `next` on `itertools.count` is atomic, no lock needed
+        return self.every == 1 or next(self._ticks) % self.every == 0
+
+    def _compiled(self, key: tuple) -> Optional[Callable]:
+        """Validator for `(kind, endpoint)`, compiled on first use."""
+        validate = self._validators.get(key)
+        if validate is None and key not in self._validators:
+            kind, endpoint = key
+            spec = None
+            if kind == "payload":
+                if endpoint in self.schemas:
+                    spec = self.schemas[endpoint]
+                elif endpoint in RECORDS:
+                    spec = envelope(endpoint)
+            else:
+                spec = RECORDS.get(endpoint)
+            if spec is not None:
+                validate = compile_schema(spec, endpoint)
+            self._validators[key] = validate
+
+        return validate
+
+    def _run(self, validate: Callable, value) -> None:
+        """Validate `value`, raising only in "strict" mode."""
+        self.validated += 1
+        try:
+            validate(value)
+        except SchemaValidationError as exc:
+            self.failures += 1
+            self.last_error = exc
+            if self.mode == "strict":
+                raise
+            if self.on_error is not None:
+                self.on_error(exc)
+
+    def validate(self, endpoint: str, payload):
+        """
+        Validate a decoded `payload` of `endpoint` (when sampled).
+
+        Endpoints without a schema pass unchecked
+
+        Returns:
+            payload: `payload` itself
+
+        Raises:
+            SchemaValidationError: in "strict" mode
+
+        """
+        if self._sampled():
+            validate = self._compiled(("payload", endpoint))
+            if validate is not None:
+                self._run(validate, payload)
+
+        return payload
+
+    def record_validator(self, endpoint: str) -> Optional[Callable]:
+        """
+        `check(record)` for the streamed records of one response.
+
+        Sampling applies per response: `None` when this one is skipped
+        or `endpoint` has no record schema
+
+        """
+        if not self._sampled():
+            return None
+
+        validate = self._compiled(("record", endpoint))
+        if validate is None:
+            return None
+
+        return lambda record: self._run(validate, record)
+
+    def stats(self) -> dict:
+        """Validation counters."""
+        return {
+            "mode": self.mode,
+            "validated": self.validated,
+            "failures": self.failures,
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+    @classmethod
+    def build(cls, validate) -> Optional["SchemaValidator"]:
+        """
+        Validator for a client `validate` argument.
+
+        Args:
+            validate (Union[str, SchemaValidator, None]): mode, ready
+                validator or `None` ("off")
+
+        """
+        if validate is None or validate == "off":
+            return None
+        if isinstance(validate, SchemaValidator):
+            return validate
+
+        return cls(validate)
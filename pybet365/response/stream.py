@@ -0,0 +1,260 @@
+"""
+Streaming `results` Parser.
+
+Parses the top level `results` array of a Bet365 response incrementally
+so records can be yielded while the body is still downloading. Only the
+unconsumed tail of the body (at most one partial record) is buffered,
+so peak memory and time to first record do not grow with the response
+
+    {"success": 1, "pager": {...}, "results": [ {...}, {...}, ... ]}
+
+Raw Bet365 bodies nest records one level deeper (`[[{...}, ...]]`),
+nested arrays are descended into and their records yielded one by one
+
+>>> parser = ResultsStreamParser()
+>>> for chunk in chunks:
+...     for record in parser.feed(chunk):
+...         handle(record)
+>>> parser.close()
+>>> parser.header
+>>> {"success": 1}
+
+"""
+import codecs
+import json
+import re
+
+from typing import Callable, Iterable, Iterator, List, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Parser states
+_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_AFTER_VALUE = 4
+_ITEM = 5
+_AFTER_ITEM = 6
+_NESTED_ITEM = 7
+_AFTER_NESTED_ITEM = 8
+_DONE = 9
+
+
+class ResultsStreamParser(object):
+    """
+    Incremental parser for the `results` array of a response body.
+
+    Args:
+        key (str): top level key holding the records
+        object_hook (Optional[Callable]): `json` object hook for records
+            and header values (e.g. `InternTable.object_hook`)
+        flatten_nested (bool): yield the records of nested arrays
+            instead of the arrays themselves
+
+    """
+
+    def __init__(
+        self,
+        key: str = "results",
+        object_hook: Optional[Callable] = None,
+        flatten_nested: bool = True,
+    ):
+        """Constructor for ResultsStreamParser."""
+        self.key = key
+        self.flatten_nested = flatten_nested
+        self.header = {}
+        self.count = 0
+        self._decoder = json.JSONDecoder(object_hook=object_hook)
+        self._buffer = ""
+        self._state = _START
+        self._current_key = None
+
+    def feed(self, chunk: str, final: bool = False) -> List:
+        """
+        Consume `chunk` of text.
+
+        Args:
+            chunk (str): next piece of the body
+            final (bool): no more data will follow
+
+        Returns:
+            records (List): records completed by this chunk
+
+        Raises:
+            ValueError: for malformed bodies
+
+        """
+        buf = self._buffer + chunk if self._buffer else chunk
+        pos = 0
+        end = len(buf)
+        records = []
+        decode = self._decoder.raw_decode
+        skip = _WHITESPACE.match
+
+        while True:
+            pos = skip(buf, pos).end()
+            if pos >= end:
+                break
+
+            state = self._state
+            char = buf[pos]
+
+            if state == _START:
+                if char != "{":
+                    raise ValueError("Expected '{{' at offset {}".format(pos))
+                pos += 1
+                self._state = _KEY
+
+            elif state == _KEY:
+                if char == "}":
+                    pos += 1
+                    self._state = _DONE
+                    continue
+                try:
+                    key, value_end = decode(buf, pos)
+                except ValueError:
+                    break
+                pos = value_end
+                self._current_key = key
+                self._state = _COLON
+
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError("Expected ':' at offset {}".format(pos))
+                pos += 1
+                self._state = _VALUE
+
+            elif state == _VALUE:
+                if char == "[" and self._current_key == self.key:
+                    pos += 1
+                    self._state = _ITEM
+                    continue
+                value, value_end = self._decode(buf, pos, final)
+                if value_end is None:
+                    break
+                pos = value_end
+                self.header[self._current_key] = value
+                self._state = _AFTER_VALUE
+
+            elif state == _AFTER_VALUE:
+                pos += 1
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise ValueError(
+                        "Unexpected {!r} at offset {}".format(char, pos - 1)
+                    )
+
+            elif state in (_ITEM, _NESTED_ITEM):
+                nested = state == _NESTED_ITEM
+                if char == "]":
+                    pos += 1
+                    self._state = _AFTER_ITEM if nested else _AFTER_VALUE
+                    continue
+                if char == "[" and not nested and self.flatten_nested:
+                    pos += 1
+                    self._state = _NESTED_ITEM
+                    continue
+                record, value_end = self._decode(buf, pos, final)
+                if value_end is None:
+                    break
+                pos = value_end
+                records.append(record)
+                self.count += 1
+                self._state = _AFTER_NESTED_ITEM if nested else _AFTER_ITEM
+
+            elif state in (_AFTER_ITEM, _AFTER_NESTED_ITEM):
+                nested = state == _AFTER_NESTED_ITEM
+                pos += 1
+                if char == ",":
+                    self._state = _NESTED_ITEM if nested else _ITEM
+                elif char == "]":
+                    self._state = _AFTER_ITEM if nested else _AFTER_VALUE
+                else:
+                    raise ValueError(
+                        "Unexpected {!r} at offset {}".format(char, pos - 1)
+                    )
+
+            else:
+                raise ValueError("Trailing data at offset {}".format(pos))
+
+        self._buffer = buf[pos:]
+
+        return records
+
+    def close(self) -> List:
+        """
+        Flush the remaining buffer at the end of the body.
+
+        Raises:
+            ValueError: when the body was truncated or malformed
+
+        """
+        records = self.feed("", final=True)
+        if self._state != _DONE or self._buffer.strip():
+            raise ValueError("Truncated response body")
+
+        return records
+
+    def _decode(self, buf: str, pos: int, final: bool):
+        """
+        Decode one value at `pos`.
+
+        Returns `(value, None)` when more data is needed: either the
+        value is incomplete or it ends exactly at the end of the buffer
+        (a number such as `1` may continue in the next chunk)
+
+        """
+        try:
+            value, end = self._decoder.raw_decode(buf, pos)
+        except ValueError:
+            if final:
+                raise
+            return None, None
+
+        if end >= len(buf) and not final:
+            return None, None
+
+        return value, end
+
+
+def iter_results(
+    chunks: Iterable[bytes],
+    key: str = "results",
+    object_hook: Optional[Callable] = None,
+    flatten_nested: bool = True,
+    encoding: str = "utf-8",
+    header: Optional[dict] = None,
+) -> Iterator:
+    """
+    Yield the records of a response body from an iterable of byte chunks.
+
+    Args:
+        chunks (Iterable[bytes]): body chunks (e.g. `iter_content()`)
+        key (str): top level key holding the records
+        object_hook (Optional[Callable]): `json` object hook
+        flatten_nested (bool): descend into nested record arrays
+        encoding (str): body encoding
+        header (Optional[dict]): filled with the other top level keys
+
+    """
+    parser = ResultsStreamParser(
+        key=key, object_hook=object_hook, flatten_nested=flatten_nested
+    )
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        for record in parser.feed(text):
+            yield record
+
+    for record in parser.feed(decoder.decode(b"", final=True)):
+        yield record
+    for record in parser.close():
+        yield record
+
+    if header is not None:
+        header.update(parser.header)
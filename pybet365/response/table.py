@@ -0,0 +1,91 @@
+"""
+Column Oriented Tables.
+
+`ColumnTable` is the base of the array backed tables (`MarketTable`,
+`Timeline`): one attribute per column, string columns as `list`
+objects and `NUMERIC` columns as `array("d")` (`nan` marks a missing
+value), with row numbers indexed as `array("l")` by the subclasses
+
+Rows come out as `dict` objects, through index lookups (`select` of the
+subclass), a vectorized `query` or a full scan
+
+"""
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from pybet365.response.query import Query
+
+NAN = float("nan")
+
+
+class ColumnTable(object):
+    """Base of column oriented tables declaring `COLUMNS`."""
+
+    COLUMNS = ()
+
+    NUMERIC = frozenset()
+
+    def __init__(self):
+        """Constructor for ColumnTable."""
+        for name in self.COLUMNS:
+            setattr(self, name, array("d") if name in self.NUMERIC else [])
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(getattr(self, self.COLUMNS[0]))
+
+    def columns(self) -> dict:
+        """Column name to column (no copy)."""
+        return dict((name, getattr(self, name)) for name in self.COLUMNS)
+
+    def row(self, index: int) -> dict:
+        """Row `index` as a `dict`."""
+        return dict(
+            (name, getattr(self, name)[index]) for name in self.COLUMNS
+        )
+
+    def rows(self, indexes: Iterable[int]) -> List[dict]:
+        """Rows `indexes` as `dict` objects."""
+        return [self.row(i) for i in indexes]
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate every row as a `dict`."""
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_columns(self) -> dict:
+        """Column name to `list` of values."""
+        return dict((name, list(getattr(self, name))) for name in self.COLUMNS)
+
+    def query(self, query: Optional[Query] = None, **filters) -> List[dict]:
+        """
+        Rows matching `filters`, evaluated as a vectorized column mask.
+
+        Returns:
+            rows (List[dict]): matching rows in table order
+
+        """
+        if query is None:
+            query = Query(**filters)
+        mask = query.mask(self.columns(), size=len(self))
+
+        return [self.row(i) for i, hit in enumerate(mask) if hit]
+
+    def _match(self, *candidates: Optional[array]) -> Iterable[int]:
+        """
+        Row numbers present in every given index lookup.
+
+        `None` candidates are unconstrained, the first given one keeps
+        its (table) order
+
+        """
+        given = [rows for rows in candidates if rows is not None]
+        if not given:
+            return range(len(self))
+
+        first, others = given[0], given[1:]
+        if not others:
+            return first
+
+        wanted = [set(rows) for rows in others]
+        return [i for i in first if all(i in rows for rows in wanted)]
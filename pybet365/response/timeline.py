@@ -0,0 +1,372 @@
+"""
+Result Timeline Parsing.
+
+`result` records carry their timeline as free text `events`:
+
+    {"id": "8800000001", "text": "23' - 1st Goal - Player (Home Team) -"}
+
+    {"id": "8800000002", "text": "27' - 2nd Corner - Away Team"}
+
+    {"id": "8800000003", "text": "90+2' - 3rd Yellow Card -   (Away Team)"}
+
+    {"id": "8800000004", "text": "Score After First Half - 1-0"}
+
+`TimelineParser` turns each line into a typed `TimelineEntry` (minute,
+added time, kind, ordinal, home / away side, team, player, score) with
+regular expressions compiled once per sport: sports with a known event
+vocabulary (soccer, futsal, ice hockey) only accept those kinds, other
+sports accept any "<nth> <Kind>". Lines matching no pattern become kind
+"other" with their text kept
+
+`Result.timeline` parses once per `Result`, `ResultResponse.timeline`
+lays every record out as a column oriented `Timeline` for bulk use
+
+>>> timeline = client.result(event_id="88000001").timeline
+>>> timeline.select(kind="goal")
+>>> [{"event_id": "88000001", "minute": 23.0, "side": "home", ...}]
+
+"""
+import re
+
+from array import array
+from typing import Iterable, List, Optional
+
+from pybet365.response.models import Model
+from pybet365.response.table import NAN, ColumnTable
+
+SOCCER_KINDS = (
+    "Goal",
+    "Own Goal",
+    "Penalty",
+    "Missed Penalty",
+    "Corner",
+    "Yellow Card",
+    "Red Card",
+    "Substitution",
+)
+
+# NOTE: sport_id to the event kinds of its feed, sports missing here
+# accept any kind
+SPORT_KINDS = {
+    "1": SOCCER_KINDS,
+    "83": SOCCER_KINDS,
+    "17": ("Goal", "Penalty"),
+}
+
+EVENT_PATTERN = (
+    r"^(?P<minute>\d+)(?:\+(?P<stoppage>\d+))?' - "
+    r"(?P<ordinal>\d+)(?:st|nd|rd|th) (?P<kind>{kinds}) -\s*(?P<rest>.*)$"
+)
+
+ANY_KIND = r"[A-Za-z][A-Za-z ]*?"
+
+SCORE = re.compile(
+    r"^Score After (?P<period>.+?) - (?P<home>\d+)-(?P<away>\d+)$"
+)
+
+# NOTE: "Player (Team) -", "  (Team)" or a bare "Team"
+PARTICIPANT = re.compile(r"^(?P<player>[^()]*?)\s*\((?P<team>[^()]*)\)")
+
+
+def _kind(name: str) -> str:
+    """Normalized kind, "Yellow Card" becomes "yellow_card"."""
+    return name.strip().lower().replace(" ", "_")
+
+
+class TimelineEntry(Model):
+    """
+    Slotted, typed timeline line of a `Result`.
+
+    `minute`, `stoppage` and `ordinal` are `None` for score lines,
+    `home_score` / `away_score` / `period` only set on score lines
+
+    """
+
+    __slots__ = (
+        "id",
+        "minute",
+        "stoppage",
+        "kind",
+        "ordinal",
+        "side",
+        "team",
+        "player",
+        "home_score",
+        "away_score",
+        "period",
+        "text",
+    )
+
+    def __init__(
+        self, id=None, minute=None, stoppage=None, kind="other",
+        ordinal=None, side=None, team=None, player=None, home_score=None,
+        away_score=None, period=None, text=None,
+    ):
+        """Constructor for TimelineEntry."""
+        self.id = id
+        self.minute = minute
+        self.stoppage = stoppage
+        self.kind = kind
+        self.ordinal = ordinal
+        self.side = side
+        self.team = team
+        self.player = player
+        self.home_score = home_score
+        self.away_score = away_score
+        self.period = period
+        self.text = text
+
+
+class TimelineParser(object):
+    """
+    Event text parser of one sport.
+
+    Args:
+        sport_id (Optional[str]): sport whose vocabulary applies
+
+    """
+
+    __slots__ = ("sport_id", "event")
+
+    def __init__(self, sport_id: Optional[str] = None):
+        """Constructor for TimelineParser."""
+        kinds = SPORT_KINDS.get(sport_id)
+        if kinds is None:
+            pattern = ANY_KIND
+        else:
+            # NOTE: longest first, "Own Goal" must win over "Goal"
+            pattern = "|".join(
+                re.escape(kind) for kind in sorted(kinds, key=len)[::-1]
+            )
+        self.sport_id = sport_id
+        self.event = re.compile(EVENT_PATTERN.format(kinds=pattern))
+
+    def parse(
+        self,
+        text: Optional[str],
+        id: Optional[str] = None,
+        home: Optional[str] = None,
+        away: Optional[str] = None,
+    ) -> TimelineEntry:
+        """
+        Typed entry of one event `text`.
+
+        Args:
+            text (Optional[str]): `text` of the event
+            id (Optional[str]): `id` of the event
+            home (Optional[str]): home team name, resolves `side`
+            away (Optional[str]): away team name, resolves `side`
+
+        """
+        text = text or ""
+        match = self.event.match(text)
+        if match is not None:
+            minute, stoppage, ordinal, kind, rest = match.group(
+                "minute", "stoppage", "ordinal", "kind", "rest"
+            )
+            player = None
+            participant = PARTICIPANT.match(rest)
+            if participant is None:
+                team = rest.strip(" -")
+            else:
+                player, team = participant.group("player", "team")
+                player, team = player.strip() or None, team.strip()
+            team = team or None
+
+            return TimelineEntry(
+                id=id,
+                minute=int(minute),
+                stoppage=int(stoppage) if stoppage else None,
+                kind=_kind(kind),
+                ordinal=int(ordinal),
+                side=_side(team, home, away),
+                team=team,
+                player=player,
+                text=text,
+            )
+
+        match = SCORE.match(text)
+        if match is not None:
+            return TimelineEntry(
+                id=id,
+                kind="score",
+                home_score=int(match.group("home")),
+                away_score=int(match.group("away")),
+                period=match.group("period"),
+                text=text,
+            )
+
+        return TimelineEntry(id=id, text=text)
+
+    def parse_events(
+        self,
+        events: Optional[Iterable[dict]],
+        home: Optional[str] = None,
+        away: Optional[str] = None,
+    ) -> List[TimelineEntry]:
+        """Entries of a raw `events` array, in feed order."""
+        parse = self.parse
+        return [
+            parse(event.get("text"), event.get("id"), home, away)
+            for event in events or ()
+        ]
+
+
+_PARSERS = {}
+
+
+def parser_for(sport_id: Optional[str]) -> TimelineParser:
+    """Shared `TimelineParser` of `sport_id`."""
+    parser = _PARSERS.get(sport_id)
+    if parser is None:
+        parser = _PARSERS[sport_id] = TimelineParser(sport_id)
+
+    return parser
+
+
+def _side(team: Optional[str], home: Optional[str], away: Optional[str]):
+    """Side ("home" / "away") of `team`, `None` when unknown."""
+    if team is None:
+        return None
+    if team == home:
+        return "home"
+    if team == away:
+        return "away"
+
+    folded = team.casefold()
+    if home is not None and folded == home.casefold():
+        return "home"
+    if away is not None and folded == away.casefold():
+        return "away"
+
+    return None
+
+
+def _name(record: dict, side: str) -> Optional[str]:
+    """`name` of the `home` / `away` object of a raw record."""
+    team = record.get(side)
+
+    return team.get("name") if isinstance(team, dict) else None
+
+
+def parse_timeline(record: dict) -> List[TimelineEntry]:
+    """Timeline entries of one raw `result` record."""
+    return parser_for(record.get("sport_id")).parse_events(
+        record.get("events"), _name(record, "home"), _name(record, "away")
+    )
+
+
+class Timeline(ColumnTable):
+    """
+    Column oriented timeline of many results.
+
+    String columns are `list` objects, numeric columns are `array("d")`
+    (`nan` marks a missing value)
+
+    """
+
+    COLUMNS = (
+        "event_id",
+        "entry_id",
+        "minute",
+        "stoppage",
+        "kind",
+        "ordinal",
+        "side",
+        "team",
+        "player",
+        "home_score",
+        "away_score",
+        "period",
+    )
+
+    NUMERIC = frozenset((
+        "minute", "stoppage", "ordinal", "home_score", "away_score",
+    ))
+
+    def __init__(self):
+        """Constructor for Timeline."""
+        super(Timeline, self).__init__()
+        self._by_event = {}
+        self._by_kind = {}
+
+    def append(self, event_id: Optional[str], entry: TimelineEntry) -> int:
+        """Append one entry of result `event_id` and index it."""
+        row = len(self.entry_id)
+        self.event_id.append(event_id)
+        self.entry_id.append(entry.id)
+        self.kind.append(entry.kind)
+        self.side.append(entry.side)
+        self.team.append(entry.team)
+        self.player.append(entry.player)
+        self.period.append(entry.period)
+        for name in ("minute", "stoppage", "ordinal", "home_score",
+                     "away_score"):
+            value = getattr(entry, name)
+            getattr(self, name).append(NAN if value is None else value)
+
+        self._by_event.setdefault(event_id, array("l")).append(row)
+        self._by_kind.setdefault(entry.kind, array("l")).append(row)
+
+        return row
+
+    def kinds(self) -> List[str]:
+        """Every indexed entry kind."""
+        return list(self._by_kind)
+
+    def event_rows(self, event_id: str) -> array:
+        """Row numbers of result `event_id`."""
+        return self._by_event.get(event_id, array("l"))
+
+    def kind_rows(self, kind: str) -> array:
+        """Row numbers of `kind` ("goal", "corner", "score", ...)."""
+        return self._by_kind.get(kind, array("l"))
+
+    def select(
+        self, kind: Optional[str] = None, event_id: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Rows matching `kind` and/or `event_id` (index lookups, no scan).
+
+        Returns:
+            rows (List[dict]): matching rows in table order
+
+        """
+        return self.rows(self._match(
+            None if event_id is None else self.event_rows(event_id),
+            None if kind is None else self.kind_rows(kind),
+        ))
+
+
+def build_timeline(response, table: Optional[Timeline] = None) -> Timeline:
+    """
+    Lay the timelines of `result` records out as a `Timeline`.
+
+    `Result` records whose `Result.timeline` was already read are not
+    parsed again (raw `dict` records always are)
+
+    Args:
+        response: `ResultResponse`, raw payload `dict` or an iterable of
+            records
+        table (Optional[Timeline]): table to append to
+
+    Returns:
+        table (Timeline): one row per timeline entry
+
+    """
+    table = table if table is not None else Timeline()
+    if isinstance(response, dict):
+        records = response.get("results") or []
+    else:
+        records = response or []
+
+    append = table.append
+    for record in records:
+        entries = getattr(record, "_timeline", None)
+        if entries is None:
+            entries = parse_timeline(record)
+        event_id = record.get("id")
+        for entry in entries:
+            append(event_id, entry)
+
+    return table
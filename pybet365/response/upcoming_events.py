@@ -17,6 +17,7 @@ The objects are accessible via dot notation or via `.get(..)`
 from typing import List, Union
 
 from pybet365.response.base import Bet365Response, PagerBase, ResultBase
+from pybet365.response.models import UpcomingEventModel
 
 
 class UpcomingEvent(ResultBase):
@@ -91,10 +92,12 @@ class UpcomingEventsResponse(Bet365Response):
 
     """
 
+    RECORD_FACADE = UpcomingEvent
+
     def __init__(self, data):
         """Constructor for UpcomingEventsResponse."""
         super(UpcomingEventsResponse, self).__init__(data)
-        self.pager = PagerBase(data.get("pager"))
+        self.pager = PagerBase(data.get("pager") or {})
 
     @property
     def results(self) -> Union[List[UpcomingEvent], None]:
@@ -107,3 +110,7 @@ class UpcomingEventsResponse(Bet365Response):
             parsed_results.append(UpcomingEvent(record))
 
         return parsed_results
+
+    def to_models(self) -> List[UpcomingEventModel]:
+        """Compact `UpcomingEventModel` objects for `results`."""
+        return UpcomingEventModel.from_records(self._results)
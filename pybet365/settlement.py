@@ -0,0 +1,452 @@
+"""
+Settlement Watcher.
+
+Tracks open events until the `result` endpoint reports a final
+`time_status`, without polling every open event on every cycle:
+
+    schedule - open events sit in a min-heap keyed by the time they are
+        expected to be over (kick-off `time` plus a per sport duration),
+        only due events are polled
+
+    re-estimate - an unfinished event is rescheduled from its live
+        `Result.timer` (remaining regulation minutes) when it has one,
+        otherwise with an exponential back-off
+
+    batching - due events are fetched `batch_size` at a time with one
+        comma separated `event_id` call
+
+    emit once - a final `Result` is returned (and passed to
+        `on_settled`) exactly once, settled ids are remembered
+
+    persistence - open and settled events are saved to a JSON state file
+        (atomically) and reloaded on start
+
+Final statuses are "3" (ended) to "9" and "99" (removed)
+
+>>> watcher = SettlementWatcher(client, path="settlement.json")
+>>> watcher.track_events(client.upcoming_events(sport_id="1").results)
+>>> for result in watcher.poll():
+...     settle(result.id, result.ss)
+>>> watcher.save()
+
+"""
+import heapq
+import json
+import os
+import threading
+import time
+
+from typing import Callable, Iterable, List, Optional
+
+from pybet365.export import records_of
+from pybet365.response.result import Result
+
+FINAL_STATUSES = frozenset(("3", "4", "5", "6", "7", "8", "9", "99"))
+
+# NOTE: seconds from kick-off until an event is usually settled, keyed by
+# `sport_id` (regulation time plus breaks and a settlement margin)
+DURATIONS = {
+    "1": 115 * 60,
+    "3": 8 * 3600,
+    "8": 100 * 60,
+    "9": 3600,
+    "12": 210 * 60,
+    "13": 150 * 60,
+    "14": 3 * 3600,
+    "15": 90 * 60,
+    "16": 3 * 3600,
+    "17": 150 * 60,
+    "18": 150 * 60,
+    "19": 100 * 60,
+    "36": 150 * 60,
+    "78": 90 * 60,
+    "83": 80 * 60,
+    "91": 2 * 3600,
+    "92": 45 * 60,
+    "94": 3600,
+    "151": 3600,
+}
+DEFAULT_DURATION = 3 * 3600
+
+STATE_VERSION = 1
+
+
+class SettlementWatcher(object):
+    """
+    Poll `result` only for events that are likely finished.
+
+    Args:
+        client: `Bet365` client (anything with `result(event_id)`)
+        path (Optional[str]): JSON state file (loaded when it exists)
+        batch_size (int): event ids per `result` call
+        max_batches (Optional[int]): `result` calls per `poll` (`None`
+            for every due batch)
+        min_recheck (float): first back-off (seconds) for an unfinished
+            event without a live timer
+        max_recheck (float): back-off ceiling (seconds)
+        retention (float): seconds settled ids are remembered
+        durations (Optional[dict]): `sport_id` to expected duration
+            overrides
+        on_settled (Optional[Callable]): called with each final `Result`
+        clock (Callable): epoch seconds source
+
+    """
+
+    def __init__(
+        self,
+        client,
+        path: Optional[str] = None,
+        batch_size: int = 10,
+        max_batches: Optional[int] = None,
+        min_recheck: float = 300.0,
+        max_recheck: float = 3600.0,
+        retention: float = 7 * 86400.0,
+        durations: Optional[dict] = None,
+        on_settled: Optional[Callable] = None,
+        clock: Callable = time.time,
+    ):
+        """Constructor for SettlementWatcher."""
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.min_recheck = min_recheck
+        self.max_recheck = max_recheck
+        self.retention = retention
+        self.durations = dict(DURATIONS, **(durations or {}))
+        self.on_settled = on_settled
+        self._clock = clock
+        self._lock = threading.RLock()
+        # NOTE: event_id -> [due, start, sport_id, attempts], heap entries
+        # whose due no longer matches are stale and skipped
+        self._open = {}
+        self._heap = []
+        self._settled = {}
+        self.calls = 0
+        self.errors = 0
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        """Number of open events."""
+        return len(self._open)
+
+    def __contains__(self, event_id) -> bool:
+        """`True` for open events."""
+        return str(event_id) in self._open
+
+    def is_settled(self, event_id) -> bool:
+        """`True` once the final result of `event_id` was emitted."""
+        return str(event_id) in self._settled
+
+    @property
+    def next_due(self) -> Optional[float]:
+        """Epoch seconds of the next scheduled poll (`None` when idle)."""
+        with self._lock:
+            self._prune_heap()
+            return self._heap[0][0] if self._heap else None
+
+    def track(
+        self,
+        event_id,
+        start_time=None,
+        sport_id=None,
+    ) -> bool:
+        """
+        Start watching `event_id`.
+
+        Args:
+            event_id: event id (`Result.id` / `UpcomingEvent.id`)
+            start_time: kick-off epoch seconds (defaults to now)
+            sport_id: sport id used for the expected duration
+
+        Returns:
+            added (bool): `False` when already open or settled
+
+        """
+        event_id = str(event_id)
+        with self._lock:
+            if event_id in self._open or event_id in self._settled:
+                return False
+
+            start = _to_float(start_time)
+            if start is None:
+                start = self._clock()
+            sport_id = None if sport_id is None else str(sport_id)
+            due = start + self.durations.get(sport_id, DEFAULT_DURATION)
+            self._schedule(event_id, [due, start, sport_id, 0])
+
+        return True
+
+    def track_events(self, events: Iterable) -> int:
+        """
+        Watch every event record (`upcoming` / `inplay_filter` results).
+
+        Returns:
+            added (int): newly tracked events
+
+        """
+        if isinstance(events, dict):
+            events = records_of(events)
+
+        added = 0
+        for record in events or []:
+            added += self.track(
+                record.get("id"), record.get("time"), record.get("sport_id")
+            )
+
+        return added
+
+    def untrack(self, event_id) -> None:
+        """Stop watching `event_id` (its result will not be emitted)."""
+        with self._lock:
+            self._open.pop(str(event_id), None)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Open event ids whose expected end has passed."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            return sorted(
+                event_id for event_id, state in self._open.items()
+                if state[0] <= now
+            )
+
+    def poll(self, now: Optional[float] = None) -> List[Result]:
+        """
+        Fetch the due events in batches and emit the final results.
+
+        Unfinished or missing events are rescheduled, a failing batch
+        is rescheduled with back-off and counted in `errors`
+
+        Returns:
+            settled (List[Result]): results that became final this poll
+
+        """
+        now = self._clock() if now is None else now
+        limit = None if self.max_batches is None \
+            else self.max_batches * self.batch_size
+        batch = self._pop_due(now, limit)
+
+        settled = []
+        for start in range(0, len(batch), self.batch_size):
+            event_ids = batch[start:start + self.batch_size]
+            try:
+                response = self.client.result(",".join(event_ids))
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                    for event_id in event_ids:
+                        self._backoff(event_id, now)
+                continue
+            finally:
+                self.calls += 1
+
+            settled.extend(self._apply(event_ids, response, now))
+
+        if self.on_settled is not None:
+            for result in settled:
+                self.on_settled(result)
+
+        return settled
+
+    def run(
+        self,
+        stop: threading.Event,
+        interval: float = 60.0,
+    ) -> None:
+        """
+        Poll and save until `stop` is set.
+
+        Args:
+            stop (threading.Event): set to end the loop
+            interval (float): longest sleep between two polls
+
+        """
+        while not stop.is_set():
+            self.poll()
+            if self.path is not None:
+                self.save()
+            next_due = self.next_due
+            wait = interval if next_due is None \
+                else min(interval, max(0.0, next_due - self._clock()))
+            stop.wait(wait)
+
+    def stats(self) -> dict:
+        """Open / settled counts and call totals."""
+        with self._lock:
+            return {
+                "open": len(self._open),
+                "settled": len(self._settled),
+                "calls": self.calls,
+                "errors": self.errors,
+                "next_due": self.next_due,
+            }
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Atomically write the state file.
+
+        Settled ids older than `retention` are dropped
+
+        Returns:
+            path (str): written file
+
+        Raises:
+            ValueError: when neither `path` nor `self.path` is set
+
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("SettlementWatcher has no state path")
+
+        with self._lock:
+            horizon = self._clock() - self.retention
+            self._settled = dict(
+                (event_id, at) for event_id, at in self._settled.items()
+                if at >= horizon
+            )
+            state = {
+                "version": STATE_VERSION,
+                "open": self._open,
+                "settled": self._settled,
+            }
+            temporary = "{}.{}.tmp".format(path, os.getpid())
+            with open(temporary, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(temporary, path)
+
+        return path
+
+    def load(self, path: str) -> None:
+        """
+        Merge the state file at `path` into the watcher.
+
+        Raises:
+            ValueError: for an unknown state file version
+
+        """
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(
+                "Unsupported settlement state version: {}".format(
+                    state.get("version")
+                )
+            )
+
+        with self._lock:
+            self._settled.update(state.get("settled") or {})
+            for event_id, entry in (state.get("open") or {}).items():
+                if event_id not in self._settled:
+                    self._schedule(event_id, list(entry))
+
+    def _schedule(self, event_id: str, entry: list) -> None:
+        """Store `entry` and push it on the heap."""
+        self._open[event_id] = entry
+        heapq.heappush(self._heap, (entry[0], event_id))
+
+    def _prune_heap(self) -> None:
+        """Drop stale heap heads."""
+        heap = self._heap
+        while heap:
+            due, event_id = heap[0]
+            entry = self._open.get(event_id)
+            if entry is not None and entry[0] == due:
+                return
+            heapq.heappop(heap)
+
+    def _pop_due(self, now: float, limit: Optional[int]) -> List[str]:
+        """Pop due event ids (at most `limit`), earliest first."""
+        batch = []
+        popped = set()
+        with self._lock:
+            while self._heap and (limit is None or len(batch) < limit):
+                self._prune_heap()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, event_id = heapq.heappop(self._heap)
+                if event_id not in popped:
+                    popped.add(event_id)
+                    batch.append(event_id)
+
+        return batch
+
+    def _apply(self, event_ids: List[str], response, now: float) -> list:
+        """Settle the final results of one batch, reschedule the rest."""
+        settled = []
+        seen = set()
+        with self._lock:
+            for record in records_of(response):
+                event_id = str(record.get("id"))
+                if event_id not in self._open or event_id in seen:
+                    continue
+                seen.add(event_id)
+                if str(record.get("time_status")) in FINAL_STATUSES:
+                    del self._open[event_id]
+                    self._settled[event_id] = now
+                    settled.append(
+                        record if isinstance(record, Result)
+                        else Result(record)
+                    )
+                else:
+                    self._reschedule(event_id, record, now)
+
+            for event_id in event_ids:
+                if event_id not in seen and event_id in self._open:
+                    self._backoff(event_id, now)
+
+        return settled
+
+    def _reschedule(self, event_id: str, record: dict, now: float) -> None:
+        """Next poll of an unfinished event (live timer or back-off)."""
+        remaining = _remaining(record)
+        if remaining is None:
+            self._backoff(event_id, now)
+            return
+
+        entry = self._open[event_id]
+        entry[0] = now + max(remaining, self.min_recheck / 5.0)
+        entry[3] = 0
+        self._schedule(event_id, entry)
+
+    def _backoff(self, event_id: str, now: float) -> None:
+        """Reschedule with an exponential back-off."""
+        entry = self._open.get(event_id)
+        if entry is None:
+            return
+        delay = min(self.max_recheck, self.min_recheck * 2 ** entry[3])
+        entry[0] = now + delay
+        entry[3] += 1
+        self._schedule(event_id, entry)
+
+
+def _remaining(record: dict) -> Optional[float]:
+    """
+    Seconds of regulation time left according to `timer` / `extra`.
+
+    `None` without a ticking timer or a known `extra.length`
+
+    """
+    timer = record.get("timer")
+    extra = record.get("extra")
+    if not isinstance(timer, dict) or not isinstance(extra, dict):
+        return None
+
+    length = _to_float(extra.get("length"))
+    minute = _to_float(timer.get("tm"))
+    if length is None or minute is None:
+        return None
+
+    added = _to_float(timer.get("ta")) or 0.0
+    second = _to_float(timer.get("ts")) or 0.0
+
+    return max(0.0, (length + added - minute) * 60.0 - second)
+
+
+def _to_float(value) -> Optional[float]:
+    """`float` of `value` (`None` when missing or not numeric)."""
+    try:
+        return None if value is None or value == "" else float(value)
+    except (TypeError, ValueError):
+        return None
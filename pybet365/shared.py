@@ -0,0 +1,320 @@
+"""
+Shared-Memory Live Odds Table.
+
+One process publishes the latest normalized in-play odds (from
+`in_play_odds` payloads) into a `multiprocessing.shared_memory` block,
+any number of worker processes attach and read it without IPC or
+serialization:
+
+    layout - a small header followed by a fixed capacity NumPy
+        structured array of `(fi, market_id, selection_id, handicap,
+        odds, updated_at)` rows
+
+    seqlock - the writer makes the sequence number odd while it writes
+        and even when done, a reader retries when the sequence was odd
+        or changed under it, so reads never lock out the writer
+
+    version - the sequence number doubles as a cheap "anything changed"
+        check for pollers
+
+Requires Python 3.8+ (`multiprocessing.shared_memory`) and `numpy`
+
+>>> publisher = SharedOddsPublisher(name="bet365-live", capacity=100000)
+>>> publisher.publish(client.in_play_odds(fi="88232938"))
+
+>>> # in a worker process
+>>> reader = SharedOddsReader("bet365-live")
+>>> rows = reader.snapshot()  # consistent copy (one memcpy)
+>>> best = reader.read(lambda rows: rows["odds"].max())  # zero-copy
+
+"""
+import time
+
+from typing import Callable, Iterable, Optional
+
+from pybet365.response.markets import iter_in_play_selections
+
+# NOTE: header slots (uint64): magic, sequence, rows, capacity
+MAGIC = 0x42333635  # "B365"
+HEADER_SLOTS = 8
+SEQUENCE, ROWS, CAPACITY = 1, 2, 3
+
+ROW_FIELDS = (
+    ("fi", "S16"),
+    ("market_id", "S16"),
+    ("selection_id", "S24"),
+    ("handicap", "f8"),
+    ("odds", "f8"),
+    ("updated_at", "f8"),
+)
+
+
+def _require():
+    """Import `numpy` and `shared_memory` with a helpful error."""
+    try:
+        import numpy
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise ImportError(
+            "Shared odds tables require Python 3.8+ and `numpy` "
+            "(pip install pybet365[timeseries])"
+        )
+
+    return numpy, shared_memory
+
+
+def _views(numpy, buffer, capacity: int):
+    """`(header, rows)` NumPy views over a shared buffer."""
+    header = numpy.ndarray((HEADER_SLOTS,), dtype=numpy.uint64, buffer=buffer)
+    rows = numpy.ndarray(
+        (capacity,),
+        dtype=numpy.dtype(list(ROW_FIELDS)),
+        buffer=buffer,
+        offset=header.nbytes,
+    )
+
+    return header, rows
+
+
+class SharedOddsPublisher(object):
+    """
+    Single writer of a shared odds table.
+
+    Rows are keyed by `(fi, market_id, selection_id)`, publishing an FI
+    updates its rows in place and marks selections missing from the new
+    payload as suspended (`nan` odds)
+
+    Args:
+        name (Optional[str]): shared memory block name (random if `None`)
+        capacity (int): maximum rows
+
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536):
+        """Constructor for SharedOddsPublisher."""
+        numpy, shared_memory = _require()
+        self.capacity = capacity
+        dtype = numpy.dtype(list(ROW_FIELDS))
+        self._shm = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=HEADER_SLOTS * 8 + capacity * dtype.itemsize,
+        )
+        self.name = self._shm.name
+        self._header, self._rows = _views(numpy, self._shm.buf, capacity)
+        self._header[:] = 0
+        self._header[CAPACITY] = capacity
+        self._header[0] = MAGIC
+        self._index = {}
+        self._by_fi = {}
+
+    def __len__(self) -> int:
+        """Rows in use."""
+        return len(self._index)
+
+    @property
+    def version(self) -> int:
+        """Sequence number (even when no write is in progress)."""
+        return int(self._header[SEQUENCE])
+
+    def publish(
+        self, response, fi: Optional[str] = None, ts: Optional[float] = None
+    ) -> int:
+        """
+        Publish the selections of one `in_play_odds` payload.
+
+        Args:
+            response: `in_play_odds` payload (or iterable of records)
+            fi (Optional[str]): FI when the body has no "EV" record
+            ts (Optional[float]): update timestamp (defaults to now)
+
+        Returns:
+            rows (int): selections written
+
+        Raises:
+            OverflowError: when the table is full
+
+        """
+        return self.publish_rows(iter_in_play_selections(response, fi=fi), ts)
+
+    def publish_rows(
+        self, selections: Iterable, ts: Optional[float] = None
+    ) -> int:
+        """
+        Publish normalized selection rows (see `iter_in_play_selections`).
+
+        Returns:
+            rows (int): selections written
+
+        """
+        ts = time.time() if ts is None else ts
+        selections = list(selections)
+        fis = set(str(row[0]) for row in selections)
+
+        header, rows = self._header, self._rows
+        header[SEQUENCE] += 1  # odd: write in progress
+        try:
+            for fi in fis:
+                for row in self._by_fi.get(fi, ()):
+                    rows["odds"][row] = float("nan")
+            for fi, market_id, _, selection_id, _, handicap, odds in (
+                selections
+            ):
+                row = self._row(str(fi), str(market_id), str(selection_id))
+                rows[row] = (
+                    _encode(fi), _encode(market_id), _encode(selection_id),
+                    handicap, odds, ts,
+                )
+            header[ROWS] = len(self._index)
+        finally:
+            header[SEQUENCE] += 1  # even: consistent
+
+        return len(selections)
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self._header = self._rows = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the block (readers keep their mappings)."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedOddsPublisher":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close and destroy the block."""
+        self.close()
+        self.unlink()
+
+    def _row(self, fi: str, market_id: str, selection_id: str) -> int:
+        """Row of a selection, allocating the next free one."""
+        key = (fi, market_id, selection_id)
+        row = self._index.get(key)
+        if row is None:
+            row = len(self._index)
+            if row >= self.capacity:
+                raise OverflowError(
+                    "Shared odds table is full ({} rows)".format(
+                        self.capacity
+                    )
+                )
+            self._index[key] = row
+            self._by_fi.setdefault(fi, []).append(row)
+
+        return row
+
+
+class SharedOddsReader(object):
+    """
+    Reader of a shared odds table (any process).
+
+    Args:
+        name (str): shared memory block name of the publisher
+        timeout (float): seconds `read` / `snapshot` retry while the
+            writer holds the sequence lock
+        untrack (bool): before Python 3.13, stop this process' resource
+            tracker from unlinking the block at exit; only needed when
+            the reader is not started from the publisher's process tree
+            (pool workers share the publisher's tracker)
+
+    Raises:
+        ValueError: when the block is not a shared odds table
+
+    """
+
+    def __init__(
+        self, name: str, timeout: float = 1.0, untrack: bool = False
+    ):
+        """Constructor for SharedOddsReader."""
+        self._numpy, shared_memory = _require()
+        try:
+            # NOTE: 3.13+ can skip the resource tracker, which would
+            # otherwise unlink the publisher's block when a reader exits
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if untrack:
+                _untrack(self._shm)
+        self.name = name
+        self.timeout = timeout
+        header = self._numpy.ndarray(
+            (HEADER_SLOTS,), dtype=self._numpy.uint64, buffer=self._shm.buf
+        )
+        if int(header[0]) != MAGIC:
+            self._shm.close()
+            raise ValueError("{} is not a shared odds table".format(name))
+
+        self._header, self._rows = _views(
+            self._numpy, self._shm.buf, int(header[CAPACITY])
+        )
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the last completed write."""
+        return int(self._header[SEQUENCE]) & ~1
+
+    def read(self, fn: Callable):
+        """
+        Call `fn` with a zero-copy view of the rows in use.
+
+        `fn` may run more than once (it is retried when the writer
+        raced it), so it should only read the view and not keep it
+
+        Returns:
+            result: value returned by the consistent call of `fn`
+
+        Raises:
+            TimeoutError: when no consistent read happens in `timeout`
+
+        """
+        header = self._header
+        deadline = time.monotonic() + self.timeout
+        while True:
+            before = int(header[SEQUENCE])
+            if not before & 1:
+                result = fn(self._rows[:int(header[ROWS])])
+                if int(header[SEQUENCE]) == before:
+                    return result
+            if time.monotonic() > deadline:
+                raise TimeoutError("Shared odds table stayed locked")
+
+    def snapshot(self):
+        """Consistent copy of the rows in use (structured `ndarray`)."""
+        return self.read(lambda rows: rows.copy())
+
+    def lookup(self, fi: str):
+        """Consistent copy of the rows of `fi`."""
+        key = _encode(fi)
+        return self.read(lambda rows: rows[rows["fi"] == key])
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self._header = self._rows = None
+        self._shm.close()
+
+    def __enter__(self) -> "SharedOddsReader":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close on exit."""
+        self.close()
+
+
+def _encode(value) -> bytes:
+    """Fixed width column value."""
+    return b"" if value is None else str(value).encode("utf-8")
+
+
+def _untrack(shm) -> None:
+    """Stop the resource tracker unlinking a block this process
+    only attached to (before Python 3.13)."""
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except (ImportError, AttributeError, KeyError):
+        pass
@@ -0,0 +1,482 @@
+"""
+Synthetic Bet365 Payloads.
+
+Deterministic, seeded payloads for every endpoint, shaped like the real
+API (pager, nested league/home/away, scores/stats/events, mnemonic keyed
+raw records), for benchmarks, stress tests and the mock server:
+
+    upcoming / inplay_filter - paged events
+
+    result - settled events with scores, stats and timeline events
+
+    prematch - `FI` records with market groups (v2)
+
+    event / inplay - raw mnemonic records ("EV", "MA", "PA", ...)
+
+Record `i` only depends on `(seed, i)`, so any slice (e.g. one page) is
+generated without the records before it, and payloads are serialized
+as a stream of chunks so 1,000,000 records never sit in memory at once
+
+>>> generator = SyntheticGenerator(seed=7)
+>>> with open("upcoming.json", "w") as f:
+...     generator.write_payload(f, "upcoming", records=1000000)
+
+    $ python -m pybet365.synthetic result --records 100000 -o result.json
+
+"""
+import argparse
+import json
+import random
+import sys
+
+from typing import Iterable, Iterator, Optional, TextIO
+
+ENDPOINTS = (
+    "upcoming", "inplay_filter", "result", "prematch", "event", "inplay"
+)
+
+PAGED_ENDPOINTS = ("upcoming", "inplay_filter")
+
+# NOTE: raw bodies nest every mnemonic record in one list
+RAW_ENDPOINTS = ("event", "inplay")
+
+# NOTE: finished `time_status` values weighted towards "3" (ended)
+FINISHED_STATUSES = ("3",) * 16 + ("4", "5", "6", "7", "8", "9", "99")
+
+SPORTS = (("1", "Soccer"), ("13", "Tennis"), ("18", "Basketball"),
+          ("92", "Table Tennis"), ("17", "Ice Hockey"))
+
+COUNTRIES = ("gb", "es", "de", "it", "fr", "br", "us", "jp", "au", "nl")
+
+FRACTIONS = ("1/5", "2/7", "1/3", "4/9", "1/2", "4/7", "4/6", "8/11",
+             "5/6", "10/11", "1/1", "11/10", "6/5", "5/4", "11/8", "6/4",
+             "13/8", "7/4", "15/8", "2/1", "9/4", "5/2", "11/4", "3/1",
+             "10/3", "4/1", "9/2", "5/1", "6/1", "8/1", "10/1", "16/1")
+
+# NOTE: result timeline texts ("23' - 1st Goal -   (Team) -")
+TIMELINE_FORMATS = {
+    "Goal": "{}' - {} Goal -   ({}) -",
+    "Corner": "{}' - {} Corner - {}",
+    "Yellow Card": "{}' - {} Yellow Card -   ({})",
+}
+
+_JSON = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class SyntheticGenerator(object):
+    """
+    Seeded generator of schema accurate Bet365 records and payloads.
+
+    Args:
+        seed (int): base seed, identical seeds give identical payloads
+        sport_id (Optional[str]): sport of every event (mixed if `None`)
+        leagues (int): distinct leagues events are drawn from
+        teams (int): distinct teams events are drawn from
+        start_time (int): epoch seconds of the first event
+        spacing (int): seconds between consecutive events
+
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        sport_id: Optional[str] = None,
+        leagues: int = 200,
+        teams: int = 2000,
+        start_time: int = 1586480400,
+        spacing: int = 60,
+    ):
+        """Constructor for SyntheticGenerator."""
+        self.seed = seed
+        self.sport_id = sport_id
+        self.leagues = max(1, leagues)
+        self.teams = max(2, teams)
+        self.start_time = start_time
+        self.spacing = spacing
+
+    def rng(self, index: int) -> random.Random:
+        """Random source of record `index`."""
+        return random.Random(self.seed * 1000003 + index)
+
+    def records(
+        self, endpoint: str, count: int, start: int = 0
+    ) -> Iterator:
+        """
+        Yield records `start .. start + count` of `endpoint`.
+
+        Raw endpoints yield one list of mnemonic records per event
+
+        Raises:
+            ValueError: for an unknown `endpoint`
+
+        """
+        if endpoint not in ENDPOINTS:
+            raise ValueError("Unknown endpoint: {}".format(endpoint))
+
+        build = getattr(self, "_" + endpoint)
+        for index in range(start, start + count):
+            yield build(index, self.rng(index))
+
+    def iter_payload(
+        self,
+        endpoint: str,
+        records: int,
+        page: int = 1,
+        per_page: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the serialized payload of `endpoint` in chunks.
+
+        Args:
+            endpoint (str): endpoint tail ("upcoming", "result", ...)
+            records (int): total records (events for raw endpoints)
+            page (int): page of a paged endpoint
+            per_page (Optional[int]): page size (defaults to `records`)
+
+        """
+        start, count, pager = 0, records, None
+        if endpoint in PAGED_ENDPOINTS:
+            per_page = per_page or records
+            start = (max(1, page) - 1) * per_page
+            count = max(0, min(per_page, records - start))
+            pager = {"page": page, "per_page": per_page, "total": records}
+
+        return dump_payload(
+            self.records(endpoint, count, start),
+            pager=pager,
+            raw=endpoint in RAW_ENDPOINTS,
+        )
+
+    def payload(self, endpoint: str, records: int, **kwargs) -> dict:
+        """Decoded payload of `endpoint` (see `iter_payload`)."""
+        return json.loads("".join(
+            self.iter_payload(endpoint, records, **kwargs)
+        ))
+
+    def write_payload(self, stream: TextIO, endpoint: str, records: int,
+                      **kwargs) -> None:
+        """Stream the payload of `endpoint` to `stream`."""
+        for chunk in self.iter_payload(endpoint, records, **kwargs):
+            stream.write(chunk)
+
+    def _base(self, index: int, rng: random.Random) -> dict:
+        """Fields shared by every event record."""
+        sport_id = self.sport_id or SPORTS[index % len(SPORTS)][0]
+        league = rng.randrange(self.leagues)
+        home = rng.randrange(self.teams)
+        away = (home + 1 + rng.randrange(self.teams - 1)) % self.teams
+        cc = COUNTRIES[league % len(COUNTRIES)]
+
+        return {
+            "id": str(88000000 + index),
+            "sport_id": sport_id,
+            "time": str(self.start_time + index * self.spacing),
+            "time_status": "0",
+            "league": {"id": str(10000 + league),
+                       "name": "League {}".format(league), "cc": cc},
+            "home": _team(home),
+            "away": _team(away),
+            "ss": None,
+        }
+
+    def _upcoming(self, index: int, rng: random.Random) -> dict:
+        """`upcoming` record."""
+        record = self._base(index, rng)
+        record["our_event_id"] = str(2000000 + index)
+        record["updated_at"] = str(
+            self.start_time - rng.randrange(1, 86400)
+        )
+
+        return record
+
+    def _inplay_filter(self, index: int, rng: random.Random) -> dict:
+        """`inplay_filter` record (a live event)."""
+        record = self._upcoming(index, rng)
+        record["time_status"] = "1"
+        record["ss"] = "{}-{}".format(rng.randrange(4), rng.randrange(4))
+
+        return record
+
+    def _result(self, index: int, rng: random.Random) -> dict:
+        """`result` record with scores, stats and timeline events."""
+        record = self._base(index, rng)
+        half = [rng.randrange(3), rng.randrange(3)]
+        full = [half[0] + rng.randrange(3), half[1] + rng.randrange(3)]
+        kickoff = int(record["time"])
+        record.update({
+            "time_status": rng.choice(FINISHED_STATUSES),
+            "ss": "{}-{}".format(*full),
+            "scores": {
+                "1": {"home": str(half[0]), "away": str(half[1])},
+                "2": {"home": str(full[0]), "away": str(full[1])},
+            },
+            "stats": {
+                name: [str(rng.randrange(12)), str(rng.randrange(12))]
+                for name in ("attacks", "corners", "on_target",
+                             "off_target", "yellowcards", "redcards")
+            },
+            "timer": {"tm": 90, "ts": 0, "tt": "0", "ta": 0},
+            "extra": {"length": 90, "stadium_data": {
+                "name": "Stadium {}".format(index % 997),
+                "city": "City {}".format(index % 331),
+            }},
+            "events": self._timeline(index, rng, record, half, full),
+            "has_lineup": rng.randrange(2),
+            "inplay_created_at": str(kickoff - 600),
+            "inplay_updated_at": str(kickoff + 6600),
+            "confirmed_at": str(kickoff + 6900),
+            "bet365_id": str(88000000 + index),
+        })
+
+        return record
+
+    @staticmethod
+    def _timeline(
+        index: int, rng: random.Random, record: dict, half: list, full: list
+    ) -> list:
+        """Timeline `events` of a result, in the feed's text formats."""
+        teams = (record["home"]["name"], record["away"]["name"])
+        lines = [
+            (45.5, "Score After First Half - {}-{}".format(*half)),
+            (90.5, "Score After Full Time - {}-{}".format(*full)),
+        ]
+        for side in (0, 1):
+            for _ in range(half[side]):
+                lines.append((rng.randrange(1, 46), "Goal", teams[side]))
+            for _ in range(full[side] - half[side]):
+                lines.append((rng.randrange(46, 91), "Goal", teams[side]))
+        for kind, most in (("Corner", 12), ("Yellow Card", 5)):
+            for _ in range(rng.randrange(most)):
+                lines.append(
+                    (rng.randrange(1, 91), kind, teams[rng.randrange(2)])
+                )
+        lines.sort()
+
+        events = []
+        counts = {}
+        for minute, kind, *team in lines:
+            if team:
+                counts[kind] = counts.get(kind, 0) + 1
+                text = TIMELINE_FORMATS[kind].format(
+                    minute, _ordinal(counts[kind]), team[0]
+                )
+            else:
+                text = kind
+            events.append({"id": str(index * 100 + len(events)), "text": text})
+
+        return events
+
+    def _prematch(self, index: int, rng: random.Random) -> dict:
+        """`prematch` record with market groups."""
+        updated_at = str(self.start_time - rng.randrange(1, 86400))
+        home, draw, away = (_decimal(rng) for _ in range(3))
+        line = rng.choice(("1.5", "2.5", "3.5"))
+        handicap = rng.choice(("-1.5", "-1.0", "-0.5", "0.0", "+0.5"))
+        base = 1000 + index * 10
+
+        return {
+            "FI": str(88000000 + index),
+            "event_id": str(2000000 + index),
+            "main": {
+                "updated_at": updated_at,
+                "key": "#AC#B1#C{}#D8#E".format(index),
+                "sp": {
+                    "full_time_result": {
+                        "id": "40",
+                        "name": "Full Time Result",
+                        "odds": [
+                            {"id": str(base), "odds": home, "name": "1"},
+                            {"id": str(base + 1), "odds": draw, "name": "X"},
+                            {"id": str(base + 2), "odds": away, "name": "2"},
+                        ],
+                    },
+                    "double_chance": {
+                        "id": "50401",
+                        "name": "Double Chance",
+                        "odds": [
+                            {"id": str(base + 3), "odds": _decimal(rng),
+                             "name": "1 or X"},
+                            {"id": str(base + 4), "odds": _decimal(rng),
+                             "name": "X or 2"},
+                        ],
+                    },
+                },
+            },
+            "goals": {
+                "updated_at": updated_at,
+                "key": "#AC#B1#C{}#D19#E".format(index),
+                "sp": {
+                    "goals_over_under": {
+                        "id": "981",
+                        "name": "Goals Over/Under",
+                        "odds": [
+                            {"id": str(base + 5), "odds": _decimal(rng),
+                             "header": "Over", "name": line},
+                            {"id": str(base + 6), "odds": _decimal(rng),
+                             "header": "Under", "name": line},
+                        ],
+                    },
+                },
+            },
+            "asian_lines": {
+                "updated_at": updated_at,
+                "key": "#AC#B1#C{}#D47#E".format(index),
+                "sp": {
+                    "asian_handicap": {
+                        "id": "938",
+                        "name": "Asian Handicap",
+                        "odds": [
+                            {"id": str(base + 7), "odds": _decimal(rng),
+                             "header": "1", "handicap": handicap},
+                            {"id": str(base + 8), "odds": _decimal(rng),
+                             "header": "2",
+                             "handicap": _opposite(handicap)},
+                        ],
+                    },
+                },
+            },
+        }
+
+    def _event(
+        self, index: int, rng: random.Random, event: Optional[dict] = None
+    ) -> list:
+        """`event` (in-play odds) "EV" / "MA" / "PA" records."""
+        event = event or self._base(index, rng)
+        fi = event["id"]
+        records = [{
+            "type": "EV",
+            "FI": fi,
+            "ID": "{}C{}A_1_1".format(fi, event["sport_id"]),
+            "IT": "{}C{}A_1_1".format(fi, event["sport_id"]),
+            "NA": "{} v {}".format(event["home"]["name"],
+                                   event["away"]["name"]),
+            "CT": event["league"]["name"],
+            "SS": "{}-{}".format(rng.randrange(4), rng.randrange(4)),
+            "TM": str(rng.randrange(90)),
+            "TS": str(rng.randrange(60)),
+            "TT": "1",
+            "TU": "20200410{:06d}".format(rng.randrange(240000)),
+        }]
+        for market, (name, selections) in enumerate((
+            ("Fulltime Result", (event["home"]["name"], "Draw",
+                                 event["away"]["name"])),
+            ("Match Goals", ("Over", "Under")),
+        )):
+            market_id = str(1777 + market)
+            records.append({
+                "type": "MA",
+                "ID": market_id,
+                "IT": "{}M{}".format(fi, market_id),
+                "NA": name,
+                "SU": "0",
+            })
+            for number, selection in enumerate(selections):
+                selection_id = str(int(fi) * 10 + market * 5 + number)
+                records.append({
+                    "type": "PA",
+                    "ID": selection_id,
+                    "IT": "{}P{}".format(fi, selection_id),
+                    "NA": selection,
+                    "OD": rng.choice(FRACTIONS),
+                    "SU": "0",
+                })
+
+        return records
+
+    def _inplay(self, index: int, rng: random.Random) -> list:
+        """`inplay` mnemonic records (classification and league headers
+        whenever they change)."""
+        event = self._base(index, rng)
+        sport_id, league = event["sport_id"], event["league"]
+
+        return [
+            {"type": "CL", "ID": sport_id, "IT": "C{}".format(sport_id),
+             "NA": dict(SPORTS).get(sport_id, sport_id)},
+            {"type": "CT", "ID": league["id"],
+             "IT": "C{}L{}".format(sport_id, league["id"]),
+             "NA": league["name"]},
+        ] + self._event(index, rng, event)
+
+
+def _team(team: int) -> dict:
+    """`home` / `away` object of team number `team`."""
+    return {
+        "id": str(200000 + team),
+        "name": "Team {}".format(team),
+        "image_id": str(300000 + team),
+        "cc": COUNTRIES[team % len(COUNTRIES)],
+    }
+
+
+def _decimal(rng: random.Random) -> str:
+    """Decimal price in the API's three decimal format."""
+    return "{:.3f}".format(1.05 + rng.random() * 9.0)
+
+
+def _opposite(handicap: str) -> str:
+    """Handicap line of the other side."""
+    value = -float(handicap)
+    return "{:+.1f}".format(value) if value else "0.0"
+
+
+def _ordinal(number: int) -> str:
+    """"1st", "2nd", "3rd", "4th", ..."""
+    if 10 <= number % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+
+    return "{}{}".format(number, suffix)
+
+
+def dump_payload(
+    records: Iterable, pager: Optional[dict] = None, raw: bool = False
+) -> Iterator[str]:
+    """
+    Serialize a payload from an iterable of records, chunk by chunk.
+
+    Args:
+        records (Iterable): `results` entries (lists of mnemonic records
+            when `raw`)
+        pager (Optional[dict]): `pager` object of paged endpoints
+        raw (bool): nest every record in one list (raw Bet365 bodies)
+
+    Yields:
+        chunk (str): consecutive pieces of the `json` document
+
+    """
+    yield '{"success":1,'
+    if pager is not None:
+        yield '"pager":' + _JSON(pager) + ","
+    yield '"results":[[' if raw else '"results":['
+
+    first = True
+    for record in records:
+        items = record if raw else (record,)
+        for item in items:
+            yield _JSON(item) if first else "," + _JSON(item)
+            first = False
+
+    yield "]]}" if raw else "]}"
+
+
+def main(argv=None):
+    """Write a synthetic payload from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("endpoint", choices=ENDPOINTS)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sport-id")
+    parser.add_argument("--output", "-o")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticGenerator(seed=args.seed, sport_id=args.sport_id)
+    if args.output:
+        with open(args.output, "w") as f:
+            generator.write_payload(f, args.endpoint, args.records)
+    else:
+        generator.write_payload(sys.stdout, args.endpoint, args.records)
+
+
+if __name__ == "__main__":
+    main()
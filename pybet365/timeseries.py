@@ -0,0 +1,358 @@
+"""
+Odds Movement Time-Series.
+
+Keeps the recent price history of every polled selection, keyed by
+`(FI, market, selection)`, in fixed-size NumPy ring buffers of
+`(timestamp, decimal odds)`:
+
+    bounded memory - each series holds at most `capacity` ticks and the
+        store at most `max_series` series (the least recently updated
+        series is recycled), regardless of how long the poller runs
+
+    vectorized queries - every series lives in one row of a 2-D array,
+        so `twap` / `max_move` / `latest` are computed for all
+        selections at once
+
+Requires `numpy` (`pip install pybet365[timeseries]`)
+
+>>> store = OddsTimeSeriesStore(capacity=512)
+>>> store.ingest_prematch(client.pre_match_odds(fi="88232938"))
+>>> store.ingest_in_play(client.in_play_odds(fi="88232938"))
+>>> store.max_move(window=300.0)
+
+"""
+import time
+
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from pybet365.response.markets import (
+    MarketTable,
+    iter_in_play_selections,
+    normalize_prematch,
+)
+
+
+def _numpy():
+    """Import `numpy` with a helpful error when it is missing."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "OddsTimeSeriesStore requires `numpy` "
+            "(pip install pybet365[timeseries])"
+        )
+
+    return numpy
+
+
+class OddsTimeSeriesStore(object):
+    """
+    Ring buffers of `(timestamp, decimal odds)` per selection.
+
+    Args:
+        capacity (int): ticks kept per series
+        max_series (int): series kept before the least recently updated
+            one is recycled
+        dedupe (bool): skip ticks whose price equals the previous tick
+            (an unchanged price is still in force for `twap`)
+        clock (Callable): wall clock for ticks recorded without a
+            timestamp (injectable for tests)
+
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        max_series: int = 65536,
+        dedupe: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Constructor for OddsTimeSeriesStore."""
+        if capacity < 1 or max_series < 1:
+            raise ValueError("capacity and max_series must be positive")
+
+        self._np = _numpy()
+        self.capacity = capacity
+        self.max_series = max_series
+        self.dedupe = dedupe
+        self._clock = clock
+        self._index = {}
+        self._keys = []
+        self._allocate(min(64, max_series))
+
+    def __len__(self) -> int:
+        """Number of series."""
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether `key` has a series."""
+        return key in self._index
+
+    def keys(self) -> List[tuple]:
+        """Series keys, aligned with the arrays of the vectorized
+        queries."""
+        return list(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the ring buffers."""
+        return sum(
+            a.nbytes
+            for a in (
+                self._ts, self._odds, self._head, self._count, self._updated
+            )
+        )
+
+    def record(
+        self,
+        fi: str,
+        market: str,
+        selection: str,
+        odds: float,
+        ts: Optional[float] = None,
+    ) -> bool:
+        """
+        Append one tick to the `(fi, market, selection)` series.
+
+        Returns:
+            recorded (bool): `False` for `nan` prices and (with `dedupe`)
+                unchanged prices
+
+        """
+        if odds != odds:
+            return False
+
+        ts = self._clock() if ts is None else ts
+        row = self._row((fi, market, selection))
+        head = self._head[row]
+        if self.dedupe and self._count[row]:
+            if self._odds[row, (head - 1) % self.capacity] == odds:
+                self._updated[row] = ts
+                return False
+
+        self._ts[row, head] = ts
+        self._odds[row, head] = odds
+        self._head[row] = (head + 1) % self.capacity
+        self._count[row] = min(self._count[row] + 1, self.capacity)
+        self._updated[row] = ts
+
+        return True
+
+    def ingest_prematch(self, response, ts: Optional[float] = None) -> int:
+        """
+        Record every selection of a `pre_match_odds` response.
+
+        Series are keyed by `(FI, market key, selection id)`
+
+        Args:
+            response: `PreMatchOddsResponse`, raw payload or `MarketTable`
+            ts (Optional[float]): poll timestamp (defaults to now)
+
+        Returns:
+            recorded (int): ticks appended
+
+        """
+        table = response
+        if not isinstance(table, MarketTable):
+            table = normalize_prematch(response)
+
+        ts = self._clock() if ts is None else ts
+        recorded = 0
+        for i in range(len(table)):
+            recorded += self.record(
+                table.fi[i],
+                table.market_key[i],
+                table.selection_id[i] or table.selection[i],
+                table.odds[i],
+                ts,
+            )
+
+        return recorded
+
+    def ingest_in_play(
+        self, response, fi: Optional[str] = None, ts: Optional[float] = None
+    ) -> int:
+        """
+        Record every selection of an `in_play_odds` response.
+
+        Series are keyed by `(FI, market id, selection id)`
+
+        Args:
+            response: `in_play_odds` payload (or iterable of records)
+            fi (Optional[str]): FI when the body has no "EV" record
+            ts (Optional[float]): poll timestamp (defaults to now)
+
+        Returns:
+            recorded (int): ticks appended
+
+        """
+        ts = self._clock() if ts is None else ts
+        recorded = 0
+        for row in iter_in_play_selections(response, fi=fi):
+            recorded += self.record(row[0], row[1], row[3], row[6], ts)
+
+        return recorded
+
+    def last(self, key: tuple, n: Optional[int] = None) -> Tuple:
+        """
+        Last `n` ticks of one series, oldest first.
+
+        Returns:
+            (timestamps, odds) (Tuple[ndarray, ndarray]): empty arrays for
+                an unknown `key`
+
+        """
+        np = self._np
+        row = self._index.get(key)
+        if row is None:
+            return np.empty(0), np.empty(0)
+
+        count = int(self._count[row])
+        n = count if n is None else max(0, min(n, count))
+        idx = (self._head[row] - n + np.arange(n)) % self.capacity
+
+        return self._ts[row, idx], self._odds[row, idx]
+
+    def latest(self) -> Tuple:
+        """
+        Last tick of every series.
+
+        Returns:
+            (timestamps, odds) (Tuple[ndarray, ndarray]): aligned with
+                `keys()`
+        """
+        rows = len(self._keys)
+        idx = (self._head[:rows] - 1) % self.capacity
+        rng = self._np.arange(rows)
+
+        return self._ts[rng, idx], self._odds[rng, idx]
+
+    def twap(
+        self,
+        window: float,
+        key: Optional[tuple] = None,
+        now: Optional[float] = None,
+    ):
+        """
+        Time-weighted average price over the last `window` seconds.
+
+        There is no traded volume in the feed, so each price is weighted
+        by how long it was in force (the tick before the window start
+        counts from the window start)
+
+        Returns:
+            twap (float|ndarray): for `key`, or per series aligned with
+                `keys()` (`nan` without ticks in force)
+
+        """
+        np = self._np
+        ts, odds, end, start = self._window(window, now)
+        with np.errstate(invalid="ignore"):
+            weight = np.clip(end - np.maximum(ts, start), 0.0, None)
+        weight = np.nan_to_num(weight)
+        total = weight.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            twap = np.nan_to_num(odds * weight).sum(axis=1) / total
+        twap[total == 0] = np.nan
+
+        return self._select(twap, key)
+
+    def max_move(
+        self,
+        window: float,
+        key: Optional[tuple] = None,
+        now: Optional[float] = None,
+    ):
+        """
+        Largest price range (max - min decimal odds) over the last
+        `window` seconds, including the price in force at its start.
+
+        Returns:
+            move (float|ndarray): for `key`, or per series aligned with
+                `keys()` (`nan` without ticks in force)
+
+        """
+        np = self._np
+        ts, odds, end, start = self._window(window, now)
+        with np.errstate(invalid="ignore"):
+            live = (end > start) & (ts <= start + window)
+        prices = np.where(live, odds, np.nan)
+        move = np.fmax.reduce(prices, axis=1) - np.fmin.reduce(prices, axis=1)
+
+        return self._select(move, key)
+
+    def _window(self, window: float, now: Optional[float]) -> Tuple:
+        """Chronological `(ts, odds, next_ts, window_start)` of every
+        series (`nan` padded)."""
+        np = self._np
+        now = self._clock() if now is None else now
+        rows = len(self._keys)
+        idx = (
+            self._head[:rows, None] + np.arange(self.capacity)[None, :]
+        ) % self.capacity
+        rng = np.arange(rows)[:, None]
+        ts = self._ts[rng, idx]
+        odds = self._odds[rng, idx]
+
+        # NOTE: a price is in force until the next tick (or `now`)
+        end = np.empty_like(ts)
+        end[:, :-1] = ts[:, 1:]
+        end[:, -1] = now
+
+        return ts, odds, end, now - window
+
+    def _select(self, values, key: Optional[tuple]):
+        """`values` of `key`, or all of them when `key` is `None`."""
+        if key is None:
+            return values
+
+        row = self._index.get(key)
+        return float(values[row]) if row is not None else float("nan")
+
+    def _row(self, key: tuple) -> int:
+        """Row of `key`, allocating or recycling one when new."""
+        row = self._index.get(key)
+        if row is not None:
+            return row
+
+        rows = len(self._keys)
+        if rows < self.max_series:
+            if rows == len(self._head):
+                self._grow(min(rows * 2, self.max_series))
+            self._keys.append(key)
+        else:
+            row = int(self._updated.argmin())
+            del self._index[self._keys[row]]
+            self._keys[row] = key
+            self._reset(row)
+            rows = row
+
+        self._index[key] = rows
+        return rows
+
+    def _allocate(self, rows: int) -> None:
+        """Allocate empty buffers for `rows` series."""
+        np = self._np
+        self._ts = np.full((rows, self.capacity), np.nan)
+        self._odds = np.full((rows, self.capacity), np.nan)
+        self._head = np.zeros(rows, dtype=np.int64)
+        self._count = np.zeros(rows, dtype=np.int64)
+        self._updated = np.full(rows, np.inf)
+
+    def _grow(self, rows: int) -> None:
+        """Grow the buffers to `rows` series."""
+        old = (self._ts, self._odds, self._head, self._count, self._updated)
+        used = len(self._keys)
+        self._allocate(rows)
+        for new, previous in zip(
+            (self._ts, self._odds, self._head, self._count, self._updated),
+            old,
+        ):
+            new[:used] = previous[:used]
+
+    def _reset(self, row: int) -> None:
+        """Empty the ring buffer of `row`."""
+        self._ts[row] = self._np.nan
+        self._odds[row] = self._np.nan
+        self._head[row] = 0
+        self._count[row] = 0
@@ -16,6 +16,13 @@ setup_requirements = ['pytest-runner', ]
 
 test_requirements = ['pytest>=3', ]
 
+extras_requirements = {
+    'compression': ['brotli', 'zstandard'],
+    'http2': ['httpx', 'h2'],
+    'parquet': ['pyarrow'],
+    'timeseries': ['numpy'],
+}
+
 setup(
     author="Leon Kozlowski",
     author_email='leonkozlowski@gmail.com',
@@ -37,6 +44,7 @@ setup(
         ],
     },
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT license",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
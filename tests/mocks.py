@@ -1,4 +1,7 @@
 """Mock Objects for pytest."""
+import datetime
+import json
+
 from tests.utils import load_json
 
 from requests import HTTPError
@@ -7,15 +10,33 @@ from requests import HTTPError
 class MockRequestsResponse(object):
     """MockRequestsResponse object."""
 
-    def __init__(self, filepath: str, status: int = 200):
+    def __init__(self, filepath: str, status: int = 200, headers=None):
         self.status = status
+        self.status_code = status
+        self.headers = headers or {}
+        self.elapsed = datetime.timedelta(milliseconds=1)
         self._path = filepath
 
     def raise_for_status(self):
-        if self.status != 200:
+        if self.status >= 400:
             raise HTTPError
 
         return None
 
-    def json(self):
+    @property
+    def content(self):
+        return json.dumps(load_json(self._path)).encode()
+
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        return None
+
+    def json(self, **kwargs):
+        if kwargs:
+            return json.loads(self.content, **kwargs)
+
         return load_json(self._path)
@@ -1,6 +1,7 @@
 """Unit tests for `betfund_bet365.client` modules."""
 from unittest import TestCase
 
+from pybet365.client.config import Bet365SportId
 from pybet365.response.base import (
     Bet365Response,
     MetaBase,
@@ -148,6 +149,12 @@ class TestResultBase(TestCase):
 
         assert result == "1"
 
+    def test_sport(self):
+        """Unit test for `ResultBase.sport`"""
+        result = self.test_client.sport
+
+        assert result is Bet365SportId.SOCCER
+
     def test_time(self):
         """Unit test for `ResultBase.time`"""
         result = self.test_client.time
@@ -0,0 +1,76 @@
+"""Unit tests for `pybet365.bulk` modules."""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from pybet365.bulk import (
+    ColumnBuilder,
+    flatten_payload,
+    process_archive,
+    shard_paths,
+)
+
+from tests.utils import load_json
+
+
+class TestBulk(TestCase):
+    """Unit tests for bulk archive processing."""
+
+    def setUp(self) -> None:
+        """Write an archive of payload files."""
+        self.tmp = tempfile.mkdtemp()
+        self.payload = load_json("testData/upcoming_events_table_tennis.json")
+        self.paths = []
+        for i in range(4):
+            path = os.path.join(self.tmp, "upcoming-{}.json".format(i))
+            with open(path, "w") as f:
+                json.dump(self.payload, f)
+            self.paths.append(path)
+
+        path = os.path.join(self.tmp, "upcoming.ndjson.gz")
+        with gzip.open(path, "wt") as f:
+            f.write(json.dumps(self.payload) + "\n")
+            f.write(json.dumps(self.payload) + "\n")
+        self.paths.append(path)
+
+    def tearDown(self) -> None:
+        """Remove the archive."""
+        shutil.rmtree(self.tmp)
+
+    def test_flatten_payload(self):
+        """Unit test for `flatten_payload`."""
+        rows = list(flatten_payload("upcoming", self.payload))
+
+        assert rows[0]["league.name"] == "Moscow Liga Pro"
+
+    def test_shard_paths(self):
+        """Unit test for `shard_paths` balancing."""
+        groups = shard_paths(self.paths, 2)
+
+        assert len(groups) == 2
+        assert sorted(sum(groups, [])) == sorted(self.paths)
+
+    def test_column_builder(self):
+        """Unit test for `ColumnBuilder` back filling."""
+        builder = ColumnBuilder()
+        builder.append({"a": 1})
+        builder.append({"b": 2})
+
+        assert builder.columns == {"a": [1, None], "b": [None, 2]}
+
+    def test_process_archive(self):
+        """Unit test for `process_archive` across processes."""
+        out_dir = os.path.join(self.tmp, "out")
+
+        summaries = process_archive(
+            self.paths, "upcoming", out_dir, workers=2, shards=3
+        )
+
+        assert sum(s["records"] for s in summaries) == 6
+        with open(summaries[0]["output"]) as f:
+            shard = json.load(f)
+        assert shard["rows"] == len(shard["columns"]["id"])
@@ -0,0 +1,237 @@
+"""Unit tests for `pybet365.client.cache` modules."""
+import json
+
+import mock
+import requests
+
+from unittest import TestCase
+
+from pybet365.client.cache import CacheEntry, ResponseCache
+from pybet365.client.client import Bet365
+from pybet365.client.hooks import Hooks
+from pybet365.client.tiered import TieredCache, measure_size
+
+from tests.mocks import MockRequestsResponse
+
+FIXTURE = "testData/upcoming_events_table_tennis.json"
+
+
+class TestRevalidation(TestCase):
+    """Unit tests for revalidation through `Bet365._get`."""
+
+    def setUp(self) -> None:
+        """Instantiate Bet365 with a ResponseCache."""
+        self.cache = ResponseCache()
+        self.hooks = Hooks()
+        self.test_client = Bet365(
+            api_host="host", api_key="key", cache=self.cache, hooks=self.hooks
+        )
+
+    @mock.patch.object(requests, "get")
+    def test_not_modified(self, mock_api_response):
+        """Unit test for `ETag` revalidation and `304` reuse."""
+        mock_api_response.side_effect = [
+            MockRequestsResponse(filepath=FIXTURE, headers={"ETag": '"v1"'}),
+            MockRequestsResponse(filepath=None, status=304),
+        ]
+        hits = []
+        self.hooks.on("cache_hit", hits.append)
+
+        first = self.test_client.upcoming_events(sport_id="92")
+        second = self.test_client.upcoming_events(sport_id="92")
+
+        assert second is first
+        sent = mock_api_response.call_args_list[1][1]["headers"]
+        assert sent["If-None-Match"] == '"v1"'
+        assert "If-None-Match" not in self.test_client.headers
+        assert self.cache.not_modified == 1
+        assert len(hits) == 1
+
+    @mock.patch.object(requests, "get")
+    def test_not_modified_without_entry(self, mock_api_response):
+        """Unit test for a `304` with nothing cached being a miss."""
+        mock_api_response.side_effect = [
+            MockRequestsResponse(filepath=None, status=304),
+            MockRequestsResponse(filepath=FIXTURE, headers={"ETag": '"v1"'}),
+        ]
+
+        response = self.test_client.upcoming_events(sport_id="92")
+
+        assert response.results[0].id == "88107197"
+        sent = mock_api_response.call_args_list[1][1]["headers"]
+        assert sent["Cache-Control"] == "no-cache"
+        assert "If-None-Match" not in sent
+        assert self.cache.not_modified == 0
+        assert len(self.cache) == 1
+
+    @mock.patch.object(requests, "get")
+    def test_unchanged_body(self, mock_api_response):
+        """Unit test for hash based reuse without validators."""
+        mock_api_response.side_effect = lambda **kwargs: MockRequestsResponse(
+            filepath=FIXTURE
+        )
+
+        first = self.test_client.upcoming_events(sport_id="92")
+        with mock.patch.object(Bet365, "_decode") as decode:
+            second = self.test_client.upcoming_events(sport_id="92")
+
+        assert second is first
+        assert not decode.called
+        assert self.cache.unchanged == 1
+
+    @mock.patch.object(requests, "get")
+    def test_keys_by_params(self, mock_api_response):
+        """Unit test for different params not sharing entries."""
+        mock_api_response.side_effect = lambda **kwargs: MockRequestsResponse(
+            filepath=FIXTURE
+        )
+
+        self.test_client.upcoming_events(sport_id="92")
+        self.test_client.upcoming_events(sport_id="1")
+
+        assert len(self.cache) == 2
+        assert self.cache.hits == 0
+
+    def test_lru_eviction(self):
+        """Unit test for `max_entries` eviction."""
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, object())
+
+        assert cache.get("a") is None
+        assert len(cache) == 2
+
+
+def body(index: int) -> bytes:
+    """Raw `upcoming` body of about 1 kB."""
+    return json.dumps({
+        "success": 1,
+        "results": [{"id": str(index), "name": "x" * 1000}],
+    }).encode()
+
+
+class TestTieredCache(TestCase):
+    """Unit tests for `TieredCache`."""
+
+    def setUp(self) -> None:
+        """Hot tier of about 3 bodies."""
+        self.cache = TieredCache(max_bytes=24000)
+        self.addCleanup(self.cache.close)
+
+    def store(self, index: int) -> CacheEntry:
+        """Decode and store body `index` under key `index`."""
+        content = body(index)
+        entry = CacheEntry(
+            Bet365._wrap("upcoming", json.loads(content)),
+            digest=ResponseCache.digest(content),
+            etag=str(index),
+            size=len(content),
+            url_extras="upcoming",
+        )
+        self.cache.set(index, entry, content)
+
+        return entry
+
+    def test_byte_bounded(self):
+        """Unit test for demotion once over `max_bytes`."""
+        for index in range(10):
+            self.store(index)
+        stats = self.cache.stats()
+
+        assert 0 < stats["hot_bytes"] <= stats["max_bytes"]
+        assert len(self.cache) == 3 and stats["demotions"] == 7
+        assert stats["disk_entries"] == 10
+        assert stats["disk_bytes"] < sum(len(body(i)) for i in range(10))
+
+    def test_promotion(self):
+        """Unit test for a demoted entry decoded again from disk."""
+        first = self.store(0)
+        first.etag = "refreshed"
+        for index in range(1, 5):
+            self.store(index)
+
+        entry = self.cache.get(0)
+
+        assert entry is not first and entry.facade == first.facade
+        assert type(entry.facade) is type(first.facade)
+        assert (entry.digest, entry.etag) == (first.digest, "refreshed")
+        assert self.cache.get(0) is entry
+        assert self.cache.promotions == 1
+        assert self.cache.get("missing") is None
+        assert self.cache.misses == 1
+
+    def test_concurrent_set_wins(self):
+        """Unit test for a promotion never overwriting a newer entry."""
+        self.store(0)
+        for index in range(1, 4):
+            self.store(index)
+        decode = self.cache.decode
+        newer = []
+
+        def racing_decode(url_extras, content):
+            if not newer:
+                newer.append(self.store(0))
+            return decode(url_extras, content)
+
+        self.cache.decode = racing_decode
+        assert self.cache.get(0) is newer[0]
+        assert self.cache.promotions == 0
+
+        # NOTE: demote 0 again, then drop its disk record mid decode
+        self.cache.decode = decode
+        for index in range(1, 4):
+            self.store(index)
+        self.cache.decode = lambda url_extras, content: (
+            self.cache.disk.discard(0) or decode(url_extras, content)
+        )
+        assert self.cache.get(0).facade == newer[0].facade
+        assert 0 not in self.cache._entries
+        assert self.cache.promotions == 0
+
+    def test_disk_eviction(self):
+        """Unit test for dropping the oldest segment."""
+        cache = TieredCache(
+            max_bytes=0, max_disk_bytes=200, segment_bytes=100
+        )
+        self.addCleanup(cache.close)
+        self.cache = cache
+        for index in range(20):
+            self.store(index)
+
+        assert cache.get(0) is None and cache.get(19) is not None
+        assert cache.stats()["disk_evictions"] > 0
+        assert cache.disk.bytes <= 200 + 100
+        assert cache.rejected == 21
+
+    def test_without_content(self):
+        """Unit test for serializing the facade on demotion."""
+        entry = self.store(0)
+        self.cache.set("raw", CacheEntry(entry.facade, size=len(body(0))))
+        for index in range(1, 5):
+            self.store(index)
+
+        assert "raw" in self.cache.disk
+        assert self.cache.get("raw").facade == entry.facade
+
+    def test_measure_size(self):
+        """Unit test for the exact sizer."""
+        entry = self.store(0)
+
+        assert measure_size(entry) > entry.size
+
+    @mock.patch.object(requests, "get")
+    def test_client(self, mock_api_response):
+        """Unit test for `Bet365` storing raw bodies in the cold tier."""
+        mock_api_response.side_effect = lambda **kwargs: MockRequestsResponse(
+            filepath=FIXTURE
+        )
+        client = Bet365(api_host="host", api_key="key", cache=self.cache)
+
+        first = client.upcoming_events(sport_id="92")
+        self.cache._entries.clear()
+        self.cache.bytes = 0
+        self.cache._costs.clear()
+        second = client.upcoming_events(sport_id="92")
+
+        assert second == first and second is not first
+        assert self.cache.promotions == 1 and self.cache.unchanged == 1
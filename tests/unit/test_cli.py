@@ -0,0 +1,175 @@
+"""Unit tests for `pybet365.cli` modules."""
+import csv
+import io
+import json
+
+import mock
+import requests
+
+from click.testing import CliRunner
+from unittest import TestCase
+
+from pybet365.cli import main, page_count, parse_params
+from pybet365.export import CsvWriter, flatten_record, records_of
+
+from tests.mocks import MockRequestsResponse
+from tests.utils import _resolve_relative_path
+
+
+class TestCli(TestCase):
+    """Unit tests for the `pybet365` command group."""
+
+    def setUp(self) -> None:
+        """Instantiate CliRunner."""
+        self.runner = CliRunner()
+        self.credentials = ["--api-host", "host", "--api-key", "key"]
+
+    @mock.patch.object(requests, "get")
+    def test_upcoming_ndjson(self, mock_api_response):
+        """Unit test for `pybet365 upcoming`."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+
+        result = self.runner.invoke(
+            main, self.credentials + ["upcoming", "--sport-id", "92"]
+        )
+
+        assert result.exit_code == 0
+        record = json.loads(result.output.splitlines()[0])
+        assert record["id"] == "88107197"
+
+    @mock.patch.object(requests, "get")
+    def test_result_csv_fan_out(self, mock_api_response):
+        """Unit test for `pybet365 result` with several ids."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+
+        result = self.runner.invoke(
+            main,
+            self.credentials + ["--format", "csv", "result", "1", "2", "3"],
+        )
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert "league.name" in lines[0]
+        assert len(lines) == 4
+        assert mock_api_response.call_count == 3
+
+    @mock.patch.object(requests, "get")
+    def test_inplay_stream(self, mock_api_response):
+        """Unit test for `pybet365 inplay --stream`."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+
+        result = self.runner.invoke(
+            main, self.credentials + ["inplay", "--stream"]
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output)["id"] == "88107197"
+
+    @mock.patch.object(requests, "get")
+    def test_inplay_stream_filtered(self, mock_api_response):
+        """Unit test for `--stream` rejecting sport / league filters."""
+        result = self.runner.invoke(
+            main, self.credentials + ["inplay", "--stream", "--sport-id", "1"]
+        )
+
+        assert result.exit_code == 2
+        assert "--stream cannot be combined" in result.output
+        assert not mock_api_response.called
+
+    def test_missing_credentials(self):
+        """Unit test for commands requiring credentials."""
+        result = self.runner.invoke(main, ["inplay"], env={
+            "BET365_HOST": "", "BET365_KEY": ""
+        })
+
+        assert result.exit_code != 0
+
+    def test_bench_payload(self):
+        """Unit test for `pybet365 bench --payload`."""
+        path = _resolve_relative_path(
+            "testData/upcoming_events_table_tennis.json"
+        )
+
+        result = self.runner.invoke(
+            main, ["bench", "upcoming", "-n", "3", "--payload", path]
+        )
+
+        assert result.exit_code == 0
+        summary = json.loads(result.output)
+        assert summary["mode"] == "decode"
+        assert summary["calls"] == 3
+
+    @mock.patch.object(requests, "get")
+    def test_profile(self, mock_api_response):
+        """Unit test for `--profile` stage timings."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+
+        result = self.runner.invoke(
+            main,
+            self.credentials + ["--profile", "upcoming", "--sport-id", "92"],
+        )
+
+        assert result.exit_code == 0
+        assert "request" in result.output
+        assert "network_ms" in result.output
+
+
+class TestCliHelpers(TestCase):
+    """Unit tests for cli helper functions."""
+
+    def test_records_of_nested(self):
+        """Unit test for `records_of` flattening raw list records."""
+        response = {"results": [[{"type": "EV"}, {"type": "MA"}]]}
+
+        assert [r["type"] for r in records_of(response)] == ["EV", "MA"]
+
+    def test_page_count(self):
+        """Unit test for `page_count`."""
+        response = {"pager": {"page": 1, "per_page": 50, "total": 102}}
+
+        assert page_count(response) == 3
+
+    def test_parse_params(self):
+        """Unit test for `parse_params`."""
+        assert parse_params(["sport_id=1", "day=20200101"]) == {
+            "sport_id": "1", "day": "20200101"
+        }
+
+    def test_flatten_record(self):
+        """Unit test for `flatten_record`."""
+        result = flatten_record({"id": "1", "home": {"id": "2"}, "ss": None})
+
+        assert result == {"id": "1", "home.id": "2", "ss": None}
+
+    def test_csv_union_of_columns(self):
+        """Unit test for `CsvWriter` keeping late optional columns."""
+        stream = io.StringIO()
+        writer = CsvWriter(stream, spool_bytes=16)
+        writer.write_many([
+            {"id": "1"},
+            {"id": "2", "ss": "1-0", "extra": {"round": "3"}},
+        ])
+        writer.close()
+
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert list(rows[0]) == ["id", "ss", "extra.round"]
+        assert rows[0] == {"id": "1", "ss": "", "extra.round": ""}
+        assert rows[1] == {"id": "2", "ss": "1-0", "extra.round": "3"}
+
+    def test_csv_fieldnames(self):
+        """Unit test for `CsvWriter` rejecting columns not declared."""
+        stream = io.StringIO()
+        writer = CsvWriter(stream, fieldnames=["id", "ss"])
+        writer.write({"id": "1"})
+
+        with self.assertRaises(ValueError):
+            writer.write({"id": "2", "timer": {"tm": 5}})
+        assert stream.getvalue().splitlines() == ["id,ss", "1,"]
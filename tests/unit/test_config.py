@@ -0,0 +1,43 @@
+"""Unit tests for `pybet365.client.config` modules."""
+from unittest import TestCase
+
+from pybet365.client.config import Bet365SportId
+
+
+class TestBet365SportId(TestCase):
+    """Unit tests for Bet365SportId lookups."""
+
+    def test_from_sport_id(self):
+        """Unit test for `Bet365SportId.from_sport_id`."""
+        result = Bet365SportId.from_sport_id("18")
+
+        assert result is Bet365SportId.BASKETBALL
+
+    def test_from_sport_id_int(self):
+        """Unit test for `Bet365SportId.from_sport_id` with an `int`."""
+        result = Bet365SportId.from_sport_id(92)
+
+        assert result is Bet365SportId.TABLE_TENNIS
+
+    def test_from_sport_id_unknown(self):
+        """Unit test for `Bet365SportId.from_sport_id` unknown id."""
+        assert Bet365SportId.from_sport_id("99999") is None
+        assert Bet365SportId.from_sport_id(None) is None
+
+    def test_from_pretty(self):
+        """Unit test for `Bet365SportId.from_pretty`."""
+        result = Bet365SportId.from_pretty("soccer")
+
+        assert result is Bet365SportId.SOCCER
+
+    def test_index_is_read_only(self):
+        """Unit test for immutability of the lookup index."""
+        with self.assertRaises(TypeError):
+            Bet365SportId._SPORT_ID_INDEX["1"] = None
+
+    def test_list(self):
+        """Unit test for `Bet365SportId.list`."""
+        result = Bet365SportId.list()
+
+        assert result[0] == ("1", "soccer")
+        assert len(result) == len(Bet365SportId)
@@ -0,0 +1,102 @@
+"""Unit tests for `pybet365.feed` modules."""
+import copy
+
+import pytest
+
+from unittest import TestCase
+
+from pybet365.feed import FeedState, node_key
+from pybet365.synthetic import SyntheticGenerator
+
+
+def events(body: dict) -> list:
+    """Records of a raw `inplay` body split per event (at each "CL")."""
+    split = []
+    for record in body["results"][0]:
+        if record["type"] == "CL":
+            split.append([])
+        split[-1].append(record)
+
+    return split
+
+
+class TestFeedState(TestCase):
+    """Unit tests for `FeedState`."""
+
+    def setUp(self) -> None:
+        """State loaded with an `inplay` snapshot."""
+        self.inplay = SyntheticGenerator().payload("inplay", 20)
+        self.state = FeedState()
+        self.changes = self.state.apply(self.inplay, snapshot=True)
+
+    def test_tree(self):
+        """Unit test for parents resolved from record order."""
+        records = events(self.inplay)[0]
+        cl, ct, ev, ma, pa = (
+            self.state.get(node_key(record)) for record in records[:5]
+        )
+
+        assert (cl.parent, ct.parent, ev.parent) == (None, cl, ct)
+        assert (ma.parent, pa.parent) == (ev, ma)
+        assert pa.ancestor("EV") is ev and pa.get("OD") == records[4]["OD"]
+        assert {change.op for change in self.changes} == {"insert"}
+        assert len(self.changes) == len(self.state)
+        assert len(self.state.nodes("EV")) == 20
+
+    def test_unchanged_poll(self):
+        """Unit test for a repeated poll applying nothing."""
+        assert self.state.apply(self.inplay, snapshot=True) == []
+
+    def test_update(self):
+        """Unit test for changed fields only."""
+        updates = []
+        self.state.on("update", updates.append)
+        poll = SyntheticGenerator().payload("event", 1)
+        poll["results"][0][3].update(OD="99/1", SU="1")
+
+        changes = self.state.apply(poll, snapshot=True)
+
+        assert updates == changes and len(changes) == 1
+        assert changes[0].fields == {"OD": "99/1", "SU": "1"}
+        assert changes[0].previous["SU"] == "0"
+        # NOTE: the "EV" of an `in_play_odds` body keeps its competition
+        ev = self.state.get(node_key(poll["results"][0][0]))
+        assert ev.parent.type == "CT"
+
+    def test_snapshot_deletes(self):
+        """Unit test for topics missing from a snapshot."""
+        deleted = []
+        self.state.on("delete", deleted.append)
+        poll = events(copy.deepcopy(self.inplay))
+        gone = poll.pop(3)
+        dropped = poll[0].pop()
+
+        self.state.apply(poll, snapshot=True)
+
+        keys = [change.key for change in deleted]
+        ev, last = node_key(gone[2]), node_key(gone[-1])
+        assert node_key(dropped) in keys and ev in keys
+        assert keys.index(last) < keys.index(ev)
+        assert ev not in self.state and last not in self.state
+        assert node_key(poll[0][-1]) in self.state
+
+    def test_deltas(self):
+        """Unit test for pushed update / delete operations."""
+        records = events(self.inplay)[0]
+        market = node_key(records[3])
+
+        assert self.state.update(node_key(records[4]), {"OD": "1/2"})
+        assert self.state.update(node_key(records[4]), {"OD": "1/2"}) is None
+        # NOTE: the market and its 3 selections
+        assert len(self.state.delete(market)) == 4
+        assert self.state.delete(market) == []
+        with pytest.raises(KeyError):
+            self.state.update(market, {})
+        with pytest.raises(ValueError):
+            self.state.on("upsert", print)
+
+    def test_to_records(self):
+        """Unit test for rebuilding an event body from the tree."""
+        records = events(self.inplay)[5][2:]
+
+        assert self.state.to_records(node_key(records[0])) == records
@@ -0,0 +1,144 @@
+"""Unit tests for `pybet365.client.hooks` modules."""
+import mock
+import pytest
+import requests
+
+from requests import HTTPError
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.client.hooks import Hooks, MetricsHook, OpenTelemetryHook
+
+from tests.mocks import MockRequestsResponse
+
+
+class FakeSpan(object):
+    """Minimal span recording calls."""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.ended = False
+        self.events = []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, attributes=None):
+        self.events.append(name)
+
+    def record_exception(self, exc):
+        self.events.append("exception")
+
+    def end(self):
+        self.ended = True
+
+
+class FakeTracer(object):
+    """Minimal tracer handing out `FakeSpan` objects."""
+
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        span = FakeSpan(name, attributes or {})
+        self.spans.append(span)
+        return span
+
+
+class TestHooks(TestCase):
+    """Unit tests for Hooks dispatch from `Bet365._get`."""
+
+    def setUp(self) -> None:
+        """Instantiate Bet365 with hooks."""
+        self.hooks = Hooks()
+        self.test_client = Bet365(
+            api_host="you-will-never-guess",
+            api_key="you-will-never-guess",
+            hooks=self.hooks,
+        )
+
+    def test_disabled_by_default(self):
+        """Unit test for an empty `Hooks` being falsy."""
+        assert not Bet365(api_host="h", api_key="k").hooks
+
+    def test_unknown_event(self):
+        """Unit test for `Hooks.on` unknown event."""
+        with pytest.raises(ValueError):
+            self.hooks.on("nope", print)
+
+    @mock.patch.object(requests, "get")
+    def test_request_events(self, mock_api_response):
+        """Unit test for request lifecycle events."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+        seen = []
+        for event in ("request_start", "decode", "request_end"):
+            self.hooks.on(event, lambda ctx, e=event: seen.append((e, ctx)))
+
+        self.test_client.upcoming_events(sport_id="92")
+
+        assert [e for e, _ in seen] == [
+            "request_start", "decode", "request_end"
+        ]
+        ctx = seen[-1][1]
+        assert ctx.endpoint == "upcoming"
+        assert ctx.status == 200
+        assert ctx.payload_bytes > 0
+        assert ctx.decode_time is not None
+        assert ctx.facade_time is not None
+        assert ctx.elapsed >= ctx.decode_time
+
+    @mock.patch.object(requests, "get")
+    def test_error_event(self, mock_api_response):
+        """Unit test for `error` event on failing request."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath=None, status=429
+        )
+        errors = []
+        self.hooks.on("error", errors.append)
+
+        with pytest.raises(HTTPError):
+            self.test_client.result(event_id="1")
+
+        assert errors[0].status == 429
+
+    @mock.patch.object(requests, "get")
+    def test_metrics_hook(self, mock_api_response):
+        """Unit test for `MetricsHook` counters and exposition."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+        metrics = MetricsHook()
+        self.hooks.add(metrics)
+
+        self.test_client.upcoming_events(sport_id="92")
+        self.test_client.upcoming_events(sport_id="92")
+
+        assert metrics.requests[("upcoming", "200")] == 2
+        rendered = metrics.render()
+        assert 'pybet365_requests_total{endpoint="upcoming",status="200"} 2' \
+            in rendered
+        assert 'pybet365_request_seconds_count{endpoint="upcoming"} 2' \
+            in rendered
+
+        self.hooks.remove(metrics)
+        assert not self.hooks
+
+    @mock.patch.object(requests, "get")
+    def test_open_telemetry_hook(self, mock_api_response):
+        """Unit test for `OpenTelemetryHook` spans."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+        tracer = FakeTracer()
+        self.hooks.add(OpenTelemetryHook(tracer=tracer))
+
+        self.test_client.upcoming_events(sport_id="92")
+
+        span = tracer.spans[0]
+        assert span.name == "bet365.upcoming"
+        assert span.ended
+        assert span.attributes["http.status_code"] == 200
@@ -0,0 +1,157 @@
+"""Unit tests for `pybet365.hub` modules."""
+import threading
+import time
+
+import mock
+import pytest
+
+from unittest import TestCase
+
+from pybet365.hub import Subscription, SubscriptionHub, Update
+
+
+def odds_payload(fi, price):
+    """Raw `in_play_odds` body of one selection."""
+    return {
+        "success": 1,
+        "results": [[
+            {"type": "EV", "FI": fi},
+            {"type": "MA", "ID": "1777", "NA": "Fulltime Result"},
+            {"type": "PA", "ID": fi + "1", "OD": price},
+        ]],
+    }
+
+
+class StubClient(object):
+    """Counts upstream calls, prices change on every poll."""
+
+    def __init__(self, live=()):
+        """Constructor for StubClient."""
+        self.calls = {}
+        self.live = list(live)
+        self.lock = threading.Lock()
+
+    def in_play_odds(self, fi):
+        """Fake `in_play_odds`."""
+        with self.lock:
+            self.calls[fi] = self.calls.get(fi, 0) + 1
+            return odds_payload(fi, "{}/1".format(self.calls[fi]))
+
+    def in_play_filter(self, sport_id=None, league_id=None):
+        """Fake `in_play_filter`."""
+        return {"success": 1, "results": [
+            {"id": fi, "sport_id": sport_id} for fi in self.live
+        ]}
+
+
+def wait_for(predicate, timeout=2.0):
+    """Poll `predicate` until true."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestSubscriptionHub(TestCase):
+    """Unit tests for SubscriptionHub."""
+
+    def test_one_upstream_poll_per_fi(self):
+        """Unit test for shared, reference counted polling."""
+        client = StubClient()
+        hub = SubscriptionHub(client, interval=60.0)
+        first = hub.subscribe(fis=["1", "2"])
+        second = hub.subscribe(fis=["2"])
+        assert hub.refcount("2") == 2
+
+        with hub:
+
+            fis = sorted(first.get(timeout=1).fi for _ in range(2))
+            update = second.get(timeout=1)
+            assert fis == ["1", "2"]
+            assert update.fi == "2"
+            assert update.selections[0][6] == 2.0
+            assert client.calls == {"1": 1, "2": 1}
+
+            first.close()
+            assert hub.polled_fis() == frozenset(["2"])
+            second.close()
+            assert hub.polled_fis() == frozenset()
+
+    def test_sport_listing(self):
+        """Unit test for sport subscriptions following `in_play_filter`."""
+        client = StubClient(live=["7"])
+        with SubscriptionHub(
+            client, interval=0.01, discover_interval=0.01
+        ) as hub:
+            subscription = hub.subscribe(sports=["1"])
+            assert subscription.get(timeout=1).fi == "7"
+
+            client.live = ["8"]
+            assert wait_for(lambda: hub.polled_fis() == frozenset(["8"]))
+            kinds = set()
+            while True:
+                update = subscription.get(timeout=0.2)
+                if update is None or ("removed", "7") in kinds:
+                    break
+                kinds.add((update.kind, update.fi))
+            assert ("removed", "7") in kinds
+
+    def test_unchanged_payload_not_multicast(self):
+        """Unit test for identical payloads being skipped."""
+        client = mock.Mock()
+        client.in_play_odds.return_value = odds_payload("1", "2/1")
+        with SubscriptionHub(client, interval=0.01) as hub:
+            subscription = hub.subscribe(fis=["1"])
+            assert subscription.get(timeout=1) is not None
+            assert wait_for(lambda: client.in_play_odds.call_count > 3)
+            assert subscription.get(timeout=0.05) is None
+
+
+class TestSubscription(TestCase):
+    """Unit tests for Subscription queue policies."""
+
+    def queue(self, policy):
+        """Subscription of size 2 filled with 3 updates."""
+        subscription = Subscription(mock.Mock(), maxsize=2, policy=policy)
+        for fi in ("a", "b", "c"):
+            subscription.put(Update(fi, "odds"))
+        return subscription
+
+    def test_coalesce(self):
+        """Unit test for the latest update per FI being kept."""
+        subscription = Subscription(mock.Mock(), maxsize=2)
+        first, latest = Update("a", "odds"), Update("a", "odds")
+        subscription.put(first)
+        subscription.put(latest)
+
+        assert len(subscription) == 1
+        assert subscription.get() is latest
+        assert subscription.coalesced == 1
+
+    def test_drop_oldest(self):
+        """Unit test for the oldest update being dropped."""
+        subscription = self.queue("drop_oldest")
+
+        assert [subscription.get().fi for _ in range(2)] == ["b", "c"]
+        assert subscription.dropped == 1
+
+    def test_drop_newest(self):
+        """Unit test for the incoming update being dropped."""
+        subscription = self.queue("drop_newest")
+
+        assert [subscription.get().fi for _ in range(2)] == ["a", "b"]
+
+    def test_close_stops_iteration(self):
+        """Unit test for closing waking a blocked consumer."""
+        subscription = Subscription(mock.Mock())
+        threading.Timer(0.05, subscription.close).start()
+
+        assert list(subscription) == []
+        subscription.hub.unsubscribe.assert_called_once_with(subscription)
+
+    def test_unknown_policy(self):
+        """Unit test for unknown policies."""
+        with pytest.raises(ValueError):
+            Subscription(mock.Mock(), policy="block")
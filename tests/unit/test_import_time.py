@@ -0,0 +1,75 @@
+"""Import-time budget guard for `pybet365`."""
+import json
+import subprocess
+import sys
+
+from unittest import TestCase
+
+# NOTE: generous ceiling for the package's own import work (seconds),
+# regressions that re-introduce eager imports blow well past it
+IMPORT_BUDGET = 0.05
+
+HEAVY_MODULES = (
+    "requests",
+    "pybet365.client.client",
+    "pybet365.client.mnemonic",
+    "pybet365.response",
+)
+
+
+def _run(code: str) -> str:
+    """Run `code` in a fresh interpreter and return stdout."""
+    return subprocess.check_output([sys.executable, "-c", code]).decode()
+
+
+def _import_time(module: str) -> float:
+    """Cumulative `-X importtime` seconds of `module`."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stderr=subprocess.PIPE,
+        check=True,
+    ).stderr.decode()
+
+    for line in output.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+
+    raise AssertionError("{} missing from importtime output".format(module))
+
+
+class TestImportTime(TestCase):
+    """Cold start guards for `import pybet365`."""
+
+    def test_import_is_lazy(self):
+        """`import pybet365` must not import heavy modules."""
+        loaded = json.loads(_run(
+            "import json, sys, pybet365; "
+            "print(json.dumps(sorted(sys.modules)))"
+        ))
+
+        for module in HEAVY_MODULES:
+            assert module not in loaded, module
+
+    def test_sport_id_without_requests(self):
+        """`Bet365SportId` resolves without importing `requests`."""
+        loaded = json.loads(_run(
+            "import json, sys, pybet365; pybet365.Bet365SportId; "
+            "print(json.dumps(sorted(sys.modules)))"
+        ))
+
+        assert "requests" not in loaded
+        assert "pybet365.client.mnemonic" not in loaded
+
+    def test_lazy_members_resolve(self):
+        """Lazy members resolve to the real objects."""
+        import pybet365
+        from pybet365.client.client import Bet365
+        from pybet365.client.config import Bet365Mnemonic
+
+        assert pybet365.Bet365 is Bet365
+        assert Bet365Mnemonic("OD").name == "ODDS"
+
+    def test_import_budget(self):
+        """`import pybet365` stays within `IMPORT_BUDGET`."""
+        assert _import_time("pybet365") < IMPORT_BUDGET
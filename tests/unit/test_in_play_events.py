@@ -0,0 +1,30 @@
+"""Unit tests for `pybet365.response.in_play_events` modules."""
+from unittest import TestCase
+
+from pybet365.response.in_play_events import (
+    InPlayEventsResponse,
+    InPlayResult,
+)
+
+
+class TestInPlayEventsResponse(TestCase):
+    """Unit tests for InPlayEventsResponse."""
+
+    def test_flat_results(self):
+        """Unit test for `results` of a flat body."""
+        response = InPlayEventsResponse(
+            {"success": 1, "results": [{"type": "EV"}, {"type": "MA"}]}
+        )
+
+        assert [r.type for r in response.results] == ["EV", "MA"]
+
+    def test_raw_nested_results(self):
+        """Unit test for `results` of a raw body nesting its records."""
+        response = InPlayEventsResponse({
+            "success": 1,
+            "results": [[{"type": "CL"}, {"type": "EV"}], [{"type": "PA"}]],
+        })
+
+        results = response.results
+        assert [r.type for r in results] == ["CL", "EV", "PA"]
+        assert all(isinstance(r, InPlayResult) for r in results)
@@ -0,0 +1,82 @@
+"""Unit tests for `pybet365.response.intern` modules."""
+import json
+
+import mock
+import requests
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.response.intern import InternTable
+
+from tests.mocks import MockRequestsResponse
+
+
+class TestInternTable(TestCase):
+    """Unit tests for InternTable."""
+
+    def setUp(self) -> None:
+        """Instantiate InternTable."""
+        self.test_client = InternTable()
+        self.body = json.dumps({"results": [{
+            "id": "88107197",
+            "sport_id": "92",
+            "league": {"id": "10036652", "name": "Moscow Liga Pro"},
+        }]})
+
+    def _decode(self):
+        return json.loads(self.body, object_hook=self.test_client.object_hook)
+
+    def test_object_hook_shares_values(self):
+        """Unit test for values shared across decodes."""
+        first = self._decode()["results"][0]
+        second = self._decode()["results"][0]
+
+        assert first["league"]["name"] is second["league"]["name"]
+        assert first["league"]["id"] is second["league"]["id"]
+        assert first["sport_id"] is second["sport_id"]
+
+    def test_event_id_not_interned(self):
+        """Unit test for unique event ids being left alone."""
+        first = self._decode()["results"][0]
+        second = self._decode()["results"][0]
+
+        assert first["id"] == second["id"]
+        assert first["id"] is not second["id"]
+
+    def test_bounded(self):
+        """Unit test for `max_size` recycling."""
+        table = InternTable(max_size=4)
+        for value in ("a", "b", "c", "d", "e", "f"):
+            table.intern("x" + value)
+
+        assert len(table) <= 4
+        assert table.recycles == 1
+
+    def test_intern_payload(self):
+        """Unit test for `InternTable.intern_payload`."""
+        first = self.test_client.intern_payload(json.loads(self.body))
+        second = self.test_client.intern_payload(json.loads(self.body))
+
+        assert first == json.loads(self.body)
+        assert first["results"][0]["league"]["name"] is \
+            second["results"][0]["league"]["name"]
+
+
+class TestClientInterning(TestCase):
+    """Unit tests for `Bet365(intern=...)`."""
+
+    @mock.patch.object(requests, "get")
+    def test_client_interns(self, mock_api_response):
+        """Unit test for interning through `Bet365._get`."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+        table = InternTable()
+        client = Bet365(api_host="host", api_key="key", intern=table)
+
+        first = client.upcoming_events(sport_id="92").results[0]
+        second = client.upcoming_events(sport_id="92").results[0]
+
+        assert first.league.name is second.league.name
+        assert table.hits > 0
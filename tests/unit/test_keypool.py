@@ -0,0 +1,160 @@
+"""Unit tests for `pybet365.client.keypool` modules."""
+import mock
+import pytest
+import requests
+
+from requests import HTTPError
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.client.hooks import Hooks
+from pybet365.client.keypool import Credential, KeyPool, KeyPoolExhausted
+
+from tests.mocks import MockRequestsResponse
+
+FIXTURE = "testData/upcoming_events_table_tennis.json"
+
+
+class FakeClock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestKeyPool(TestCase):
+    """Unit tests for KeyPool routing."""
+
+    def setUp(self) -> None:
+        """Instantiate KeyPool."""
+        self.clock = FakeClock()
+        self.test_client = KeyPool(
+            [("host", "key-a"), ("host", "key-b", 3)], clock=self.clock
+        )
+
+    def _take(self, count):
+        keys = []
+        for _ in range(count):
+            credential = self.test_client.acquire()
+            keys.append(credential.key)
+            self.test_client.release(credential, 200)
+        return keys
+
+    def test_weighted_round_robin(self):
+        """Unit test for weights being honoured."""
+        keys = self._take(8)
+
+        assert keys.count("key-a") == 2
+        assert keys.count("key-b") == 6
+
+    def test_least_used(self):
+        """Unit test for `least_used` preferring idle keys."""
+        pool = KeyPool([("h", "key-a"), ("h", "key-b")], strategy="least_used")
+
+        first = pool.acquire()
+        second = pool.acquire()
+
+        assert first is not second
+
+    def test_429_ejects(self):
+        """Unit test for ejection on `429` with `Retry-After`."""
+        credential = self.test_client.acquire()
+        self.test_client.release(credential, 429, {"Retry-After": "30"})
+
+        assert set(self._take(4)) == {"key-a", "key-b"} - {credential.key}
+
+        self.clock.now = 31
+        assert credential.key in self._take(4)
+
+    def test_quota_exhausted(self):
+        """Unit test for ejection when no quota remains."""
+        credential = self.test_client.acquire()
+        self.test_client.release(credential, 200, {
+            "x-ratelimit-requests-remaining": "0",
+            "x-ratelimit-requests-limit": "500",
+            "x-ratelimit-requests-reset": "100",
+        })
+
+        assert credential.limit == 500
+        assert credential.key not in self._take(4)
+
+    def test_all_ejected(self):
+        """Unit test for `KeyPoolExhausted`."""
+        for credential in self.test_client.credentials:
+            self.test_client.eject(credential, 10)
+
+        with pytest.raises(KeyPoolExhausted) as err:
+            self.test_client.acquire()
+
+        assert err.value.retry_after == 10
+
+    def test_invalid(self):
+        """Unit test for invalid construction."""
+        with pytest.raises(ValueError):
+            KeyPool([])
+        with pytest.raises(ValueError):
+            KeyPool([Credential("h", "k")], strategy="random")
+
+
+class TestClientKeyPool(TestCase):
+    """Unit tests for `Bet365(key_pool=...)`."""
+
+    def setUp(self) -> None:
+        """Instantiate Bet365 with a pool."""
+        self.pool = KeyPool([("host", "key-a"), ("host", "key-b")])
+        self.hooks = Hooks()
+        self.test_client = Bet365(key_pool=self.pool, hooks=self.hooks)
+
+    @mock.patch.object(requests, "get")
+    def test_retry_on_429(self, mock_api_response):
+        """Unit test for a `429` being retried on the next key."""
+        mock_api_response.side_effect = [
+            MockRequestsResponse(filepath=None, status=429),
+            MockRequestsResponse(
+                filepath=FIXTURE
+            ),
+        ]
+        retries = []
+        self.hooks.on("retry", retries.append)
+
+        result = self.test_client.upcoming_events(sport_id="92")
+
+        assert result.results[0].id == "88107197"
+        used = [c[1]["headers"]["x-rapidapi-key"]
+                for c in mock_api_response.call_args_list]
+        assert used[0] != used[1]
+        assert retries[0].attempt == 2
+
+    @mock.patch.object(requests, "get")
+    def test_retry_keeps_validators(self, mock_api_response):
+        """Unit test for cache validators surviving a `429` retry."""
+        mock_api_response.side_effect = [
+            MockRequestsResponse(filepath=FIXTURE, headers={"ETag": '"v1"'}),
+            MockRequestsResponse(filepath=None, status=429),
+            MockRequestsResponse(filepath=None, status=304),
+        ]
+        client = Bet365(key_pool=self.pool, cache=True)
+
+        first = client.upcoming_events(sport_id="92")
+        second = client.upcoming_events(sport_id="92")
+
+        sent = [c[1]["headers"] for c in mock_api_response.call_args_list]
+        assert sent[1]["If-None-Match"] == sent[2]["If-None-Match"] == '"v1"'
+        assert sent[1]["x-rapidapi-key"] != sent[2]["x-rapidapi-key"]
+        assert second is first and client.cache.not_modified == 1
+
+    @mock.patch.object(requests, "get")
+    def test_all_429(self, mock_api_response):
+        """Unit test for the last `429` surfacing as `HTTPError`."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath=None, status=429
+        )
+
+        with pytest.raises(HTTPError):
+            self.test_client.result(event_id="1")
+
+        assert mock_api_response.call_count == 2
@@ -0,0 +1,61 @@
+"""Unit tests for `pybet365.response.markets` modules."""
+import math
+
+from unittest import TestCase
+
+from pybet365.response import PreMatchOddsResponse
+from pybet365.response.markets import to_decimal_odds
+
+from tests.utils import load_json
+
+
+class TestMarketTable(TestCase):
+    """Unit tests for `normalize_prematch` / MarketTable."""
+
+    def setUp(self) -> None:
+        """Normalize the soccer pre-match fixture."""
+        self.test_client = PreMatchOddsResponse(
+            load_json("testData/pre_match_odds_soccer.json")
+        ).markets()
+
+    def test_rows(self):
+        """Unit test for one row per selection."""
+        assert len(self.test_client) == 8
+
+    def test_select_market_by_name_and_key(self):
+        """Unit test for the market index."""
+        by_name = self.test_client.select(market="Full Time Result")
+        by_key = self.test_client.select(market="full_time_result")
+
+        assert [r["selection_id"] for r in by_name] == [
+            r["selection_id"] for r in by_key
+        ]
+        assert [r["fi"] for r in by_name] == ["88232938"] * 3 + [
+            "88232939"
+        ] * 3
+
+    def test_select_market_and_fi(self):
+        """Unit test for combined filters."""
+        rows = self.test_client.select(market="Asian Handicap", fi="88232938")
+
+        assert [r["selection"] for r in rows] == ["1", "2"]
+        assert rows[0]["handicap"] == -0.5
+        assert rows[0]["group"] == "asian_lines"
+
+    def test_fractional_odds(self):
+        """Unit test for fractional prices converted to decimal."""
+        row = self.test_client.select(market="Full Time Result")[2]
+
+        assert row["odds"] == 3.75
+        assert math.isnan(row["handicap"])
+
+    def test_unknown_market(self):
+        """Unit test for an unknown market."""
+        assert self.test_client.select(market="Nope") == []
+
+    def test_to_decimal_odds(self):
+        """Unit test for `to_decimal_odds`."""
+        assert to_decimal_odds("2.5") == 2.5
+        assert to_decimal_odds("1/2") == 1.5
+        assert math.isnan(to_decimal_odds("SP"))
+        assert math.isnan(to_decimal_odds(None))
@@ -0,0 +1,120 @@
+"""Unit tests for `pybet365.mock_server` modules."""
+import socket
+
+import pytest
+
+from requests import HTTPError
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.client.keypool import KeyPool, KeyPoolExhausted
+from pybet365.mock_server import MockBet365Server
+
+
+class TestMockBet365Server(TestCase):
+    """Unit tests for MockBet365Server."""
+
+    def client(self, server, **kwargs):
+        """Client pointed at `server`."""
+        kwargs.setdefault("api_key", "key-1")
+        return Bet365(api_host="mock", base_url=server.url, **kwargs)
+
+    def test_endpoints(self):
+        """Unit test for every endpoint being served."""
+        with MockBet365Server(records=120).run_in_thread() as server:
+            client = self.client(server)
+            upcoming = client.upcoming_events(sport_id="1", page="3")
+            results = client.result(event_id="1,2")
+            prematch = client.pre_match_odds(fi="1")
+            odds = client.in_play_odds(fi="1")
+            client.in_play_events()
+            client.in_play_filter(sport_id="1")
+
+        assert upcoming.pager.page == 3
+        assert len(upcoming.results) == 20
+        assert [r.id for r in results.results] == ["1", "2"]
+        assert len(prematch.results) == 120
+        assert odds["results"][0][0]["type"] == "EV"
+        assert server.stats()["statuses"] == {200: 6}
+
+    def test_streamed_payload(self):
+        """Unit test for large payloads sent chunked."""
+        with MockBet365Server(records=1500).run_in_thread() as server:
+            response = self.client(server).result(event_id=None)
+
+        assert len(response.results) == 1500
+        assert response.results[0].time_status in (
+            "3", "4", "5", "6", "7", "8", "9", "99"
+        )
+
+    def test_unknown_endpoint(self):
+        """Unit test for `404` on unknown paths."""
+        with MockBet365Server().run_in_thread() as server:
+            with pytest.raises(HTTPError):
+                self.client(server)._get("nope", {})
+
+    def test_shutdown_closes_connections(self):
+        """Unit test for keep-alive connections closed on exit."""
+        with MockBet365Server().run_in_thread() as server:
+            sock = socket.create_connection((server.host, server.port))
+            sock.sendall(
+                b"GET /v1/bet365/inplay HTTP/1.1\r\nHost: mock\r\n\r\n"
+            )
+            assert sock.recv(12) == b"HTTP/1.1 200"
+
+        sock.settimeout(5)
+        with sock:
+            while sock.recv(65536):
+                pass
+
+    def test_error_rate(self):
+        """Unit test for injected `500` errors."""
+        with MockBet365Server(error_rate=1.0).run_in_thread() as server:
+            with pytest.raises(HTTPError):
+                self.client(server).in_play_events()
+
+    def test_quota(self):
+        """Unit test for `429` once the key quota is used."""
+        with MockBet365Server(quota=1).run_in_thread() as server:
+            client = self.client(server)
+            client.in_play_events()
+            with pytest.raises(HTTPError):
+                client.in_play_events()
+
+        assert server.stats()["statuses"] == {200: 1, 429: 1}
+
+    def test_fractional_rate_limit(self):
+        """Unit test for a rate limit below one request per second."""
+        server = MockBet365Server(rate_limit=0.5)
+        limited = [server._throttle("key-1", {}) for _ in range(3)]
+        extra = {}
+
+        assert limited == [False, True, True]
+        assert server._throttle("key-2", extra) is False
+        assert server._throttle("key-2", extra) is True
+        assert 1.0 < float(extra["Retry-After"]) <= 2.0
+
+    def test_quota_rotates_key_pool(self):
+        """Unit test for quota headers ejecting keys of a pool."""
+        pool = KeyPool([("mock", "key-1"), ("mock", "key-2")])
+        with MockBet365Server(quota=1).run_in_thread() as server:
+            client = Bet365(key_pool=pool, base_url=server.url)
+            client.in_play_events()
+            client.in_play_events()
+            with pytest.raises(KeyPoolExhausted):
+                client.in_play_events()
+
+        assert server.stats()["statuses"] == {200: 2}
+        assert [c.remaining for c in pool.credentials] == [0, 0]
+
+    def test_etag_not_modified(self):
+        """Unit test for `304` revalidation with the client cache."""
+        with MockBet365Server().run_in_thread() as server:
+            client = self.client(server, cache=True)
+            first = client.upcoming_events(sport_id="1")
+            second = client.upcoming_events(sport_id="1")
+
+        assert first is second
+        assert client.cache.not_modified == 1
+        assert server.stats()["statuses"] == {200: 1, 304: 1}
@@ -0,0 +1,92 @@
+"""Unit tests for `pybet365.response.models` modules."""
+from unittest import TestCase
+
+from pybet365.client.config import Bet365SportId
+from pybet365.response import ResultResponse, UpcomingEventsResponse
+from pybet365.response.models import MetaModel, ResultModel, to_int
+
+from benchmarks.bench_memory import build_payload, retained
+
+from tests.utils import load_json
+
+
+class TestUpcomingEventModel(TestCase):
+    """Unit tests for UpcomingEventModel."""
+
+    def setUp(self) -> None:
+        """Instantiate models from the table tennis fixture."""
+        response = UpcomingEventsResponse(
+            load_json("testData/upcoming_events_table_tennis.json")
+        )
+        self.test_client = response.to_models()[0]
+
+    def test_fields(self):
+        """Unit test for decoded fields."""
+        assert self.test_client.id == "88107197"
+        assert self.test_client.time == 1586480400
+        assert self.test_client.updated_at == 1586478473
+        assert self.test_client.ss is None
+        assert self.test_client.sport is Bet365SportId.TABLE_TENNIS
+
+    def test_meta(self):
+        """Unit test for nested `MetaModel`."""
+        assert isinstance(self.test_client.home, MetaModel)
+        assert self.test_client.home.name == "Evgenii Kryuchkov"
+
+    def test_slots(self):
+        """Unit test for models having no `__dict__`."""
+        assert not hasattr(self.test_client, "__dict__")
+
+    def test_to_dict(self):
+        """Unit test for `Model.to_dict`."""
+        result = self.test_client.to_dict()
+
+        assert result["league"]["name"] == "Moscow Liga Pro"
+        assert result["our_event_id"] == "2297143"
+
+
+class TestResultModel(TestCase):
+    """Unit tests for ResultModel."""
+
+    def test_events_and_timestamps(self):
+        """Unit test for `events` tuple and timestamps."""
+        response = ResultResponse({"success": 1, "results": [{
+            "id": "1",
+            "time": "1581990232",
+            "events": [{"id": "9", "text": "45' - 1st Goal"}],
+            "confirmed_at": "",
+        }]})
+
+        result = response.to_models()[0]
+
+        assert isinstance(result, ResultModel)
+        assert result.events[0].text == "45' - 1st Goal"
+        assert result.time == 1581990232
+        assert result.confirmed_at is None
+
+
+class TestSharedMeta(TestCase):
+    """Unit tests for shared `MetaModel` instances."""
+
+    def test_same_instance(self):
+        """Unit test for `MetaModel.get` sharing."""
+        first = MetaModel.get({"id": "1", "name": "League"})
+        second = MetaModel.get({"id": "1", "name": "League"})
+
+        assert first is second
+
+    def test_to_int(self):
+        """Unit test for `to_int`."""
+        assert to_int("12") == 12
+        assert to_int(None) is None
+        assert to_int("x") is None
+
+
+class TestMemory(TestCase):
+    """Models retain less memory than facades."""
+
+    def test_models_smaller_than_facades(self):
+        """Unit test for the memory benchmark."""
+        body = build_payload(2000)
+
+        assert retained(body, "models") < retained(body, "facades") / 2
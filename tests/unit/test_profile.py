@@ -0,0 +1,81 @@
+"""Unit tests for `pybet365.client.profile` modules."""
+import io
+import tracemalloc
+
+from unittest import TestCase, skipUnless
+
+from pybet365.client.client import Bet365
+from pybet365.mock_server import MockBet365Server
+
+
+class TestProfiler(TestCase):
+    """Unit tests for `Bet365.profile()` / Profiler."""
+
+    def test_profile(self):
+        """Unit test for per endpoint layer breakdowns."""
+        server = MockBet365Server(records=200, latency=0.02)
+        with server.run_in_thread():
+            client = Bet365(api_host="mock", api_key="k", base_url=server.url)
+            with client.profile(slowest=2) as profiler:
+                for _ in range(3):
+                    client.upcoming_events(sport_id="1")
+                client.result(event_id="1,2")
+
+        assert not client.hooks
+        summary = dict((row["endpoint"], row) for row in profiler.summary())
+        assert summary["upcoming"]["calls"] == 3
+        assert summary["result"]["calls"] == 1
+
+        upcoming = summary["upcoming"]
+        assert upcoming["network"] >= 0.06
+        assert upcoming["decode"] > 0
+        assert upcoming["facade"] > 0
+        assert upcoming["results"] > 0
+        assert upcoming["wall"] >= upcoming["network"]
+
+        assert len(profiler.slowest) == 2
+        assert profiler.slowest[0].wall >= profiler.slowest[1].wall
+        assert profiler.top_allocations()
+
+        report = "\n".join(profiler.report())
+        assert "network_ms" in report and "slowest calls" in report
+
+    def test_collapsed_stacks(self):
+        """Unit test for the flamegraph folded output."""
+        server = MockBet365Server(latency=0.05)
+        with server.run_in_thread():
+            client = Bet365(api_host="mock", api_key="k", base_url=server.url)
+            with client.profile(allocations=False) as profiler:
+                client.in_play_events()
+
+        stream = io.StringIO()
+        profiler.dump_collapsed(stream)
+        lines = stream.getvalue().split()
+        assert lines
+        assert stream.getvalue().startswith("inplay;")
+        assert "client.py:_get" in stream.getvalue()
+
+    def test_cached_calls(self):
+        """Unit test for cache hits being flagged."""
+        with MockBet365Server().run_in_thread() as server:
+            client = Bet365(
+                api_host="mock", api_key="k", base_url=server.url, cache=True
+            )
+            with client.profile(sample_interval=None) as profiler:
+                client.in_play_events()
+                client.in_play_events()
+
+        assert profiler.summary()[0]["cached"] == 1
+
+    @skipUnless(hasattr(tracemalloc, "reset_peak"), "requires Python 3.9+")
+    def test_peak_per_call(self):
+        """Unit test for the peak of a call excluding earlier calls."""
+        with MockBet365Server(records=2000).run_in_thread() as server:
+            client = Bet365(api_host="mock", api_key="k", base_url=server.url)
+            with client.profile(sample_interval=None) as profiler:
+                client.in_play_events()
+                client.upcoming_events(sport_id="1")
+
+        summary = dict((row["endpoint"], row) for row in profiler.summary())
+        large, small = summary["inplay"], summary["upcoming"]
+        assert 0 < small["peak_bytes"] < large["peak_bytes"]
@@ -0,0 +1,150 @@
+"""Unit tests for `pybet365.response.query` modules."""
+from datetime import datetime, timezone
+from unittest import TestCase
+
+import mock
+
+from pybet365.response import (
+    PreMatchOddsResponse,
+    Query,
+    Result,
+    ResultResponse,
+    UpcomingEvent,
+    UpcomingEventsResponse,
+)
+from pybet365.synthetic import SyntheticGenerator
+
+from tests.utils import load_json
+
+
+class TestQuery(TestCase):
+    """Unit tests for `Query` and `Bet365Response.query`."""
+
+    def setUp(self) -> None:
+        """Synthetic upcoming and result payloads."""
+        generator = SyntheticGenerator(seed=3, leagues=5, teams=20)
+        self.upcoming = list(generator.records("upcoming", 200))
+        self.results = list(generator.records("result", 200))
+        self.upcoming_response = UpcomingEventsResponse(
+            {"success": 1, "pager": {}, "results": self.upcoming}
+        )
+        self.result_response = ResultResponse(
+            {"success": 1, "results": self.results}
+        )
+
+    def test_matches_comprehension(self):
+        """Unit test for parity with a facade list comprehension."""
+        start = int(self.upcoming[20]["time"])
+        end = int(self.upcoming[120]["time"])
+        expected = [
+            r for r in self.upcoming_response.results
+            if r.league.id == "10002" and start <= int(r.time) <= end
+        ]
+
+        matched = self.upcoming_response.query(
+            league_id="10002", time__between=(start, end)
+        )
+
+        assert matched == expected
+        assert matched and all(isinstance(r, UpcomingEvent) for r in matched)
+
+    def test_facades_only_for_matches(self):
+        """Unit test for rejected records never being wrapped."""
+        target = "pybet365.response.result.ResultResponse.RECORD_FACADE"
+        with mock.patch(target) as facade:
+            self.result_response.query(time_status="3", ss="1-1")
+
+        expected = [
+            r for r in self.results
+            if r["time_status"] == "3" and r["ss"] == "1-1"
+        ]
+        assert facade.call_count == len(expected) > 0
+
+    def test_team_alias(self):
+        """Unit test for `team` matching home or away."""
+        name = self.results[0]["home"]["name"]
+        matched = self.result_response.query(team=name)
+
+        assert matched and all(isinstance(r, Result) for r in matched)
+        assert all(name in (r.home.name, r.away.name) for r in matched)
+        assert len(matched) == sum(
+            name in (r["home"]["name"], r["away"]["name"])
+            for r in self.results
+        )
+
+    def test_operators(self):
+        """Unit test for the comparison and string operators."""
+        record = {
+            "time": "1586480400",
+            "ss": "2-1",
+            "time_status": "3",
+            "league": {"id": "94", "name": "England Premier League"},
+        }
+
+        assert Query(time__gt=1586480399, time__lte=1586480400)(record)
+        assert Query(time=1586480400, time_status__in=("3", "4"))(record)
+        assert Query(time_status__in=[3, 5])(record)
+        assert Query(league__name__icontains="premier")(record)
+        assert Query(league_name__startswith="England")(record)
+        assert Query(ss__regex=r"^\d+-1$", bogus__isnull=True)(record)
+        assert Query(time_status__ne="1")(record)
+        assert Query()(record)
+
+        assert not Query(time__lt=1586480400)(record)
+        assert not Query(league_id="95")(record)
+        assert not Query(home_id="1")(record)
+        assert not Query(ss__contains="3")(record)
+
+    def test_field_names_not_evaluated(self):
+        """Unit test for field names never reaching the generated source."""
+        name = 'x") or print("INJECTED") or r.get("'
+        with mock.patch("builtins.print") as printed:
+            assert not Query(**{name: 1})({})
+            assert Query(**{name: 1})({name: 1})
+
+        assert not printed.called
+
+    def test_string_operators_non_str(self):
+        """Unit test for string operators over non `str` values."""
+        record = {"name": 5, "league": ["premier"]}
+
+        assert not Query(name__icontains="5")(record)
+        assert not Query(name__contains="5", name__startswith="5")(record)
+        assert not Query(league__regex="premier")(record)
+
+    def test_datetime_values(self):
+        """Unit test for `datetime` bounds."""
+        query = Query(time__gte=datetime(2020, 4, 10, 1, tzinfo=timezone.utc))
+
+        assert query({"time": "1586480400"})
+        assert not query({"time": "1586480399"})
+        assert not query({"time": None})
+
+    def test_non_numeric_bound(self):
+        """Unit test for rejecting non numeric bounds."""
+        with self.assertRaises(ValueError):
+            Query(time__gt="soon")
+
+    def test_mask_matches_predicate(self):
+        """Unit test for the columnar mask of flattened records."""
+        query = Query(league_id__in=("10001", "10003"), time__gte=1586484000)
+        columns = {
+            "league.id": [r["league"]["id"] for r in self.upcoming],
+            "time": [r["time"] for r in self.upcoming],
+        }
+
+        assert list(query.mask(columns)) == [query(r) for r in self.upcoming]
+
+    def test_market_table_query(self):
+        """Unit test for the vectorized `MarketTable.query`."""
+        table = PreMatchOddsResponse(
+            load_json("testData/pre_match_odds_soccer.json")
+        ).markets()
+
+        rows = table.query(market="Full Time Result", odds__lt=3.0)
+
+        assert rows and [r["selection_id"] for r in rows] == [
+            row["selection_id"] for row in table
+            if row["market"] == "Full Time Result" and row["odds"] < 3.0
+        ]
+        assert len(table.query()) == len(table)
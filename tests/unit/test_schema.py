@@ -0,0 +1,141 @@
+"""Unit tests for `pybet365.response.schema` modules."""
+import pytest
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.mock_server import MockBet365Server
+from pybet365.response import (
+    SchemaValidationError,
+    SchemaValidator,
+    UpcomingEventsResponse,
+)
+from pybet365.response.schema import RECORDS, compile_schema
+from pybet365.synthetic import SyntheticGenerator
+
+
+class TestCompiledSchema(TestCase):
+    """Unit tests for the generated validators."""
+
+    def test_synthetic_payloads(self):
+        """Unit test for every endpoint passing its schema."""
+        validator = SchemaValidator("strict")
+        for endpoint in RECORDS:
+            data = SyntheticGenerator().payload(endpoint, 5)
+            assert validator.validate(endpoint, data) is data
+
+        assert validator.validated == len(RECORDS)
+        assert validator.validate("unknown", None) is None
+
+    def test_error_paths(self):
+        """Unit test for the path and expectation of failures."""
+        validator = SchemaValidator("strict")
+        data = SyntheticGenerator().payload("upcoming", 5)
+        data["results"][3]["league"]["id"] = None
+
+        with pytest.raises(SchemaValidationError) as info:
+            validator.validate("upcoming", data)
+        assert info.value.path == "results[3].league.id"
+        assert info.value.expected == "id"
+        assert validator.failures == 1
+
+        data = SyntheticGenerator().payload("prematch", 5)
+        del data["results"][1]["FI"]
+        with pytest.raises(SchemaValidationError, match=r"results\[1\]\.FI"):
+            validator.validate("prematch", data)
+
+        with pytest.raises(SchemaValidationError, match="<root> expected"):
+            validator.validate("result", [])
+
+    def test_alternatives(self):
+        """Unit test for unions reporting the closest alternative."""
+        data = SyntheticGenerator().payload("prematch", 5)
+        market = data["results"][0]["goals"]["sp"]["goals_over_under"]
+        market["odds"][1]["odds"] = 1.5
+
+        with pytest.raises(SchemaValidationError) as info:
+            SchemaValidator().validate("prematch", data)
+        assert info.value.path == (
+            "results[0].goals.sp.goals_over_under.odds[1].odds"
+        )
+
+        validate = compile_schema(("num", ["str"]), "union")
+        assert validate(["a"]) == ["a"] and validate(1.5) == 1.5
+        with pytest.raises(SchemaValidationError, match="num | list"):
+            validate("a")
+
+    def test_optional_and_wildcard(self):
+        """Unit test for `?` keys / types and `*` values."""
+        validate = compile_schema({"a": "str?", "b?": "num", "*": "id"})
+
+        assert validate({"a": None, "c": "1", "d": 2})
+        with pytest.raises(SchemaValidationError, match="a expected str?"):
+            validate({"b": 1})
+        with pytest.raises(SchemaValidationError, match="^payload: c"):
+            validate({"a": "x", "c": []})
+
+
+class TestSchemaValidator(TestCase):
+    """Unit tests for `SchemaValidator` modes."""
+
+    def test_sample_mode(self):
+        """Unit test for validating one payload in `every`."""
+        errors = []
+        validator = SchemaValidator("sample", every=3, on_error=errors.append)
+        for _ in range(7):
+            validator.validate("result", {"success": 1})
+
+        assert validator.validated == 3 and validator.failures == 3
+        assert len(errors) == 3 and errors[0].path == "results"
+        assert validator.stats()["last_error"] == str(errors[-1])
+
+    def test_build(self):
+        """Unit test for client `validate` arguments."""
+        validator = SchemaValidator("sample")
+
+        assert SchemaValidator.build(None) is None
+        assert SchemaValidator.build("off") is None
+        assert SchemaValidator.build(validator) is validator
+        assert SchemaValidator.build("strict").mode == "strict"
+        assert SchemaValidator("strict", every=10).every == 1
+        with pytest.raises(ValueError):
+            SchemaValidator("lenient")
+
+    def test_missing_pager(self):
+        """Unit test for a payload without `pager`."""
+        response = UpcomingEventsResponse({"success": 1, "results": []})
+
+        assert response.pager.page is None
+
+
+class TestClientValidation(TestCase):
+    """Unit tests for validation through the client."""
+
+    def client(self, server, validate):
+        """Client pointed at `server`."""
+        return Bet365(
+            api_host="mock", api_key="key", base_url=server.url,
+            validate=validate,
+        )
+
+    def test_strict_client(self):
+        """Unit test for validated requests and streams."""
+        with MockBet365Server().run_in_thread() as server:
+            client = self.client(server, "strict")
+            client.upcoming_events(sport_id="1")
+            client.pre_match_odds(fi="1")
+            client.in_play_events()
+            records = list(client.stream("result"))
+
+        assert client.validator.validated == 3 + len(records)
+        assert client.validator.failures == 0
+
+    def test_schema_override(self):
+        """Unit test for failures surfacing from the client."""
+        validator = SchemaValidator(
+            "strict", schemas={"upcoming": {"results": [{"id": "num"}]}}
+        )
+        with MockBet365Server().run_in_thread() as server:
+            client = self.client(server, validator)
+            with pytest.raises(SchemaValidationError, match=r"results\[0\]"):
+                client.upcoming_events(sport_id="1")
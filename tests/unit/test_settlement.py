@@ -0,0 +1,160 @@
+"""Unit tests for `pybet365.settlement` modules."""
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from pybet365.response import Result, ResultResponse
+from pybet365.settlement import SettlementWatcher
+
+KICKOFF = 1586480400.0
+
+
+class StubClient(object):
+    """`result` endpoint answering from a status table."""
+
+    def __init__(self):
+        """Constructor for StubClient."""
+        self.statuses = {}
+        self.timers = {}
+        self.calls = []
+        self.fail = False
+
+    def result(self, event_id: str) -> ResultResponse:
+        """Records of the comma separated `event_id`."""
+        self.calls.append(event_id.split(","))
+        if self.fail:
+            raise IOError("upstream down")
+
+        records = []
+        for event_id in event_id.split(","):
+            if event_id not in self.statuses:
+                continue
+            record = {
+                "id": event_id,
+                "time_status": self.statuses[event_id],
+                "ss": "1-0",
+            }
+            if event_id in self.timers:
+                record["timer"] = {"tm": self.timers[event_id], "ts": 0,
+                                   "ta": 0}
+                record["extra"] = {"length": 90}
+            records.append(record)
+
+        return ResultResponse({"success": 1, "results": records})
+
+
+class TestSettlementWatcher(TestCase):
+    """Unit tests for `SettlementWatcher`."""
+
+    def setUp(self) -> None:
+        """Watcher over a stub client with a manual clock."""
+        self.now = KICKOFF
+        self.client = StubClient()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "settlement.json")
+        self.watcher = self._watcher()
+
+    def tearDown(self) -> None:
+        """Remove the state directory."""
+        shutil.rmtree(self.tmp)
+
+    def _watcher(self) -> SettlementWatcher:
+        """New watcher sharing the client, clock and state path."""
+        return SettlementWatcher(
+            self.client, path=self.path, batch_size=2,
+            clock=lambda: self.now,
+        )
+
+    def test_polls_only_due_events(self):
+        """Unit test for the expected end time schedule."""
+        self.watcher.track("1", KICKOFF, "1")  # soccer: 115 minutes
+        self.watcher.track("2", KICKOFF, "92")  # table tennis: 45 minutes
+        self.client.statuses.update({"1": "3", "2": "3"})
+
+        assert self.watcher.poll() == []
+        assert self.client.calls == []
+
+        self.now = KICKOFF + 50 * 60
+        settled = self.watcher.poll()
+
+        assert [r.id for r in settled] == ["2"]
+        assert isinstance(settled[0], Result)
+        assert self.client.calls == [["2"]]
+        assert self.watcher.next_due == KICKOFF + 115 * 60
+
+    def test_batches_and_emits_once(self):
+        """Unit test for batched calls and single emission."""
+        emitted = []
+        self.watcher.on_settled = emitted.append
+        for event_id in ("1", "2", "3", "4", "5"):
+            self.watcher.track(event_id, KICKOFF, "1")
+            self.client.statuses[event_id] = "3"
+        self.client.statuses["3"] = "1"
+
+        self.now = KICKOFF + 3 * 3600
+        settled = self.watcher.poll()
+
+        assert sorted(r.id for r in settled) == ["1", "2", "4", "5"]
+        assert [len(call) for call in self.client.calls] == [2, 2, 1]
+        assert emitted == settled
+        assert len(self.watcher) == 1 and "3" in self.watcher
+        assert not self.watcher.track("1", KICKOFF, "1")
+
+        self.client.statuses["3"] = "3"
+        self.now += 3600
+        assert [r.id for r in self.watcher.poll()] == ["3"]
+        assert self.watcher.poll(self.now + 86400) == []
+        assert len(self.watcher) == 0
+
+    def test_live_timer_reschedule(self):
+        """Unit test for re-estimating from `timer`."""
+        self.watcher.track("1", KICKOFF, "1")
+        self.client.statuses["1"] = "1"
+        self.client.timers["1"] = 80
+
+        self.now = KICKOFF + 115 * 60
+        assert self.watcher.poll() == []
+        assert self.watcher.next_due == self.now + 10 * 60
+
+    def test_backoff_without_timer(self):
+        """Unit test for the back-off of unknown and failing events."""
+        self.watcher.track("1", KICKOFF, "1")
+        self.now = KICKOFF + 115 * 60
+
+        self.watcher.poll()  # missing from the response
+        assert self.watcher.next_due == self.now + 300
+
+        self.client.fail = True
+        self.now += 300
+        self.watcher.poll()
+        assert self.watcher.errors == 1
+        assert self.watcher.next_due == self.now + 600
+
+    def test_state_survives_restart(self):
+        """Unit test for saving and reloading open / settled events."""
+        self.watcher.track("1", KICKOFF, "1")
+        self.watcher.track("2", KICKOFF, "1")
+        self.client.statuses["2"] = "3"
+        self.now = KICKOFF + 115 * 60
+        self.watcher.poll()
+        self.client.statuses.pop("2")
+        self.watcher.save()
+
+        restarted = self._watcher()
+
+        assert "1" in restarted and restarted.is_settled("2")
+        assert not restarted.track("2", KICKOFF, "1")
+        assert restarted.next_due == self.now + 300
+
+    def test_track_events(self):
+        """Unit test for tracking `upcoming` style records."""
+        response = ResultResponse({"success": 1, "results": [
+            {"id": "1", "time": str(int(KICKOFF)), "sport_id": "18"},
+            {"id": "2", "time": str(int(KICKOFF)), "sport_id": "18"},
+        ]})
+
+        assert self.watcher.track_events(response) == 2
+        assert self.watcher.track_events(response.results) == 0
+        assert self.watcher.due(KICKOFF + 150 * 60) == ["1", "2"]
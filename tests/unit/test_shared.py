@@ -0,0 +1,106 @@
+"""Unit tests for `pybet365.shared` modules."""
+import math
+import multiprocessing
+
+import pytest
+
+from unittest import TestCase
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("multiprocessing.shared_memory")
+
+from pybet365.shared import (  # noqa: E402
+    SEQUENCE,
+    SharedOddsPublisher,
+    SharedOddsReader,
+)
+from pybet365.synthetic import SyntheticGenerator  # noqa: E402
+
+
+def payload(records=2, seed=0):
+    """Raw `in_play_odds` body of `records` events."""
+    generator = SyntheticGenerator(seed=seed, sport_id="1")
+    results = []
+    for record in generator.records("event", records):
+        results.extend(record)
+    return {"success": 1, "results": [results]}
+
+
+def remote_total(name):
+    """Read the table from another process."""
+    with SharedOddsReader(name) as reader:
+        return reader.read(lambda rows: (len(rows), float(rows["odds"].sum())))
+
+
+class TestSharedOdds(TestCase):
+    """Unit tests for SharedOddsPublisher / SharedOddsReader."""
+
+    def setUp(self) -> None:
+        """Publish two events."""
+        self.publisher = SharedOddsPublisher(capacity=64)
+        self.publisher.publish(payload(), ts=1.0)
+        self.reader = SharedOddsReader(self.publisher.name)
+
+    def tearDown(self) -> None:
+        """Release the block."""
+        self.reader.close()
+        self.publisher.close()
+        self.publisher.unlink()
+
+    def test_snapshot(self):
+        """Unit test for a consistent copy of the table."""
+        rows = self.reader.snapshot()
+
+        # NOTE: 5 selections (3 + 2) per synthetic event
+        assert len(rows) == 10
+        assert set(rows["fi"]) == {b"88000000", b"88000001"}
+        assert rows["updated_at"].tolist() == [1.0] * 10
+        assert self.reader.version == 2
+
+    def test_update_in_place(self):
+        """Unit test for upserts and suspended selections."""
+        body = payload(records=1, seed=1)
+        body["results"][0].pop()
+        self.publisher.publish(body, ts=2.0)
+        rows = self.reader.lookup("88000000")
+
+        assert len(self.reader.snapshot()) == 10
+        assert rows["updated_at"].tolist() == [2.0] * 4 + [1.0]
+        assert math.isnan(rows["odds"][-1])
+
+    def test_read_retries_while_locked(self):
+        """Unit test for readers never seeing a write in progress."""
+        self.publisher._header[SEQUENCE] += 1
+        self.reader.timeout = 0.01
+        with pytest.raises(TimeoutError):
+            self.reader.snapshot()
+        self.publisher._header[SEQUENCE] += 1
+
+        assert len(self.reader.snapshot()) == 10
+
+    def test_other_process(self):
+        """Unit test for a reader in another process."""
+        expected = float(self.reader.snapshot()["odds"].sum())
+        with multiprocessing.Pool(1) as pool:
+            count, total = pool.apply(remote_total, (self.publisher.name,))
+
+        assert count == 10
+        assert total == pytest.approx(expected)
+
+    def test_overflow(self):
+        """Unit test for a full table."""
+        with SharedOddsPublisher(capacity=3) as publisher:
+            with pytest.raises(OverflowError):
+                publisher.publish(payload(records=1))
+
+    def test_not_a_table(self):
+        """Unit test for attaching to a foreign block."""
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(create=True, size=128)
+        try:
+            with pytest.raises(ValueError):
+                SharedOddsReader(block.name)
+        finally:
+            block.close()
+            block.unlink()
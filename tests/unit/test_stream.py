@@ -0,0 +1,97 @@
+"""Unit tests for `pybet365.response.stream` modules."""
+import json
+
+import mock
+import pytest
+import requests
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.response import UpcomingEvent
+from pybet365.response.stream import ResultsStreamParser, iter_results
+
+from tests.mocks import MockRequestsResponse
+from tests.utils import load_json
+
+
+def _chunks(body: bytes, size: int):
+    """Split `body` in chunks of `size` bytes."""
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestIterResults(TestCase):
+    """Unit tests for `iter_results`."""
+
+    def setUp(self) -> None:
+        """Build a body with several records."""
+        payload = load_json("testData/upcoming_events_table_tennis.json")
+        record = payload["results"][0]
+        payload["results"] = [
+            dict(record, id=str(i), name="café {}".format(i))
+            for i in range(25)
+        ]
+        self.payload = payload
+        self.body = json.dumps(payload, indent=2).encode()
+
+    def test_every_chunk_size(self):
+        """Records and header match `json.loads` for any chunking."""
+        for size in (1, 2, 3, 7, 64, len(self.body)):
+            header = {}
+            records = list(
+                iter_results(_chunks(self.body, size), header=header)
+            )
+
+            assert records == self.payload["results"], size
+            assert header["success"] == 1
+            assert header["pager"]["total"] == 102
+
+    def test_nested_raw_records(self):
+        """Nested raw arrays are flattened."""
+        body = b'{"success":1,"results":[[{"type":"EV"},{"type":"MA"}],[]]}'
+
+        records = list(iter_results(_chunks(body, 5)))
+
+        assert [r["type"] for r in records] == ["EV", "MA"]
+
+    def test_null_results(self):
+        """`results: null` yields nothing and lands in the header."""
+        header = {}
+        assert list(iter_results([b'{"results": null}'], header=header)) == []
+        assert header == {"results": None}
+
+    def test_truncated(self):
+        """Truncated bodies raise."""
+        with pytest.raises(ValueError):
+            list(iter_results(_chunks(self.body[:-20], 16)))
+
+    def test_incremental_yield(self):
+        """Records are available before the body is complete."""
+        parser = ResultsStreamParser()
+        half = len(self.body) // 2
+
+        first = parser.feed(self.body[:half].decode())
+
+        assert 0 < len(first) < 25
+
+
+class TestClientStream(TestCase):
+    """Unit tests for `Bet365.stream`."""
+
+    @mock.patch.object(requests, "get")
+    def test_stream_facades(self, mock_api_response):
+        """Records are wrapped in their record facade."""
+        mock_api_response.return_value = MockRequestsResponse(
+            filepath="testData/upcoming_events_table_tennis.json"
+        )
+        client = Bet365(api_host="host", api_key="key")
+        header = {}
+
+        records = list(client.stream(
+            "upcoming", {"sport_id": "92"}, chunk_size=8, header=header
+        ))
+
+        assert isinstance(records[0], UpcomingEvent)
+        assert records[0].league.name == "Moscow Liga Pro"
+        assert header["pager"]["per_page"] == 50
+        assert mock_api_response.call_args[1]["stream"] is True
@@ -0,0 +1,86 @@
+"""Unit tests for `pybet365.synthetic` modules."""
+import io
+import json
+
+import pytest
+
+from unittest import TestCase
+
+from pybet365.response import (
+    PreMatchOddsResponse,
+    ResultResponse,
+    UpcomingEventsResponse,
+)
+from pybet365.synthetic import ENDPOINTS, SyntheticGenerator, dump_payload
+
+
+class TestSyntheticGenerator(TestCase):
+    """Unit tests for SyntheticGenerator."""
+
+    def setUp(self) -> None:
+        """Instantiate SyntheticGenerator."""
+        self.test_client = SyntheticGenerator(seed=7)
+
+    def test_deterministic(self):
+        """Unit test for identical seeds giving identical payloads."""
+        other = SyntheticGenerator(seed=7)
+        for endpoint in ENDPOINTS:
+            assert self.test_client.payload(endpoint, 5) == other.payload(
+                endpoint, 5
+            )
+        assert self.test_client.payload("result", 3) != (
+            SyntheticGenerator(seed=8).payload("result", 3)
+        )
+
+    def test_slices_match(self):
+        """Unit test for record `i` not depending on earlier records."""
+        whole = list(self.test_client.records("result", 10))
+        assert list(self.test_client.records("result", 3, start=7)) == (
+            whole[7:]
+        )
+
+    def test_paged(self):
+        """Unit test for the pager of paged endpoints."""
+        response = UpcomingEventsResponse(
+            self.test_client.payload("upcoming", 25, page=3, per_page=10)
+        )
+
+        assert response.pager.total == 25
+        assert len(response.results) == 5
+        assert response.results[0].id == "88000020"
+
+    def test_facades(self):
+        """Unit test for payloads parsing into the facades."""
+        payload = self.test_client.payload("result", 2)
+        result = ResultResponse(payload).results[0]
+        scores = result.scores["2"]
+        assert result.ss == "{}-{}".format(scores["home"], scores["away"])
+        assert result.league.name.startswith("League ")
+        assert result.events[-1].text.startswith("Score After Full Time")
+
+        payload = self.test_client.payload("prematch", 4)
+        table = PreMatchOddsResponse(payload).markets()
+        assert len(table.select(market="Full Time Result")) == 12
+
+    def test_raw(self):
+        """Unit test for raw bodies nesting mnemonic records."""
+        results = self.test_client.payload("inplay", 3)["results"]
+        assert len(results) == 1
+        assert [r["type"] for r in results[0][:3]] == ["CL", "CT", "EV"]
+        assert sum(r["type"] == "EV" for r in results[0]) == 3
+
+    def test_write_payload_streams(self):
+        """Unit test for writing large payloads chunk by chunk."""
+        stream = io.StringIO()
+        self.test_client.write_payload(stream, "upcoming", 2000)
+
+        assert len(json.loads(stream.getvalue())["results"]) == 2000
+
+    def test_unknown_endpoint(self):
+        """Unit test for unknown endpoints."""
+        with pytest.raises(ValueError):
+            list(self.test_client.records("nope", 1))
+
+    def test_dump_payload_empty(self):
+        """Unit test for an empty payload."""
+        assert "".join(dump_payload([])) == '{"success":1,"results":[]}'
@@ -0,0 +1,130 @@
+"""Unit tests for `pybet365.response.timeline` modules."""
+import math
+
+from unittest import TestCase
+
+from pybet365.response import ResultResponse, TimelineEntry
+from pybet365.response.timeline import build_timeline, parser_for
+from pybet365.synthetic import SyntheticGenerator
+
+
+def soccer_results(records: int = 20) -> ResultResponse:
+    """Synthetic soccer `result` response."""
+    return ResultResponse(
+        SyntheticGenerator(sport_id="1").payload("result", records)
+    )
+
+
+class TestTimelineParser(TestCase):
+    """Unit tests for parsing event text."""
+
+    def setUp(self) -> None:
+        """Soccer parser."""
+        self.parser = parser_for("1")
+
+    def parse(self, text: str) -> TimelineEntry:
+        """Entry of `text` between "Home FC" and "Away FC"."""
+        return self.parser.parse(text, "1", home="Home FC", away="Away FC")
+
+    def test_goal(self):
+        """Unit test for goals with and without a player."""
+        entry = self.parse("23' - 1st Goal -   (Home FC) -")
+
+        assert (entry.minute, entry.kind, entry.ordinal) == (23, "goal", 1)
+        assert (entry.side, entry.team, entry.player) == (
+            "home", "Home FC", None
+        )
+
+        entry = self.parse("90+4' - 3rd Yellow Card - J. Smith (away fc)")
+        assert (entry.minute, entry.stoppage) == (90, 4)
+        assert (entry.kind, entry.side, entry.player) == (
+            "yellow_card", "away", "J. Smith"
+        )
+        assert self.parse("12' - 1st Own Goal -   (Away FC) -").kind == (
+            "own_goal"
+        )
+
+    def test_corner_and_score(self):
+        """Unit test for bare team names and score lines."""
+        entry = self.parse("27' - 2nd Corner - Away FC")
+        assert (entry.kind, entry.side, entry.team) == (
+            "corner", "away", "Away FC"
+        )
+
+        entry = self.parse("Score After First Half - 2-1")
+        assert (entry.kind, entry.period) == ("score", "First Half")
+        assert (entry.home_score, entry.away_score) == (2, 1)
+        assert entry.minute is None
+
+    def test_sport_vocabulary(self):
+        """Unit test for per sport kinds and unmatched lines."""
+        text = "5' - 1st Touchdown - Home FC"
+
+        assert self.parse(text).kind == "other"
+        assert self.parse(text).text == text
+        assert parser_for("12").parse(text).kind == "touchdown"
+        assert parser_for("1") is self.parser
+        assert self.parse(None).text == ""
+
+
+class TestTimeline(TestCase):
+    """Unit tests for cached and columnar timelines."""
+
+    def test_result_timeline(self):
+        """Unit test for parsing once per `Result`."""
+        result = soccer_results(1).results[0]
+        timeline = result.timeline
+
+        assert result.timeline is timeline
+        assert len(timeline) == len(result.events)
+        assert [e.id for e in timeline] == [e.id for e in result.events]
+        assert "other" not in {e.kind for e in timeline}
+
+        goals = sum(e.kind == "goal" for e in timeline)
+        full_time = [e for e in timeline if e.period == "Full Time"][0]
+        assert goals == full_time.home_score + full_time.away_score
+
+    def test_columns(self):
+        """Unit test for the response `Timeline`."""
+        response = soccer_results()
+        timeline = response.timeline
+        events = sum(len(r["events"]) for r in response["results"])
+
+        assert response.timeline is timeline
+        assert len(timeline) == events
+        assert set(timeline.kinds()) == {
+            "corner", "goal", "score", "yellow_card"
+        }
+
+        first = response["results"][0]["id"]
+        rows = timeline.select(kind="score", event_id=first)
+        assert [row["period"] for row in rows] == ["First Half", "Full Time"]
+        assert math.isnan(rows[0]["minute"])
+
+        late = timeline.query(kind="goal", minute__gte=80)
+        assert late and all(row["minute"] >= 80 for row in late)
+        assert timeline.to_columns()["event_id"].count(first) == len(
+            timeline.event_rows(first)
+        )
+
+    def test_reuses_parsed_results(self):
+        """Unit test for `build_timeline` over parsed `Result` objects."""
+        results = soccer_results(3).results
+        entries = results[0].timeline
+        entries[0].kind = "patched"
+
+        table = build_timeline(results)
+
+        assert table.kind[0] == "patched"
+        assert len(table) == len(build_timeline(
+            [dict(r) for r in results]
+        ))
+
+    def test_response_reuses_results(self):
+        """Unit test for `ResultResponse.timeline` over its facades."""
+        response = soccer_results(3)
+        result = response.results[0]
+        result.timeline[0].kind = "patched"
+
+        assert response.results[0] is result
+        assert response.timeline.kind[0] == "patched"
@@ -0,0 +1,100 @@
+"""Unit tests for `pybet365.timeseries` modules."""
+import math
+
+from unittest import TestCase
+
+import pytest
+
+from pybet365.response import PreMatchOddsResponse
+
+from tests.utils import load_json
+
+np = pytest.importorskip("numpy")
+
+from pybet365.timeseries import OddsTimeSeriesStore  # noqa: E402
+
+KEY = ("1", "40", "a")
+
+
+class TestOddsTimeSeriesStore(TestCase):
+    """Unit tests for OddsTimeSeriesStore."""
+
+    def setUp(self) -> None:
+        """Store with a fixed clock."""
+        self.test_client = OddsTimeSeriesStore(
+            capacity=4, max_series=2, clock=lambda: 100.0
+        )
+
+    def test_ring_buffer_is_bounded(self):
+        """Unit test for the oldest ticks being overwritten."""
+        for i in range(10):
+            self.test_client.record("1", "40", "a", 2.0 + i, ts=float(i))
+
+        ts, odds = self.test_client.last(KEY)
+        assert list(ts) == [6.0, 7.0, 8.0, 9.0]
+        assert list(odds) == [8.0, 9.0, 10.0, 11.0]
+        assert list(self.test_client.last(KEY, n=2)[1]) == [10.0, 11.0]
+
+    def test_dedupe(self):
+        """Unit test for unchanged and missing prices being skipped."""
+        assert self.test_client.record("1", "40", "a", 2.0, ts=1.0)
+        assert not self.test_client.record("1", "40", "a", 2.0, ts=2.0)
+        assert not self.test_client.record("1", "40", "a", float("nan"))
+        assert len(self.test_client.last(KEY)[0]) == 1
+
+    def test_twap_and_max_move(self):
+        """Unit test for the windowed queries."""
+        for ts, odds in ((0.0, 2.0), (50.0, 3.0), (90.0, 2.5)):
+            self.test_client.record("1", "40", "a", odds, ts=ts)
+
+        # NOTE: window is [60, 100], 3.0 is in force 60..90 and 2.5 90..100
+        twap = self.test_client.twap(40.0, key=KEY)
+        assert twap == pytest.approx((3.0 * 30 + 2.5 * 10) / 40)
+        assert self.test_client.max_move(40.0, key=KEY) == 0.5
+        assert self.test_client.max_move(100.0, key=KEY) == 1.0
+
+    def test_vectorized_queries(self):
+        """Unit test for queries across every series."""
+        self.test_client.record("1", "40", "a", 2.0, ts=10.0)
+        self.test_client.record("1", "40", "b", 4.0, ts=10.0)
+
+        assert self.test_client.keys() == [KEY, ("1", "40", "b")]
+        assert list(self.test_client.twap(50.0)) == [2.0, 4.0]
+        assert list(self.test_client.latest()[1]) == [2.0, 4.0]
+
+    def test_max_series_recycles_least_recent(self):
+        """Unit test for bounded series count."""
+        self.test_client.record("1", "40", "a", 2.0, ts=1.0)
+        self.test_client.record("1", "40", "b", 2.0, ts=2.0)
+        self.test_client.record("1", "40", "c", 2.0, ts=3.0)
+
+        assert len(self.test_client) == 2
+        assert KEY not in self.test_client
+        assert math.isnan(self.test_client.twap(10.0, key=KEY))
+
+    def test_ingest(self):
+        """Unit test for pre-match and in-play ingestion."""
+        store = OddsTimeSeriesStore(capacity=8)
+        recorded = store.ingest_prematch(
+            PreMatchOddsResponse(
+                load_json("testData/pre_match_odds_soccer.json")
+            ),
+            ts=1.0,
+        )
+        assert recorded == len(store) > 0
+
+        recorded = store.ingest_in_play(
+            {
+                "results": [
+                    [
+                        {"type": "EV", "FI": "9"},
+                        {"type": "MA", "ID": "m", "NA": "Fulltime Result"},
+                        {"type": "PA", "ID": "p1", "OD": "11/10"},
+                        {"type": "PA", "ID": "p2", "OD": "SP"},
+                    ]
+                ]
+            },
+            ts=2.0,
+        )
+        assert recorded == 1
+        assert list(store.last(("9", "m", "p1"))[1]) == [2.1]
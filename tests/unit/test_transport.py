@@ -0,0 +1,268 @@
+"""Unit tests for `pybet365.client.transport` modules."""
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+
+from unittest import TestCase
+
+from pybet365.client.client import Bet365
+from pybet365.client.transport import (
+    HttpxTransport,
+    RequestsTransport,
+    TransportMetrics,
+    accept_encoding,
+    available_encodings,
+    client_options,
+    decode_body,
+)
+from pybet365.mock_server import MockBet365Server
+from requests import HTTPError
+
+
+class TestCompression(TestCase):
+    """Unit tests for negotiation and decoding."""
+
+    def test_accept_encoding(self):
+        """Unit test for offering only installed decoders."""
+        assert accept_encoding(True) == ", ".join(available_encodings())
+        assert accept_encoding(True).endswith("gzip, deflate")
+        assert accept_encoding(False) == "identity"
+        assert accept_encoding(("lz4", "gzip")) == "gzip"
+        assert accept_encoding(("lz4",)) == "identity"
+
+    def test_decode_body(self):
+        """Unit test for gzip, deflate and stacked codings."""
+        body = b'{"success": 1}' * 100
+
+        assert decode_body(gzip.compress(body), "gzip") == body
+        assert decode_body(gzip.compress(body) * 2, "gzip") == body * 2
+        assert decode_body(zlib.compress(body), "deflate") == body
+        assert decode_body(
+            zlib.compress(gzip.compress(body)), "gzip, deflate"
+        ) == body
+        assert decode_body(body, None) == body
+
+        with pytest.raises(ValueError):
+            decode_body(body, "lz4")
+
+    def test_metrics(self):
+        """Unit test for per endpoint totals."""
+        metrics = TransportMetrics()
+        metrics.record("prematch", 100, 1000, "gzip")
+        metrics.record("prematch", 50, 500, "gzip")
+        metrics.record("result", 10, 10)
+
+        assert metrics["prematch"].ratio == 0.1
+        assert metrics.summary()[1] == {
+            "endpoint": "result",
+            "requests": 1,
+            "wire_bytes": 10,
+            "body_bytes": 10,
+            "ratio": 1.0,
+            "encodings": {"identity": 1},
+        }
+
+
+class TestCompressedTransport(TestCase):
+    """Unit tests for the client against the compressing mock server."""
+
+    def client(self, server, **kwargs):
+        """Client pointed at `server`."""
+        return Bet365(
+            api_host="mock", api_key="key", base_url=server.url, **kwargs
+        )
+
+    def test_gzip_bodies(self):
+        """Unit test for cached and chunked (streamed) gzip bodies."""
+        with MockBet365Server(records=1500).run_in_thread() as server:
+            client = self.client(server, compression=("gzip",))
+            small = client.in_play_filter(sport_id="1")
+            large = client.result(event_id=None)
+
+        assert len(large.results) == 1500 and small["results"]
+        for endpoint in ("inplay_filter", "result"):
+            totals = client.metrics[endpoint]
+            assert totals.encodings == {"gzip": 1}
+            assert totals.wire_bytes < totals.body_bytes / 3
+
+    def test_identity(self):
+        """Unit test for disabled compression."""
+        with MockBet365Server().run_in_thread() as server:
+            client = self.client(server, compression=False)
+            client.in_play_filter(sport_id="1")
+
+        totals = client.metrics["inplay_filter"]
+        assert totals.encodings == {"identity": 1}
+        assert totals.wire_bytes == totals.body_bytes > 0
+
+    def test_revalidation(self):
+        """Unit test for per coding ETags with the response cache."""
+        with MockBet365Server().run_in_thread() as server:
+            client = self.client(server, cache=True)
+            first = client.in_play_filter(sport_id="1")
+            second = client.in_play_filter(sport_id="1")
+
+        assert first is second
+        assert server.stats()["statuses"] == {200: 1, 304: 1}
+        assert client.metrics["inplay_filter"].requests == 2
+
+
+class TestTransports(TestCase):
+    """Unit tests for the pluggable sync / async transports."""
+
+    def client(self, server, **kwargs):
+        """Client pointed at `server`."""
+        return Bet365(
+            api_host="mock", api_key="key", base_url=server.url, **kwargs
+        )
+
+    def fan_out(self, client, calls=20, threads=4):
+        """`in_play_odds` of `calls` FIs from `threads` threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(threads) as pool:
+            return list(pool.map(
+                lambda fi: client.in_play_odds(fi=str(fi)), range(calls)
+            ))
+
+    def test_pooled_requests(self):
+        """Unit test for keep-alive reuse of `RequestsTransport`."""
+        with MockBet365Server(latency=0.01).run_in_thread() as server:
+            with RequestsTransport(pool_maxsize=4) as transport:
+                client = self.client(server, transport=transport)
+                responses = self.fan_out(client)
+
+        assert all(response["success"] for response in responses)
+        assert server.stats()["connections"]["HTTP/1.1"] <= 4
+        assert client.metrics["event"].requests == 20
+
+    def test_httpx_http2(self):
+        """Unit test for one multiplexed HTTP/2 connection."""
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+
+        with MockBet365Server(latency=0.01).run_in_thread() as server:
+            with HttpxTransport(http2=True) as transport:
+                client = self.client(server, transport=transport)
+                responses = self.fan_out(client)
+                with pytest.raises(HTTPError):
+                    client._get("missing", {})
+
+        assert all(response["success"] for response in responses)
+        assert server.stats()["connections"] == {"HTTP/2": 1}
+        assert client.metrics["event"].encodings == {"gzip": 20}
+
+    def test_httpx_tls_fallback(self):
+        """Unit test for h2c only on plaintext hosts."""
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+
+        tls = client_options(httpx, True, 10, 5.0)
+        plaintext = client_options(httpx, True, 10, 5.0, plaintext=True)
+
+        assert (tls["http1"], tls["http2"]) == (True, True)
+        assert (plaintext["http1"], plaintext["http2"]) == (False, True)
+        assert "http2" not in client_options(httpx, False, 10, 5.0)
+        with HttpxTransport(http2=True) as transport:
+            assert transport.plaintext_client is not transport.client
+
+    def test_httpx_stream(self):
+        """Unit test for streamed bodies read chunk by chunk."""
+        pytest.importorskip("httpx")
+
+        with MockBet365Server(records=3000).run_in_thread() as server:
+            with HttpxTransport(http2=False) as transport:
+                client = self.client(
+                    server, transport=transport, compression=False
+                )
+                response = transport.get(
+                    server.url.format("v1") + "result",
+                    headers=client.headers,
+                    stream=True,
+                )
+                chunks = response.iter_content(chunk_size=4096)
+                first = next(chunks)
+                partial = response._response.num_bytes_downloaded
+                body = first + b"".join(chunks)
+                records = list(client.stream("result"))
+
+        assert partial < response.read_wire() < len(body)
+        assert json.loads(body)["success"] == 1
+        assert len(records) == 3000
+
+    def test_async_client(self):
+        """Unit test for `AsyncBet365` over HTTP/1.1 and HTTP/2."""
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        from pybet365.client import AsyncBet365
+
+        async def fan_out(server, http2):
+            async with AsyncBet365(
+                api_host="mock", api_key="key", base_url=server.url,
+                http2=http2, concurrency=5,
+            ) as client:
+                return await client.gather(
+                    client.in_play_odds(fi=str(fi)) for fi in range(20)
+                )
+
+        for http2, protocol in ((False, "HTTP/1.1"), (True, "HTTP/2")):
+            with MockBet365Server(latency=0.01).run_in_thread() as server:
+                responses = asyncio.run(fan_out(server, http2))
+
+            assert [r["success"] for r in responses] == [1] * 20
+            assert list(server.stats()["connections"]) == [protocol]
+            assert server.stats()["connections"][protocol] <= 5
+
+    def test_async_stream(self):
+        """Unit test for `AsyncBet365.stream` over `aiter_bytes`."""
+        pytest.importorskip("httpx")
+        from pybet365.client import AsyncBet365
+
+        async def consume(server):
+            async with AsyncBet365(
+                api_host="mock", api_key="key", base_url=server.url,
+                http2=False,
+            ) as client:
+                header = {}
+                records = [
+                    record async for record in client.stream(
+                        "inplay", {"raw": "1"}, chunk_size=1024, header=header
+                    )
+                ]
+                with pytest.raises(HTTPError):
+                    async for _ in client.stream("missing"):
+                        pass
+                return records, header
+
+        with MockBet365Server(records=500).run_in_thread() as server:
+            records, header = asyncio.run(consume(server))
+            client = Bet365(api_host="mock", api_key="k", base_url=server.url)
+            expected = list(client.stream("inplay", {"raw": "1"}))
+
+        assert header["success"] == 1
+        assert [r.type for r in records] == [r.type for r in expected]
+        assert type(records[0]) is type(expected[0])
+
+    def test_async_cache(self):
+        """Unit test for `AsyncBet365` revalidating its response cache."""
+        pytest.importorskip("httpx")
+        from pybet365.client import AsyncBet365
+
+        async def poll(server):
+            async with AsyncBet365(
+                api_host="mock", api_key="key", base_url=server.url,
+                http2=False, cache=True,
+            ) as client:
+                first = await client.upcoming_events(sport_id="1")
+                second = await client.upcoming_events(sport_id="1")
+                return first, second, client.cache.stats()
+
+        with MockBet365Server().run_in_thread() as server:
+            first, second, stats = asyncio.run(poll(server))
+
+        assert second is first
+        assert server.stats()["statuses"] == {200: 1, 304: 1}
+        assert stats["hits"] == 1